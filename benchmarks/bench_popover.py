@@ -0,0 +1,230 @@
+"""
+Headless benchmarks for `FletPopover` construction, serialization and diffs.
+
+Popovers are added to a `Page` backed by a fake connection, so no Flutter client is
+needed. Commands are encoded the way Flet's socket server encodes them, which makes
+byte counts match what goes over the wire.
+
+Usage:
+
+    python benchmarks/bench_popover.py
+    python benchmarks/bench_popover.py --save baseline.json
+    python benchmarks/bench_popover.py --baseline baseline.json --threshold 0.2
+
+Timed sections run `--repeat` times and the best run is kept. With `--baseline`, the
+run exits with status 1 if any metric is worse than the baseline by more than the
+threshold, so it can gate a release. Byte and memory counts are deterministic and held
+to `--threshold`; timings, which vary from run to run, to the looser
+`--time-threshold`.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import flet as ft
+from flet.core.page import Page
+
+from flet_popover import FletPopover, PopoverDirection, PopoverTransition
+from flet_popover.testing import FakeConnection
+
+SIZES = [1_000, 10_000]
+
+# metrics where a larger value is better; for all others smaller is better
+HIGHER_IS_BETTER = {"init_ops_per_sec"}
+
+# runs of each timed section, the best of which is kept
+REPEAT = 5
+
+
+def is_timing(name: str) -> bool:
+    return "seconds" in name or "per_sec" in name
+
+
+def make_page():
+    conn = FakeConnection(record=False, count_bytes=True)
+    return Page(conn, "bench", asyncio.new_event_loop()), conn
+
+
+def make_popover(i: int) -> FletPopover:
+    return FletPopover(
+        content=ft.Text(f"Trigger {i}"),
+        body=ft.Text(f"Body {i}"),
+        direction=PopoverDirection.BOTTOM,
+        transition=PopoverTransition.SCALE,
+        background_color=ft.Colors.WHITE,
+        radius=8,
+        arrow_width=24,
+        arrow_height=12,
+        barrier_dismissible=True,
+    )
+
+
+def timed(fn: Callable[[], None]) -> float:
+    gc.collect()
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def best(runs: List[Dict[str, float]]) -> Dict[str, float]:
+    """
+    Merges the results of repeated runs, keeping the best value of each timing. Other
+    metrics are the same in every run.
+    """
+    merged = dict(runs[0])
+    for name in merged:
+        if is_timing(name):
+            values = [run[name] for run in runs]
+            merged[name] = max(values) if name in HIGHER_IS_BETTER else min(values)
+    return merged
+
+
+def bench_init(count: int, repeat: int = REPEAT) -> Dict[str, float]:
+    def init():
+        return [make_popover(i) for i in range(count)]
+
+    return best(
+        [{"init_ops_per_sec": count / timed(init)} for _ in range(repeat)]
+    )
+
+
+def bench_page(count: int, repeat: int = REPEAT) -> Dict[str, float]:
+    # each run needs a fresh page, as popovers are only added once
+    return best([page_run(count) for _ in range(repeat)])
+
+
+def page_run(count: int) -> Dict[str, float]:
+    page, conn = make_page()
+    popovers = [make_popover(i) for i in range(count)]
+
+    conn.clear()
+    add_seconds = timed(lambda: page.add(*popovers))
+    initial_bytes = conn.bytes_sent
+
+    # one attribute changed on a single instance
+    conn.clear()
+    popovers[count // 2].radius = 10
+    single_seconds = timed(page.update)
+    single_bytes = conn.bytes_sent
+
+    # one attribute changed on every instance
+    def change_all():
+        for popover in popovers:
+            popover.radius = 12
+        page.update()
+
+    conn.clear()
+    all_seconds = timed(change_all)
+    all_bytes = conn.bytes_sent
+
+    page.loop.close()
+    return {
+        f"add_seconds_{count}": add_seconds,
+        f"initial_bytes_per_popover_{count}": initial_bytes / count,
+        f"diff_one_bytes_{count}": single_bytes,
+        f"diff_one_seconds_{count}": single_seconds,
+        f"diff_all_bytes_{count}": all_bytes,
+        f"diff_all_seconds_{count}": all_seconds,
+    }
+
+
+def bench_memory(count: int) -> Dict[str, float]:
+    page, _ = make_page()
+    gc.collect()
+    tracemalloc.start()
+    popovers = [make_popover(i) for i in range(count)]
+    page.add(*popovers)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    page.loop.close()
+    return {f"peak_memory_bytes_{count}": peak}
+
+
+def run(repeat: int = REPEAT) -> Dict[str, float]:
+    results: Dict[str, float] = {}
+    results.update(bench_init(SIZES[-1], repeat))
+    for count in SIZES:
+        results.update(bench_page(count, repeat))
+    results.update(bench_memory(SIZES[-1]))
+    return results
+
+
+def regressions(
+    results: Dict[str, float],
+    baseline: Dict[str, float],
+    threshold: float,
+    time_threshold: float,
+) -> List[str]:
+    failed = []
+    for name, value in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if name in HIGHER_IS_BETTER:
+            change = (base - value) / base
+        else:
+            change = (value - base) / base
+        if change > (time_threshold if is_timing(name) else threshold):
+            failed.append(f"{name}: {value:,.2f} vs {base:,.2f} ({change:+.0%} worse)")
+    return failed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare the results to this JSON file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="allowed relative regression of byte and memory counts (default: 0.2)",
+    )
+    parser.add_argument(
+        "--time-threshold",
+        type=float,
+        default=0.5,
+        help="allowed relative regression of timings (default: 0.5)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=REPEAT,
+        help=f"runs of each timed section, the best one is kept (default: {REPEAT})",
+    )
+    args = parser.parse_args(argv)
+
+    results = run(max(1, args.repeat))
+    width = max(len(name) for name in results)
+    for name, value in results.items():
+        print(f"{name:<{width}}  {value:>16,.2f}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            failed = regressions(
+                results, json.load(f), args.threshold, args.time_threshold
+            )
+        limits = f"{args.threshold:.0%}, timings {args.time_threshold:.0%}"
+        if failed:
+            print(f"\nRegressions over {limits}:")
+            for line in failed:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions over {limits}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,14 @@
 import flet as ft
-from flet_popover import FletPopover, PopoverDirection, PopoverTransition
+from flet_popover import (
+    FletPopover,
+    PopoverAction,
+    PopoverDirection,
+    PopoverMenu,
+    PopoverMenuItem,
+    PopoverPopEvent,
+    PopoverTransition,
+    PopoverTriggerMode,
+)
 
 
 def main(page: ft.Page):
@@ -17,7 +26,6 @@ def main(page: ft.Page):
         content=ft.ElevatedButton(
             text="Basic Popover",
             icon=ft.Icons.INFO,
-            on_click=lambda e: basic_popover.open(),
         ),
         body=ft.Container(
             content=ft.Column(
@@ -81,36 +89,35 @@ def main(page: ft.Page):
     )
 
     # Example 3: List Menu Popover
-    def on_menu_item_click(item):
-        def handler(e):
-            print(e)
-
-        return handler
+    # Items close the popover on the client; the selection arrives with on_pop
+    def on_menu_selected(e: PopoverPopEvent):
+        print(f"Menu dismissed ({e.reason}), selected: {e.result}")
 
     menu_items = [
-        ("New File", ft.Icons.ADD, on_menu_item_click("New File")),
-        ("Open", ft.Icons.FOLDER_OPEN, on_menu_item_click("Open")),
-        ("Save", ft.Icons.SAVE, on_menu_item_click("Save")),
-        ("Export", ft.Icons.DOWNLOAD, on_menu_item_click("Export")),
+        ("New File", ft.Icons.ADD),
+        ("Open", ft.Icons.FOLDER_OPEN),
+        ("Save", ft.Icons.SAVE),
+        ("Export", ft.Icons.DOWNLOAD),
     ]
 
     menu_popover = FletPopover(
         content=ft.IconButton(
             icon=ft.Icons.MORE_VERT,
             tooltip="Show menu",
-            on_click=lambda e: menu_popover.open(),
         ),
         body=ft.Container(
             content=ft.Column(
                 [
-                    ft.ListTile(
-                        leading=ft.Icon(icon),
-                        title=ft.Text(title),
-                        on_click=handler,
-                        hover_color=ft.Colors.GREY_100,
-                        min_height=0,
+                    PopoverAction(
+                        content=ft.ListTile(
+                            leading=ft.Icon(icon),
+                            title=ft.Text(title),
+                            hover_color=ft.Colors.GREY_100,
+                            min_height=0,
+                        ),
+                        result=title,
                     )
-                    for title, icon, handler in menu_items
+                    for title, icon in menu_items
                 ],
                 tight=True,
                 spacing=0,
@@ -120,7 +127,23 @@ def main(page: ft.Page):
         ),
         direction=PopoverDirection.BOTTOM,
         barrier_dismissible=True,
-        on_pop=on_popover_dismissed,
+        on_pop=on_menu_selected,
+    )
+
+    # Example 3b: Long Menu
+    # Items are fetched a page at a time while scrolling, never all at once
+    commands = [f"Command {i}" for i in range(10_000)]
+
+    long_menu_popover = FletPopover(
+        content=ft.OutlinedButton(text="10,000 commands", icon=ft.Icons.LIST),
+        body=PopoverMenu(
+            fetch=lambda offset, limit: [
+                PopoverMenuItem(title, result=offset + i)
+                for i, title in enumerate(commands[offset : offset + limit])
+            ],
+            item_count=len(commands),
+        ),
+        on_pop=on_menu_selected,
     )
 
     # Example 4: Form Popover
@@ -155,7 +178,6 @@ def main(page: ft.Page):
         content=ft.OutlinedButton(
             text="Quick Form",
             icon=ft.Icons.EDIT,
-            on_click=lambda e: form_popover.open(),
         ),
         body=ft.Container(
             content=ft.Column(
@@ -250,6 +272,7 @@ def main(page: ft.Page):
             padding=20,
         ),
         direction=PopoverDirection.TOP,
+        trigger_mode=PopoverTriggerMode.MANUAL,
     )
 
     # Example 6: Different Transitions
@@ -286,6 +309,7 @@ def main(page: ft.Page):
                 basic_popover,
                 styled_popover,
                 menu_popover,
+                long_menu_popover,
             ],
             wrap=True,
             spacing=20,
@@ -349,6 +373,7 @@ def main(page: ft.Page):
         ft.Column(
             [
                 ft.Text("• Click on any trigger to show its popover"),
+                ft.Text("• Triggers open on the client, no on_click handler needed"),
                 ft.Text("• Most popovers can be dismissed by clicking outside"),
                 ft.Text("• The form popover requires using its buttons to close"),
                 ft.Text("• Use open() and close() methods for programmatic control"),
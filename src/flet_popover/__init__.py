@@ -1 +1,24 @@
-from flet_popover.flet_popover import FletPopover, PopoverDirection, PopoverTransition
+from flet_popover.flet_popover import (
+    FletPopover,
+    PopoverDirection,
+    PopoverDismissReason,
+    PopoverOpenEvent,
+    PopoverPlacement,
+    PopoverPopEvent,
+    PopoverPrewarm,
+    PopoverRepositionEvent,
+    PopoverTargetKind,
+    PopoverTransition,
+    PopoverTriggerMode,
+)
+from flet_popover.popover_action import PopoverAction
+from flet_popover.popover_anchor import PopoverAnchor
+from flet_popover.popover_manager import PopoverManager
+from flet_popover.popover_menu import PopoverMenu, PopoverMenuItem
+from flet_popover.popover_metrics import (
+    PopoverMetrics,
+    PopoverMetricsCollector,
+    PopoverMetricsEvent,
+)
+from flet_popover.popover_style import PopoverStyle
+from flet_popover.popover_template import PopoverField, PopoverTemplate
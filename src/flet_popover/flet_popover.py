@@ -1,15 +1,41 @@
+import asyncio
+import itertools
+import json
 from enum import Enum
-from typing import Any, Optional, List, Union
+from concurrent.futures import Future
+from typing import Any, AsyncIterable, Callable, Optional, List, Union
 from flet.core.constrained_control import ConstrainedControl
 from flet.core.control import Control, OptionalNumber
+from flet.core.control_event import ControlEvent
+from flet.core.event_handler import EventHandler
 from flet.core.types import (
     ColorValue,
     OptionalControlEventCallable,
     BorderRadius,
     Duration,
-    ColorEnums
 )
 
+from flet_popover.popover_anchor import PopoverAnchor
+from flet_popover.popover_frozen import freeze_body
+from flet_popover.popover_attrs import (
+    BOOL,
+    DURATION,
+    INT,
+    JSON,
+    NUMBER,
+    STRING,
+    PopoverAttr,
+    enum_list,
+)
+from flet_popover.popover_manager import register_popover, unregister_popover
+from flet_popover.popover_menu import PopoverMenu, StreamChunk
+from flet_popover.popover_metrics import PopoverMetricsEvent
+from flet_popover.popover_style import PopoverStyle, PopoverStyleAttrs
+from flet_popover.popover_template import PopoverTemplate
+
+
+_host_keys = itertools.count(1)
+
 
 class PopoverDirection(Enum):
     """
@@ -22,6 +48,26 @@ class PopoverDirection(Enum):
     RIGHT = "right"
 
 
+class PopoverPlacement(Enum):
+    """
+    A side of the anchor and how the popover is aligned along it: with the anchor's
+    start (left or top), its center, or its end.
+    """
+
+    TOP_START = "top_start"
+    TOP = "top"
+    TOP_END = "top_end"
+    BOTTOM_START = "bottom_start"
+    BOTTOM = "bottom"
+    BOTTOM_END = "bottom_end"
+    LEFT_START = "left_start"
+    LEFT = "left"
+    LEFT_END = "left_end"
+    RIGHT_START = "right_start"
+    RIGHT = "right"
+    RIGHT_END = "right_end"
+
+
 class PopoverTransition(Enum):
     """
     Popover transition enum.
@@ -31,7 +77,55 @@ class PopoverTransition(Enum):
     FADE = "fade"
 
 
-class FletPopover(ConstrainedControl):
+class PopoverTriggerMode(Enum):
+    """
+    Popover trigger mode enum.
+    """
+
+    TAP = "tap"
+    LONG_PRESS = "long_press"
+    HOVER = "hover"
+    MANUAL = "manual"
+
+
+class PopoverPrewarm(Enum):
+    """
+    When the client builds the body ahead of an expected open.
+    """
+
+    ON_HOVER = "on_hover"
+    ON_FOCUS = "on_focus"
+    ON_IDLE = "on_idle"
+
+
+class PopoverDismissReason(Enum):
+    """
+    Why a popover was dismissed.
+    """
+
+    BARRIER = "barrier"
+    PROGRAMMATIC = "programmatic"
+    RESULT = "result"
+    ROUTE = "route"
+    TIMEOUT = "timeout"
+    HOVER_EXIT = "hover_exit"
+    GROUP = "group"
+    PARENT = "parent"
+    FAILED = "failed"
+
+
+class PopoverTargetKind(Enum):
+    """
+    What a popover was opened at.
+    """
+
+    CONTENT = "content"
+    ANCHOR = "anchor"
+    HOST = "host"
+    POINT = "point"
+
+
+class FletPopover(ConstrainedControl, PopoverStyleAttrs):
     """
     A popover is a transient view that appears above other content onscreen when you tap a control or in an area.
 
@@ -41,6 +135,12 @@ class FletPopover(ConstrainedControl):
     or other button on the popover.
 
     This control wraps the Flutter popover package to provide popover functionality in Flet.
+
+    A popover in the body of another popover is nested in it, e.g. a submenu with
+    `direction=PopoverDirection.RIGHT` and `trigger_mode=PopoverTriggerMode.HOVER`. It
+    opens on the client next to its item, closing a sibling that is open. Closing the
+    outer popover closes the nested ones, and a selection in a nested popover closes the
+    whole chain, reported once by the outermost popover's `on_pop`.
     """
 
     def __init__(
@@ -80,10 +180,28 @@ class FletPopover(ConstrainedControl):
         #
         # FletPopover specific
         #
-        body: Control = None,  # body is now required
+        body: Control = None,  # body, body_builder or template is required
         content: Optional[Control] = None,  # content is optional
+        body_builder: Optional[Callable[[], Control]] = None,
+        template: Optional[PopoverTemplate] = None,
+        template_data: Optional[dict] = None,
+        lazy_body: Optional[bool] = None,
+        frozen_body: Optional[bool] = None,
+        evict_body_on_pop: Optional[bool] = None,
+        keep_alive: Optional[bool] = None,
+        keep_alive_limit: Optional[int] = None,
         direction: Optional[PopoverDirection] = PopoverDirection.BOTTOM,
+        placement: Optional[PopoverPlacement] = None,
+        fallback_placements: Optional[List[PopoverPlacement]] = None,
         transition: Optional[PopoverTransition] = PopoverTransition.SCALE,
+        trigger_mode: Optional[PopoverTriggerMode] = None,
+        open_delay: Optional[Duration] = None,
+        close_delay: Optional[Duration] = None,
+        auto_dismiss_after: Optional[Duration] = None,
+        group: Optional[str] = None,
+        style: Optional[PopoverStyle] = None,
+        prewarm: Optional[PopoverPrewarm] = None,
+        prewarm_ttl: Optional[int] = None,
         background_color: Optional[ColorValue] = None,
         barrier_color: Optional[ColorValue] = None,
         transition_duration: Optional[Duration] = None,
@@ -98,6 +216,10 @@ class FletPopover(ConstrainedControl):
         barrier_dismissible: Optional[bool] = None,
         modal: Optional[bool] = None,
         on_pop: OptionalControlEventCallable = None,
+        on_open: OptionalControlEventCallable = None,
+        on_reposition: OptionalControlEventCallable = None,
+        on_metrics: OptionalControlEventCallable = None,
+        metrics_sample_rate: OptionalNumber = None,
     ):
         ConstrainedControl.__init__(
             self,
@@ -135,20 +257,62 @@ class FletPopover(ConstrainedControl):
         # Initialize private attributes
         self.__content = None
         self.__body = None
-        self.__direction = None
-        self.__transition = None
-        self.__background_color = None
-        self.__barrier_color = None
+        self.__body_builder = None
+        self.__body_mounted = False
+        self.__frozen_body = False
+        self.__frozen: Optional[Control] = None
+        self.__pop_futures: List[asyncio.Future] = []
+        self.__requested_open: Optional[bool] = None
+        self.__requested_args: Optional[dict] = None
+        self.__sent_open: Optional[bool] = None
+        self.__sent_target: Optional[dict] = None
+        self.__flush_scheduled = False
+        self.__open = False
+        self.__style = None
+        self.__template = None
+
+        self.__on_pop = EventHandler()
+        self._add_event_handler("on_pop", self.__handle_pop)
+        self.__on_open = EventHandler(lambda e: PopoverOpenEvent(e))
+        self._add_event_handler("on_open", self.__on_open.get_handler())
+        self.__on_reposition = EventHandler(lambda e: PopoverRepositionEvent(e))
+        self._add_event_handler("on_reposition", self.__on_reposition.get_handler())
+        self.__on_metrics = EventHandler(lambda e: PopoverMetricsEvent(e))
+        self._add_event_handler("on_metrics", self.__on_metrics.get_handler())
+        self._add_event_handler("request_body", self.__handle_request_body)
 
         # Validate required parameters
-        if body is None:
-            raise ValueError("body parameter is required for FletPopover")
-        
+        if body is None and body_builder is None and template is None:
+            raise ValueError(
+                "body, body_builder or template parameter is required for FletPopover"
+            )
+
         # Set properties through setters to ensure proper attribute setting
         self.content = content
-        self.body = body
+        self.body_builder = body_builder
+        self.template = template
+        self.template_data = template_data
+        if body is not None:
+            self.body = body
+        if lazy_body is None and body_builder is not None:
+            lazy_body = True
+        self.lazy_body = lazy_body
+        self.frozen_body = frozen_body
+        self.evict_body_on_pop = evict_body_on_pop
+        self.keep_alive = keep_alive
+        self.keep_alive_limit = keep_alive_limit
         self.direction = direction
+        self.placement = placement
+        self.fallback_placements = fallback_placements
         self.transition = transition
+        self.trigger_mode = trigger_mode
+        self.open_delay = open_delay
+        self.close_delay = close_delay
+        self.auto_dismiss_after = auto_dismiss_after
+        self.group = group
+        self.style = style
+        self.prewarm = prewarm
+        self.prewarm_ttl = prewarm_ttl
         self.background_color = background_color
         self.barrier_color = barrier_color
         self.transition_duration = transition_duration
@@ -163,16 +327,32 @@ class FletPopover(ConstrainedControl):
         self.barrier_dismissible = barrier_dismissible
         self.modal = modal
         self.on_pop = on_pop
+        self.on_open = on_open
+        self.on_reposition = on_reposition
+        self.on_metrics = on_metrics
+        self.metrics_sample_rate = metrics_sample_rate
+
+    @classmethod
+    def from_template(
+        cls, template: PopoverTemplate, data: Optional[dict] = None, **kwargs
+    ) -> "FletPopover":
+        """
+        Creates a popover showing the body of `template`, with its fields bound to
+        `data`. Other arguments are passed to the constructor.
+        """
+        return cls(template=template, template_data=data, **kwargs)
 
     def _get_control_name(self):
         return "flet_popover"
 
     def _get_children(self):
         children = []
-        # body is required, so it should always be present
-        if self.__body is not None:
-            self.__body._set_attr_internal("n", "body")
-            children.append(self.__body)
+        # lazy bodies stay on the server until the first open
+        if self.__body_mounted or not self.lazy_body:
+            body = self.__get_frozen() if self.__frozen_body else self.__body
+            if body is not None:
+                body._set_attr_internal("n", "body")
+                children.append(body)
         # content is optional
         if self.__content is not None:
             self.__content._set_attr_internal("n", "content")
@@ -205,223 +385,587 @@ class FletPopover(ConstrainedControl):
             raise ValueError("body cannot be None - it is required for FletPopover")
         self.__body = value
 
-    # direction
+    # body_builder
     @property
-    def direction(self) -> Optional[PopoverDirection]:
+    def body_builder(self) -> Optional[Callable[[], Control]]:
         """
-        The direction where the popover should appear relative to the trigger control.
+        A callable that creates the body on the first open. Passing it to the constructor
+        implies `lazy_body`.
         """
-        return self.__direction
+        return self.__body_builder
 
-    @direction.setter
-    def direction(self, value: Optional[PopoverDirection]):
-        self.__direction = value
-        self._set_attr("direction", value.value if value else None)
+    @body_builder.setter
+    def body_builder(self, value: Optional[Callable[[], Control]]):
+        self.__body_builder = value
 
-    # transition
+    # template
     @property
-    def transition(self) -> Optional[PopoverTransition]:
+    def template(self) -> Optional[PopoverTemplate]:
         """
-        The transition animation to use when showing/hiding the popover.
+        A `PopoverTemplate` whose body is shown when this popover has no `body` of its
+        own. The template's body is sent once for all of its popovers.
         """
-        return self.__transition
+        return self.__template
 
-    @transition.setter
-    def transition(self, value: Optional[PopoverTransition]):
-        self.__transition = value
-        self._set_attr("transition", value.value if value else None)
+    @template.setter
+    def template(self, value: Optional[PopoverTemplate]):
+        self.__template = value
+        self._set_attr(
+            "template", value._get_template_key() if value is not None else None
+        )
 
-    # background_color
+    # frozen_body
     @property
-    def background_color(self) -> Optional[ColorValue]:
-        """
-        The background color of the popover.
-        """
-        return self.__background_color
+    def frozen_body(self) -> bool:
+        """
+        Whether the body is the same for every session, as for help texts or legends.
+        It is then serialized once per process and the result is shared by the popovers
+        of all sessions that use the same `body` or `body_builder`, e.g. a module-level
+        control or function; `body_builder` isn't called again while the serialized
+        body is cached.
+
+        A frozen body is static: it handles no events and changing it doesn't update
+        the client. `PopoverAction` results still work. See `unfreeze()`.
+        """
+        return self.__frozen_body
+
+    @frozen_body.setter
+    def frozen_body(self, value: Optional[bool]):
+        self.__frozen_body = bool(value)
+        self.__frozen = None
+
+    def __get_frozen(self) -> Optional[Control]:
+        if self.__frozen is None:
+            if self.__body is not None:
+                body = self.__body
+                self.__frozen = freeze_body(body, lambda: body)
+            elif self.__body_builder is not None:
+                self.__frozen = freeze_body(self.__body_builder, self.__body_builder)
+        return self.__frozen
+
+    # Attributes
+    template_data = PopoverAttr("templateData", JSON)
+    """
+    The values shown by the `PopoverField`s of `template`, by field name. Updating it
+    sends only the data; an open popover shows the new values.
+    """
 
-    @background_color.setter
-    def background_color(self, value: Optional[ColorValue]):
-        self.__background_color = value
-        self._set_enum_attr("backgroundColor", value, ColorEnums)
+    lazy_body = PopoverAttr("lazyBody", BOOL, default=False)
+    """
+    Whether the body is sent to the client only when the popover is opened for the first time.
+    """
 
-    # barrier_color
-    @property
-    def barrier_color(self) -> Optional[ColorValue]:
-        """
-        The color of the barrier (overlay) behind the popover.
-        """
-        return self.__barrier_color
+    evict_body_on_pop = PopoverAttr("evictBodyOnPop", BOOL, default=False)
+    """
+    Whether a lazy body is removed from the client after the popover is dismissed.
+    """
 
-    @barrier_color.setter
-    def barrier_color(self, value: Optional[ColorValue]):
-        self.__barrier_color = value
-        self._set_enum_attr("barrierColor", value, ColorEnums)
+    keep_alive = PopoverAttr("keepAlive", BOOL, default=False)
+    """
+    Whether the body's widgets and their state (scroll positions, focus, text input)
+    are kept on the client between openings, so reopening doesn't rebuild the body.
+    """
 
-    # transition_duration
-    @property
-    def transition_duration(self) -> Optional[Duration]:
-        """
-        The duration of the transition animation.
-        """
-        return self._get_attr("transitionDuration")
+    keep_alive_limit = PopoverAttr("keepAliveLimit", INT)
+    """
+    The maximum number of kept-alive bodies on the page. The least recently closed
+    bodies are evicted first. Defaults to `8`; the value of the most recently opened
+    popover applies.
+    """
 
-    @transition_duration.setter
-    def transition_duration(self, value: Optional[Duration]):
-        self._set_attr("transitionDuration", value)
+    direction = PopoverAttr("direction", PopoverDirection, default=PopoverDirection.BOTTOM)
+    """
+    The direction where the popover should appear relative to the trigger control.
+    """
 
-    # radius
-    @property
-    def radius(self) -> OptionalNumber:
-        """
-        The border radius of the popover.
-        """
-        return self._get_attr("radius", data_type="float")
+    placement = PopoverAttr("placement", PopoverPlacement)
+    """
+    Where the popover is preferably shown, taking precedence over `direction`, e.g.
+    `PopoverPlacement.BOTTOM_START` to line its left edge up with the anchor's.
 
-    @radius.setter
-    def radius(self, value: OptionalNumber):
-        self._set_attr("radius", value)
+    The client scores every candidate placement by how much of the popover stays on
+    screen, clear of safe areas, the keyboard and other open popovers, then by
+    preference, and moves the chosen one along its side to keep it on screen.
+    """
 
-    # border_radius
-    @property
-    def border_radius(self) -> Optional[BorderRadius]:
-        """
-        The border radius of the popover (more detailed than radius).
-        """
-        return self._get_attr("borderRadius")
+    fallback_placements = PopoverAttr("fallbackPlacements", enum_list(PopoverPlacement))
+    """
+    The placements the client may choose from besides `placement`, in order of
+    preference. By default every side and alignment may be chosen, starting with the
+    preferred side, then the opposite one.
+    """
 
-    @border_radius.setter
-    def border_radius(self, value: Optional[BorderRadius]):
-        self._set_attr("borderRadius", value)
+    transition = PopoverAttr("transition", PopoverTransition, default=PopoverTransition.SCALE)
+    """
+    The transition animation to use when showing/hiding the popover.
+    """
 
+    trigger_mode = PopoverAttr("triggerMode", PopoverTriggerMode, default=PopoverTriggerMode.TAP)
+    """
+    The gesture on `content` that opens the popover on the client, without a round
+    trip to the server. Defaults to `PopoverTriggerMode.TAP`. Use
+    `PopoverTriggerMode.MANUAL` to open the popover only with `open()`.
 
-    @property
-    def arrow_width(self) -> OptionalNumber:
-        """
-        The width of the popover arrow.
-        """
-        return self._get_attr("arrowWidth", data_type="float")
+    With `PopoverTriggerMode.HOVER` the popover opens when the pointer enters
+    `content` and closes when the pointer leaves both `content` and the popover, see
+    `close_delay`. `on_pop` then reports `PopoverDismissReason.HOVER_EXIT`.
+    """
 
-    @arrow_width.setter
-    def arrow_width(self, value: OptionalNumber):
-        self._set_attr("arrowWidth", value)
+    open_delay = PopoverAttr("openDelay", DURATION, default=0)
+    """
+    How long the client waits before a gesture on `content` opens the popover, as a
+    `Duration` or in milliseconds. The open is cancelled if the pointer leaves `content`
+    in the meantime, so passing over a hover trigger doesn't open it.
+    """
 
-    # arrow_height
-    @property
-    def arrow_height(self) -> OptionalNumber:
-        """
-        The height of the popover arrow.
-        """
-        return self._get_attr("arrowHeight", data_type="float")
+    close_delay = PopoverAttr("closeDelay", DURATION, default=0)
+    """
+    How long the pointer may be away from `content` and the popover before a hover
+    popover closes, as a `Duration` or in milliseconds. Coming back in time keeps it
+    open.
+    """
 
-    @arrow_height.setter
-    def arrow_height(self, value: OptionalNumber):
-        self._set_attr("arrowHeight", value)
+    auto_dismiss_after = PopoverAttr("autoDismissAfter", DURATION)
+    """
+    Closes the popover on the client after it has been open this long, as a `Duration`
+    or in milliseconds, e.g. for toasts. The timer is held while the pointer is over the
+    popover and starts over when it leaves. `on_pop` reports
+    `PopoverDismissReason.TIMEOUT`.
+    """
 
-    # arrow_dx_offset
-    @property
-    def arrow_dx_offset(self) -> OptionalNumber:
-        """
-        The horizontal offset of the popover arrow.
-        """
-        return self._get_attr("arrowDxOffset", data_type="float")
+    group = PopoverAttr("group", STRING)
+    """
+    An exclusivity group. Opening the popover closes the open popover of the same
+    group on the client, which reports `PopoverDismissReason.GROUP`.
+    """
 
-    @arrow_dx_offset.setter
-    def arrow_dx_offset(self, value: OptionalNumber):
-        self._set_attr("arrowDxOffset", value)
+    prewarm = PopoverAttr("prewarm", PopoverPrewarm)
+    """
+    When the client builds and lays out the body before the popover is opened, so
+    the first frame of the open has nothing left to build. A lazy body is requested
+    from the server at the same moment. Defaults to no prewarming.
+    """
 
-    # arrow_dy_offset
-    @property
-    def arrow_dy_offset(self) -> OptionalNumber:
-        """
-        The vertical offset of the popover arrow.
-        """
-        return self._get_attr("arrowDyOffset", data_type="float")
+    prewarm_ttl = PopoverAttr("prewarmTtl", INT, default=5000)
+    """
+    How long, in milliseconds, a prewarmed body is kept built when the popover isn't
+    opened. Defaults to `5000`.
+    """
 
-    @arrow_dy_offset.setter
-    def arrow_dy_offset(self, value: OptionalNumber):
-        self._set_attr("arrowDyOffset", value)
+    metrics_sample_rate = PopoverAttr("metricsSampleRate", NUMBER, default=1.0)
+    """
+    The fraction of opens that are timed for `on_metrics`, from `0` to `1`.
+    """
+
+    border_radius = PopoverAttr("borderRadius", JSON)
+    """
+    The border radius of the popover (more detailed than radius).
+    """
 
-    # content_dx_offset
+    barrier_dismissible = PopoverAttr("barrierDismissible", BOOL, default=True)
+    """
+    Whether the popover can be dismissed by tapping outside of it.
+    """
+
+    modal = PopoverAttr("modal", BOOL)
+    """
+    Whether the popover blocks interaction with the rest of the page. By default, and
+    with `True`, the popover is shown in a route with a barrier.
+
+    With `False` it is shown in an overlay entry instead: opening is cheaper, the page
+    stays interactive and its route stack is left alone, and several popovers can be
+    open at once. A tap outside the popover and its content still closes it if
+    `barrier_dismissible`, and then reaches the page.
+    """
+
+    # style
     @property
-    def content_dx_offset(self) -> OptionalNumber:
+    def style(self) -> Optional[PopoverStyle]:
         """
-        The horizontal offset of the popover content.
+        A `PopoverStyle` shared with other popovers. Styling attributes set on this popover
+        take precedence over the style.
         """
-        return self._get_attr("contentDxOffset", data_type="float")
+        return self.__style
 
-    @content_dx_offset.setter
-    def content_dx_offset(self, value: OptionalNumber):
-        self._set_attr("contentDxOffset", value)
+    @style.setter
+    def style(self, value: Optional[PopoverStyle]):
+        self.__style = value
+        self._set_attr("style", value._get_style_key() if value is not None else None)
 
-    # content_dy_offset
+    # on_pop
     @property
-    def content_dy_offset(self) -> OptionalNumber:
+    def on_pop(self) -> OptionalControlEventCallable:
         """
-        The vertical offset of the popover content.
+        Event handler called when the popover is dismissed.
+
+        The event is a `PopoverPopEvent` with the dismissal `reason` and the `result` of
+        the `PopoverAction` that closed the popover, if any. An open the client couldn't
+        carry out, e.g. because the anchor wasn't found, is reported with
+        `PopoverDismissReason.FAILED`.
         """
-        return self._get_attr("contentDyOffset", data_type="float")
+        return self.__on_pop.handler
 
-    @content_dy_offset.setter
-    def content_dy_offset(self, value: OptionalNumber):
-        self._set_attr("contentDyOffset", value)
+    @on_pop.setter
+    def on_pop(self, handler: OptionalControlEventCallable):
+        self.__on_pop.handler = handler
 
-    # barrier_dismissible
+    # on_open
     @property
-    def barrier_dismissible(self) -> Optional[bool]:
+    def on_open(self) -> OptionalControlEventCallable:
         """
-        Whether the popover can be dismissed by tapping outside of it.
+        Event handler called after the popover has been opened on the client.
+
+        The event's `kind` tells what the popover was opened at. `anchor_key` is the id of
+        the `PopoverAnchor`, or the host key of the `FletPopover`, it points at, and
+        `anchor` the control if it is on the page, so a shared host can rebind its body
+        for the anchor that was tapped. `x` and `y` are set for a point.
         """
-        return self._get_attr("barrierDismissible", data_type="bool")
+        return self.__on_open.handler
 
-    @barrier_dismissible.setter
-    def barrier_dismissible(self, value: Optional[bool]):
-        self._set_attr("barrierDismissible", value)
+    @on_open.setter
+    def on_open(self, handler: OptionalControlEventCallable):
+        self.__on_open.handler = handler
+        self._set_attr("onOpen", True if handler is not None else None)
 
-    # modal
+    # on_reposition
     @property
-    def modal(self) -> Optional[bool]:
+    def on_reposition(self) -> OptionalControlEventCallable:
         """
-        Whether the popover should be modal (blocking interaction with other controls).
+        Event handler called when the open popover moved with its anchor, e.g. after a
+        scroll, a resize or a rotation. The client repositions the popover on its own; the
+        event is only sent if a handler is set, at most every 100 milliseconds.
         """
-        return self._get_attr("modal", data_type="bool")
+        return self.__on_reposition.handler
 
-    @modal.setter
-    def modal(self, value: Optional[bool]):
-        self._set_attr("modal", value)
+    @on_reposition.setter
+    def on_reposition(self, handler: OptionalControlEventCallable):
+        self.__on_reposition.handler = handler
+        self._set_attr("onReposition", True if handler is not None else None)
 
-    # on_pop
+    # on_metrics
     @property
-    def on_pop(self) -> OptionalControlEventCallable:
+    def on_metrics(self) -> OptionalControlEventCallable:
+        """
+        Event handler called with the timings of sampled opens, see `PopoverMetrics`.
+        The client sends them in batches, so the event's `samples` property holds a list.
+        A `PopoverMetricsCollector` keeps rolling percentiles of them.
+
+        Opens are only timed while a handler is set.
+        """
+        return self.__on_metrics.handler
+
+    @on_metrics.setter
+    def on_metrics(self, handler: OptionalControlEventCallable):
+        self.__on_metrics.handler = handler
+        self._set_attr("onMetrics", True if handler is not None else None)
+
+    def _get_host_key(self) -> str:
+        """
+        Returns the key anchors use to find this popover on the client. A key is generated
+        if the popover is referenced before it has been added to the page.
+        """
+        key = self._get_attr("hostKey")
+        if key:
+            return key
+        if self.uid is not None:
+            return self.uid
+        key = f"host{next(_host_keys)}"
+        self._set_attr("hostKey", key)
+        return key
+
+    # Lazy body
+    def _mount_body(self) -> bool:
+        """
+        Builds the lazy body if needed and marks it for sending. Returns `True` if the
+        control tree changed and needs an update.
+        """
+        if self.__body_mounted or not self.lazy_body:
+            return False
+        if self.__body is None and not self.__frozen_body:
+            self.body = self.__body_builder()
+        self.__body_mounted = True
+        return True
+
+    def _evict_body(self) -> bool:
+        """
+        Removes a lazy body from the client. Returns `True` if the control tree changed.
+        """
+        if not self.__body_mounted or not self.evict_body_on_pop:
+            return False
+        self.__body_mounted = False
+        self.__frozen = None
+        if self.__body_builder is not None:
+            self.__body = None
+        return True
+
+    def __handle_request_body(self, e: ControlEvent):
+        if self._mount_body():
+            self.update()
+
+    async def __handle_pop(self, e: ControlEvent):
+        pe = PopoverPopEvent(e)
+        self._settle_pop(pe.result)
+        # popovers opened from the body were closed on the client along with this
+        # one, without events of their own
+        for popover in _nested_popovers(self.body):
+            popover._settle_pop(None)
+        if self._evict_body():
+            self.update()
+        await self.__on_pop.get_handler()(pe)
+
+    def _settle_pop(self, result: Any):
+        # the client closed the popover, so any earlier request is settled
+        self.__requested_open = None
+        self.__sent_open = None
+        self.__sent_target = None
+        futures, self.__pop_futures = self.__pop_futures, []
+        for future in futures:
+            if not future.done():
+                future.set_result(result)
+
+    def did_mount(self):
+        super().did_mount()
+        register_popover(self)
+
+    def will_unmount(self):
+        super().will_unmount()
+        unregister_popover(self)
+        futures, self.__pop_futures = self.__pop_futures, []
+        for future in futures:
+            future.cancel()
+
+    # is_open
+    @property
+    def is_open(self) -> bool:
+        """
+        Whether the popover is currently shown. The client keeps this value in sync.
+        """
+        return self.__open
+
+    def _set_attr(self, name: str, value, dirty: bool = True):
+        if name == "open":
+            # parsed once as the client syncs it, not on every read of is_open
+            self.__open = value is True or value == "true"
+        super()._set_attr(name, value, dirty)
+
+    # Open state requests
+    def __request_open(self, open: bool, args: Optional[dict] = None):
+        self.__requested_open = open
+        self.__requested_args = args
+        if self.__flush_scheduled:
+            return
+        loop = self.page.loop if self.page is not None else None
+        if loop is None or not loop.is_running():
+            self.__flush_open_request()
+            return
+        # calls made until the loop gets control collapse into the last one
+        self.__flush_scheduled = True
+        loop.call_soon_threadsafe(self.__flush_open_request)
+
+    def _cancel_pending_open(self):
+        """
+        Drops an open requested in this tick that hasn't been sent to the client yet, and
+        forgets the last one sent, which the client drops when closed in the same frame.
+        """
+        if self.__requested_open:
+            self.__requested_open = None
+        self.__sent_open = None
+        self.__sent_target = None
+
+    def __flush_open_request(self):
+        self.__flush_scheduled = False
+        open = self.__requested_open
+        if open is None or self.page is None:
+            return
+        current = self.__sent_open if self.__sent_open is not None else self.is_open
+        args = self.__requested_args or {}
+        target = {k: args.get(k) for k in ("anchor", "x", "y")} if open else None
+        # an open popover is moved when shown at another target
+        if open == current and (not open or target == self.__sent_target):
+            return
+        self.__sent_open = open
+        self.__sent_target = target
+        self.invoke_method(
+            "show_popover" if open else "hide_popover",
+            self.__requested_args,
+            wait_for_result=False,
+        )
+
+    # Methods
+    def unfreeze(self, body: Optional[Control] = None) -> Control:
         """
-        Event handler called when the popover is dismissed.
+        Gives this popover a body of its own instead of the frozen one, e.g. to change it
+        for one session: `body`, or by default a new one from `body_builder`. The body
+        can then be changed like any other. Returns the body.
         """
-        return self._get_event_handler("on_pop")
-
-    @on_pop.setter
-    def on_pop(self, handler: OptionalControlEventCallable):
-        self._add_event_handler("on_pop", handler)
+        if body is None:
+            if self.__body_builder is None:
+                raise ValueError(
+                    "unfreeze() needs a body when the popover has no body_builder"
+                )
+            body = self.__body_builder()
+        self.frozen_body = False
+        self.body = body
+        if self.page is not None:
+            self.update()
+        return body
 
-    # Methods
-    def show_popover(self):
+    def show_popover(
+        self,
+        anchor: Optional[Control] = None,
+        x: OptionalNumber = None,
+        y: OptionalNumber = None,
+    ):
         """
         Show the popover programmatically.
-        """
-        self.invoke_method("show_popover", wait_for_result=False)
+
+        If `anchor` is given, the popover points at that `PopoverAnchor` or `FletPopover`
+        instead of its own `content`. If `x` and `y` are given, it points at that position,
+        in logical pixels from the top left corner of the page, e.g. where a chart or a
+        canvas was clicked. Either way, a single popover can serve any number of targets
+        without adding controls for them.
+
+        Repeated calls are collapsed, so only the last requested state reaches the client.
+        Showing an open popover at another target moves it there.
+        """
+        if (x is None) != (y is None):
+            raise ValueError("x and y must be given together")
+        if anchor is not None and x is not None:
+            raise ValueError("a popover is shown either at an anchor or at x and y")
+        args = {"anchor": _anchor_key(anchor), "x": x, "y": y}
+        if self._mount_body():
+            self.update()
+            args["await_body"] = "true"
+        self.__request_open(True, args)
+
+    async def open_async(
+        self,
+        anchor: Optional[Control] = None,
+        x: OptionalNumber = None,
+        y: OptionalNumber = None,
+    ) -> Any:
+        """
+        Opens the popover and waits until it is dismissed. See `show_popover()` for the
+        arguments.
+
+        Returns the `result` of the `PopoverAction` that closed the popover, or `None` if
+        it was dismissed otherwise.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self.__pop_futures.append(future)
+        try:
+            self.show_popover(anchor, x, y)
+        except Exception:
+            self.__pop_futures.remove(future)
+            raise
+        return await future
 
     def hide_popover(self):
         """
         Hide the popover programmatically.
         """
-        self.invoke_method("hide_popover", wait_for_result=False)
+        self.__request_open(False)
 
-    def open(self):
+    def open(
+        self,
+        anchor: Optional[Control] = None,
+        x: OptionalNumber = None,
+        y: OptionalNumber = None,
+    ):
         """
         Open the popover programmatically. Alias for show_popover().
         """
-        self.show_popover()
+        self.show_popover(anchor, x, y)
 
     def close(self):
         """
         Close the popover programmatically. Alias for hide_popover().
         """
         self.hide_popover()
+
+    def stream_items(self, items: AsyncIterable[StreamChunk]) -> Future:
+        """
+        Streams items into the popover's `PopoverMenu` body. See
+        `PopoverMenu.stream_items()`.
+        """
+        if self._mount_body():
+            self.update()
+        if not isinstance(self.body, PopoverMenu):
+            raise ValueError("stream_items() requires a PopoverMenu body")
+        return self.body.stream_items(items)
+
+
+def _nested_popovers(control: Optional[Control]):
+    if control is None:
+        return
+    for child in control._get_children():
+        if isinstance(child, FletPopover):
+            yield child
+        yield from _nested_popovers(child)
+
+
+def _find_target(page, kind: PopoverTargetKind, key: str) -> Optional[Control]:
+    control = page.get_control(key)
+    if control is not None or kind != PopoverTargetKind.HOST:
+        return control
+    # a popover referenced before it was added goes by a generated key
+    return next(
+        (
+            c
+            for c in list(page._index.values())
+            if isinstance(c, FletPopover) and c._get_attr("hostKey") == key
+        ),
+        None,
+    )
+
+
+def _anchor_key(anchor: Optional[Control]) -> Optional[str]:
+    if anchor is None:
+        return None
+    if isinstance(anchor, FletPopover):
+        return anchor._get_host_key()
+    if isinstance(anchor, PopoverAnchor):
+        return anchor.uid
+    raise ValueError(
+        "anchor must be a PopoverAnchor or a FletPopover; wrap other controls in a "
+        "PopoverAnchor"
+    )
+
+
+class PopoverOpenEvent(ControlEvent):
+    def __init__(self, e: ControlEvent):
+        super().__init__(e.target, e.name, e.data, e.control, e.page)
+        d = json.loads(e.data) if e.data else {}
+        self.kind: PopoverTargetKind = PopoverTargetKind(d.get("kind", "content"))
+        # the anchor's id, or the host key of the popover it was opened at
+        self.anchor_key: Optional[str] = d.get("key")
+        self.x: Optional[float] = d.get("x")
+        self.y: Optional[float] = d.get("y")
+        self.anchor: Optional[Control] = (
+            _find_target(e.page, self.kind, self.anchor_key)
+            if self.anchor_key
+            else None
+        )
+
+
+class PopoverPopEvent(ControlEvent):
+    def __init__(self, e: ControlEvent):
+        super().__init__(e.target, e.name, e.data, e.control, e.page)
+        d = json.loads(e.data) if e.data else {}
+        self.reason: Optional[PopoverDismissReason] = (
+            PopoverDismissReason(d["reason"]) if d.get("reason") else None
+        )
+        self.result: Any = d.get("result")
+
+
+class PopoverRepositionEvent(ControlEvent):
+    def __init__(self, e: ControlEvent):
+        super().__init__(e.target, e.name, e.data, e.control, e.page)
+        d = json.loads(e.data)
+        # the anchor's rect on the page and where the popover is shown
+        self.x: float = d["x"]
+        self.y: float = d["y"]
+        self.width: float = d["width"]
+        self.height: float = d["height"]
+        self.direction: PopoverDirection = PopoverDirection(d["direction"])
+        self.placement: PopoverPlacement = PopoverPlacement(d["placement"])
@@ -0,0 +1,71 @@
+import json
+from typing import Any, Optional
+
+from flet.core.control import Control
+
+
+class PopoverAction(Control):
+    """
+    Closes the enclosing `FletPopover` with a result when its `content` is tapped.
+
+    The popover is closed on the client, and `result` comes back to Python in the same
+    `on_pop` event that reports the dismissal, so a menu selection costs a single message.
+    `FletPopover.open_async()` resolves to this result.
+    """
+
+    def __init__(
+        self,
+        content: Optional[Control] = None,
+        result: Any = None,
+        ref=None,
+        visible: Optional[bool] = None,
+        disabled: Optional[bool] = None,
+        data: Any = None,
+    ):
+        Control.__init__(
+            self,
+            ref=ref,
+            visible=visible,
+            disabled=disabled,
+            data=data,
+        )
+
+        self.__content = None
+        self.__result = None
+
+        self.content = content
+        self.result = result
+
+    def _get_control_name(self):
+        return "flet_popover_action"
+
+    def _get_children(self):
+        if self.__content is None:
+            return []
+        self.__content._set_attr_internal("n", "content")
+        return [self.__content]
+
+    # content
+    @property
+    def content(self) -> Optional[Control]:
+        """
+        The control that closes the popover when tapped.
+        """
+        return self.__content
+
+    @content.setter
+    def content(self, value: Optional[Control]):
+        self.__content = value
+
+    # result
+    @property
+    def result(self) -> Any:
+        """
+        A JSON-serializable value reported as the popover's result.
+        """
+        return self.__result
+
+    @result.setter
+    def result(self, value: Any):
+        self.__result = value
+        self._set_attr("result", json.dumps(value) if value is not None else None)
@@ -0,0 +1,85 @@
+from typing import TYPE_CHECKING, Any, Optional
+
+from flet.core.control import Control
+
+if TYPE_CHECKING:
+    from flet_popover.flet_popover import FletPopover
+
+
+class PopoverAnchor(Control):
+    """
+    A lightweight trigger for a shared host `FletPopover`.
+
+    An anchor only marks its `content` as a place the host popover can point at. It has no
+    body and no method subscription of its own, so thousands of anchors can share a single
+    host and a single body instance.
+
+    Tapping the anchor opens the host popover at the anchor. The host receives an `on_open`
+    event with the anchor, which can be used to rebind the host's body.
+    """
+
+    def __init__(
+        self,
+        content: Optional[Control] = None,
+        popover: "Optional[FletPopover]" = None,
+        ref=None,
+        visible: Optional[bool] = None,
+        disabled: Optional[bool] = None,
+        data: Any = None,
+    ):
+        Control.__init__(
+            self,
+            ref=ref,
+            visible=visible,
+            disabled=disabled,
+            data=data,
+        )
+
+        self.__content = None
+        self.__popover = None
+
+        self.content = content
+        self.popover = popover
+
+    def _get_control_name(self):
+        return "flet_popover_anchor"
+
+    def _get_children(self):
+        if self.__content is None:
+            return []
+        self.__content._set_attr_internal("n", "content")
+        return [self.__content]
+
+    def before_update(self):
+        super().before_update()
+        self._set_attr(
+            "popover",
+            self.__popover._get_host_key() if self.__popover is not None else None,
+        )
+
+    # content
+    @property
+    def content(self) -> Optional[Control]:
+        """
+        The control that opens the host popover when tapped.
+        """
+        return self.__content
+
+    @content.setter
+    def content(self, value: Optional[Control]):
+        self.__content = value
+
+    # popover
+    @property
+    def popover(self) -> "Optional[FletPopover]":
+        """
+        The host `FletPopover` shown at this anchor.
+        """
+        return self.__popover
+
+    @popover.setter
+    def popover(self, value: "Optional[FletPopover]"):
+        self.__popover = value
+        if value is not None:
+            # resolve the host key before the host is serialized
+            value._get_host_key()
@@ -0,0 +1,180 @@
+import json
+from enum import Enum
+from typing import Any, Iterator, Optional, Type, Union
+
+from flet.core.embed_json_encoder import EmbedJsonEncoder
+from flet.core.types import Duration
+
+
+class _Kind:
+    """
+    How values of an attribute are validated, cached and written to the wire.
+    """
+
+    def __init__(self, name: str, dart_type: Optional[str]):
+        self.name = name
+        self.dart_type = dart_type
+
+    def convert(self, attr: "PopoverAttr", value: Any) -> Any:
+        return value
+
+    def to_wire(self, value: Any) -> Any:
+        return value
+
+
+class _TypeKind(_Kind):
+    def __init__(self, name: str, dart_type: str, *types: type):
+        super().__init__(name, dart_type)
+        self.types = types
+
+    def convert(self, attr, value):
+        if isinstance(value, bool) and bool not in self.types:
+            raise ValueError(f"{attr.name} must be a {self.name}, got {value!r}")
+        if not isinstance(value, self.types):
+            raise ValueError(f"{attr.name} must be a {self.name}, got {value!r}")
+        return value
+
+
+class _EnumKind(_Kind):
+    def __init__(self, enum_type: Type[Enum]):
+        super().__init__(enum_type.__name__, "String")
+        self.enum_type = enum_type
+
+    def convert(self, attr, value):
+        try:
+            return self.enum_type(value)
+        except ValueError:
+            raise ValueError(
+                f"{attr.name} must be a {self.enum_type.__name__}, got {value!r}"
+            ) from None
+
+    def to_wire(self, value):
+        return value.value
+
+
+class _EnumListKind(_Kind):
+    def __init__(self, enum_type: Type[Enum]):
+        super().__init__(f"list of {enum_type.__name__}", "String")
+        self.enum_type = enum_type
+
+    def convert(self, attr, value):
+        if isinstance(value, (str, Enum)):
+            value = [value]
+        try:
+            return tuple(self.enum_type(item) for item in value)
+        except (TypeError, ValueError):
+            raise ValueError(
+                f"{attr.name} must be a list of {self.enum_type.__name__}, got {value!r}"
+            ) from None
+
+    def to_wire(self, value):
+        return ",".join(item.value for item in value)
+
+
+class _ColorKind(_Kind):
+    def convert(self, attr, value):
+        if not isinstance(value, (str, Enum)):
+            raise ValueError(f"{attr.name} must be a color, got {value!r}")
+        return value
+
+    def to_wire(self, value):
+        return value.value if isinstance(value, Enum) else value
+
+
+class _DurationKind(_Kind):
+    def convert(self, attr, value):
+        if isinstance(value, bool) or not isinstance(value, (int, Duration)):
+            raise ValueError(
+                f"{attr.name} must be a Duration or milliseconds, got {value!r}"
+            )
+        return value
+
+    def to_wire(self, value):
+        if isinstance(value, int):
+            return value
+        return (
+            value.microseconds // 1000
+            + value.milliseconds
+            + 1000
+            * (
+                value.seconds
+                + 60 * (value.minutes + 60 * (value.hours + 24 * value.days))
+            )
+        )
+
+
+class _JsonKind(_Kind):
+    def to_wire(self, value):
+        return json.dumps(value, cls=EmbedJsonEncoder, separators=(",", ":"))
+
+
+BOOL = _TypeKind("bool", "bool", bool)
+INT = _TypeKind("int", "int", int)
+NUMBER = _TypeKind("number", "double", int, float)
+STRING = _TypeKind("string", "String", str)
+COLOR = _ColorKind("color", None)
+DURATION = _DurationKind("duration", "int")
+JSON = _JsonKind("JSON value", None)
+
+
+def enum_list(enum_type: Type[Enum]) -> _Kind:
+    """
+    The kind of attributes holding a list of `enum_type` members, sent comma-separated.
+    """
+    return _EnumListKind(enum_type)
+
+
+class PopoverAttr:
+    """
+    A control property backed by a wire attribute.
+
+    The value is validated and converted once when it is set and kept in an instance
+    attribute of the control, so reading it doesn't parse the attribute string again. Attributes equal to
+    their `default` are left out of the wire, as the client falls back to the same
+    default. `styled` attributes can also come from a `PopoverStyle`, so they are always
+    sent to take precedence over it.
+    """
+
+    def __init__(
+        self,
+        wire_name: str,
+        kind: Union[_Kind, Type[Enum]],
+        default: Any = None,
+        styled: bool = False,
+    ):
+        self.wire_name = wire_name
+        self.kind = _EnumKind(kind) if isinstance(kind, type) else kind
+        self.default = default
+        self.styled = styled
+        self.name = wire_name
+        self.field = None
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+        self.field = f"_{name}_value"
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return getattr(obj, self.field, None)
+
+    def __set__(self, obj, value):
+        if value is not None:
+            value = self.kind.convert(self, value)
+        setattr(obj, self.field, value)
+        if value is None or (not self.styled and value == self.default):
+            obj._set_attr(self.wire_name, None)
+        else:
+            obj._set_attr(self.wire_name, self.kind.to_wire(value))
+
+
+def iter_attrs(cls: type) -> Iterator[PopoverAttr]:
+    """
+    Yields the `PopoverAttr` properties of `cls`, including inherited ones, once each.
+    """
+    seen = set()
+    for klass in reversed(cls.__mro__):
+        for value in vars(klass).values():
+            if isinstance(value, PopoverAttr) and value.wire_name not in seen:
+                seen.add(value.wire_name)
+                yield value
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+from weakref import WeakKeyDictionary
+
+from flet.core.control import Control
+from flet.core.protocol import Command
+
+# Serialized bodies kept per process, shared by all sessions
+FROZEN_BODY_CACHE_SIZE = 128
+
+
+@dataclass(frozen=True)
+class _FrozenTree:
+    """
+    The serialized form of a control and its descendants.
+    """
+
+    name: str
+    attrs: Dict[str, str]
+    children: Tuple["_FrozenTree", ...]
+
+
+_lock = threading.Lock()
+_bodies: "OrderedDict[str, _FrozenTree]" = OrderedDict()
+_sources: "WeakKeyDictionary[Any, str]" = WeakKeyDictionary()
+
+
+class _FrozenControl(Control):
+    """
+    Stands for a control of a frozen body in one session. It sends the serialized
+    attributes of the control instead of building them, and handles no events.
+    """
+
+    def __init__(self, tree: _FrozenTree):
+        Control.__init__(self)
+        self.__tree = tree
+        self.__children = [_FrozenControl(child) for child in tree.children]
+
+    def _get_control_name(self):
+        return self.__tree.name
+
+    def _get_children(self):
+        return self.__children
+
+    def _build_command(self, update: bool = False) -> Command:
+        command = super()._build_command(update)
+        if not update:
+            # the name under which the parent holds the control comes last
+            command.attrs = {**self.__tree.attrs, **command.attrs}
+        return command
+
+
+def freeze_body(source: Any, build: Callable[[], Control]) -> Control:
+    """
+    Returns a stand-in for the body `build()` returns, for one session.
+
+    The body is serialized once per process and kept in an LRU of
+    `FROZEN_BODY_CACHE_SIZE` bodies keyed by content hash, so identical bodies are
+    stored once. `source`, the body or the function building it, maps to its hash: a
+    session mounting the same source reuses the serialized body without calling
+    `build`.
+    """
+    with _lock:
+        key = _sources.get(source)
+        tree = _bodies.get(key) if key is not None else None
+        if tree is not None:
+            _bodies.move_to_end(key)
+    if tree is None:
+        # built outside the lock; a source frozen by two sessions at once is
+        # serialized twice, and the content hash keeps one copy
+        tree = _serialize(build())
+        key = _content_hash(tree)
+        with _lock:
+            tree = _bodies.setdefault(key, tree)
+            _sources[source] = key
+            _bodies.move_to_end(key)
+            while len(_bodies) > FROZEN_BODY_CACHE_SIZE:
+                _bodies.popitem(last=False)
+    return _FrozenControl(tree)
+
+
+def _serialize(body: Control) -> _FrozenTree:
+    # building the commands marks the attributes clean and parents the children, which
+    # would hold back updates to a body that is also mounted somewhere
+    saved = [_save_state(control) for control in _walk(body)]
+    try:
+        commands = body._build_add_commands()
+    finally:
+        for state in saved:
+            _restore_state(*state)
+    # commands list the controls depth-first, indented by depth
+    stack: List[Tuple[int, str, Dict[str, str], list]] = []
+    root = None
+    for command in commands:
+        attrs = {k: v for k, v in command.attrs.items() if k != "id"}
+        node = (command.indent, command.values[-1], attrs, [])
+        while stack and stack[-1][0] >= command.indent:
+            stack.pop()
+        if stack:
+            stack[-1][3].append(node)
+        else:
+            root = node
+        stack.append(node)
+    # the popover names its body itself
+    root[2].pop("n", None)
+    return _freeze(root)
+
+
+def _walk(control: Control) -> Iterator[Control]:
+    yield control
+    for child in control._get_children():
+        yield from _walk(child)
+
+
+def _save_state(control: Control):
+    return (
+        control,
+        control.parent,
+        dict(control._Control__attrs),
+        list(control._Control__previous_children),
+    )
+
+
+def _restore_state(control: Control, parent, attrs, previous_children):
+    control.parent = parent
+    control._Control__attrs.clear()
+    control._Control__attrs.update(attrs)
+    control._Control__previous_children[:] = previous_children
+
+
+def _freeze(node) -> _FrozenTree:
+    _, name, attrs, children = node
+    return _FrozenTree(name, attrs, tuple(_freeze(child) for child in children))
+
+
+def _content_hash(tree: _FrozenTree) -> str:
+    def encode(node: _FrozenTree):
+        return [node.name, node.attrs, [encode(child) for child in node.children]]
+
+    return hashlib.sha1(
+        json.dumps(encode(tree), sort_keys=True, separators=(",", ":")).encode()
+    ).hexdigest()
@@ -0,0 +1,101 @@
+import json
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+from weakref import WeakKeyDictionary
+
+from flet.core.control import Control
+
+if TYPE_CHECKING:
+    from flet.core.page import Page
+
+    from flet_popover.flet_popover import FletPopover
+
+# Popovers mounted on each page, by control id
+_registries: "WeakKeyDictionary[Page, Dict[str, FletPopover]]" = WeakKeyDictionary()
+
+
+def register_popover(popover: "FletPopover"):
+    _registries.setdefault(popover.page, {})[popover.uid] = popover
+
+
+def unregister_popover(popover: "FletPopover"):
+    registry = _registries.get(popover.page)
+    if registry is not None and registry.get(popover.uid) is popover:
+        del registry[popover.uid]
+
+
+class PopoverManager(Control):
+    """
+    Page-wide access to the popovers on a page.
+
+    A manager is a non-visual control: add it once to `page.overlay`. It finds the
+    page's popovers by control id, tells which of them are open, and closes any number
+    of them with a single message, e.g. on navigation.
+
+    Popovers that shouldn't be open at the same time don't need a manager; give them
+    the same `group`.
+    """
+
+    def __init__(
+        self,
+        ref=None,
+        data: Any = None,
+    ):
+        Control.__init__(
+            self,
+            ref=ref,
+            data=data,
+        )
+
+    def _get_control_name(self):
+        return "flet_popover_manager"
+
+    def __registry(self) -> "Dict[str, FletPopover]":
+        return _registries.get(self.page, {}) if self.page is not None else {}
+
+    # popovers
+    @property
+    def popovers(self) -> "List[FletPopover]":
+        """
+        The popovers on the page.
+        """
+        return list(self.__registry().values())
+
+    # open_popovers
+    @property
+    def open_popovers(self) -> "List[FletPopover]":
+        """
+        The popovers on the page that are open, as last reported by the client.
+        """
+        return [p for p in self.__registry().values() if p.is_open]
+
+    # Methods
+    def get(self, id: str) -> "Optional[FletPopover]":
+        """
+        Returns the popover on the page with the control id `id`.
+        """
+        return self.__registry().get(id)
+
+    def close_all(self):
+        """
+        Closes every popover on the page, including the ones opened on the client that the
+        server hasn't heard of yet, and cancels pending opens.
+        """
+        for popover in self.__registry().values():
+            popover._cancel_pending_open()
+        self.invoke_method("close", wait_for_result=False)
+
+    def close_where(self, predicate: "Callable[[FletPopover], bool]"):
+        """
+        Closes the popovers on the page for which `predicate` returns `True`, and cancels
+        their pending opens.
+        """
+        matches = {id: p for id, p in self.__registry().items() if predicate(p)}
+        for popover in matches.values():
+            popover._cancel_pending_open()
+        ids = list(matches)
+        if ids:
+            self.invoke_method(
+                "close",
+                {"ids": json.dumps(ids, separators=(",", ":"))},
+                wait_for_result=False,
+            )
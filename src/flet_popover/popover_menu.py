@@ -0,0 +1,268 @@
+import asyncio
+import inspect
+import json
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, Awaitable, Callable, Optional, Sequence, Union
+
+from flet.core.control import Control
+from flet.core.control_event import ControlEvent
+
+from flet_popover.popover_attrs import INT, NUMBER, PopoverAttr
+
+
+@dataclass
+class PopoverMenuItem:
+    """
+    An entry of a `PopoverMenu`.
+    """
+
+    title: str
+    subtitle: Optional[str] = None
+    result: Any = None
+    """
+    A JSON-serializable value reported as the popover's result when the item is
+    selected. Defaults to `title`.
+    """
+
+
+MenuItems = Sequence[Union[PopoverMenuItem, str]]
+FetchCallable = Callable[[int, int], Union[MenuItems, Awaitable[MenuItems]]]
+StreamChunk = Union[PopoverMenuItem, str, MenuItems]
+
+# Streamed items are sent at most this often, in seconds; about one frame
+_STREAM_INTERVAL = 1 / 60
+
+
+class PopoverMenu(Control):
+    """
+    A virtualized list of items for the body of a `FletPopover`.
+
+    Items aren't part of the control tree. The client asks for them a page at a time,
+    only for the rows that are scrolled into view, and `fetch(offset, limit)` returns
+    them; it may be a coroutine function. The client keeps the most recently used pages
+    in a bounded cache, so open time and memory don't grow with `item_count`.
+
+    Items can also be pushed with `stream_items()`, e.g. as search results come in.
+
+    Selecting an item closes the enclosing popover, reporting the item's `result` in
+    `on_pop`.
+    """
+
+    def __init__(
+        self,
+        fetch: Optional[FetchCallable] = None,
+        item_count: Optional[int] = None,
+        item_extent: Optional[float] = None,
+        page_size: Optional[int] = None,
+        cache_pages: Optional[int] = None,
+        width: Optional[float] = None,
+        max_height: Optional[float] = None,
+        ref=None,
+        visible: Optional[bool] = None,
+        disabled: Optional[bool] = None,
+        data: Any = None,
+    ):
+        Control.__init__(
+            self,
+            ref=ref,
+            visible=visible,
+            disabled=disabled,
+            data=data,
+        )
+
+        self.__fetch = None
+        self.__revision = 0
+        self.__stream_generation = 0
+        self.__stream_task: Optional[Future] = None
+        self.__streamed: list = []
+
+        self._add_event_handler("fetch", self.__handle_fetch)
+        self._add_event_handler("stream_sync", self.__handle_stream_sync)
+
+        self.fetch = fetch
+        self.item_count = item_count
+        self.item_extent = item_extent
+        self.page_size = page_size
+        self.cache_pages = cache_pages
+        self.width = width
+        self.max_height = max_height
+
+    def _get_control_name(self):
+        return "flet_popover_menu"
+
+    # fetch
+    @property
+    def fetch(self) -> Optional[FetchCallable]:
+        """
+        Returns up to `limit` items starting at `offset`, as `PopoverMenuItem`s or plain
+        titles.
+        """
+        return self.__fetch
+
+    @fetch.setter
+    def fetch(self, value: Optional[FetchCallable]):
+        self.__fetch = value
+
+    # Attributes
+    item_count = PopoverAttr("itemCount", INT, default=0)
+    """
+    The number of items `fetch` can return.
+    """
+
+    item_extent = PopoverAttr("itemExtent", NUMBER, default=48.0)
+    """
+    The height of every item. Items with a `subtitle` need about `64`.
+    """
+
+    page_size = PopoverAttr("pageSize", INT, default=50)
+    """
+    The number of items the client requests at a time.
+    """
+
+    cache_pages = PopoverAttr("cachePages", INT, default=8)
+    """
+    The number of pages the client keeps. The least recently shown pages are dropped
+    first and requested again when they are scrolled back into view.
+    """
+
+    width = PopoverAttr("width", NUMBER, default=280.0)
+    """
+    The width of the menu.
+    """
+
+    max_height = PopoverAttr("maxHeight", NUMBER, default=320.0)
+    """
+    The height of the menu when its items don't fit.
+    """
+
+    # Methods
+    def refresh(self, item_count: Optional[int] = None):
+        """
+        Drops the items cached on the client, so they are fetched again. Call it after the
+        data behind `fetch` changed.
+        """
+        if item_count is not None:
+            self.item_count = item_count
+        self.__revision += 1
+        self._set_attr("revision", self.__revision)
+        self.update()
+
+    def stream_items(self, items: AsyncIterable[StreamChunk]) -> Future:
+        """
+        Replaces the menu's items with the ones yielded by `items`, which may yield
+        single items or lists of them. A stream in progress is cancelled, and chunks of it
+        that are still on their way are dropped by the client.
+
+        Items yielded within a frame are sent together, and the client applies them once
+        per frame. While items are streamed the menu keeps `max_height`, so the open
+        popover doesn't move or resize between chunks.
+
+        Returns the future of the streaming task.
+        """
+        if self.__stream_task is not None:
+            self.__stream_task.cancel()
+        self.__stream_generation += 1
+        self.__streamed = []
+        if not self._get_attr("streamed", data_type="bool"):
+            # lets a menu built later ask for the items streamed so far
+            self._set_attr("streamed", True)
+            self.update()
+        self.__stream_task = self.page.run_task(
+            self.__stream, self.__stream_generation, items
+        )
+        return self.__stream_task
+
+    async def __stream(self, generation: int, items: AsyncIterable[StreamChunk]):
+        loop = asyncio.get_running_loop()
+        buffer = []
+        replace = True
+        flush_timer: Optional[asyncio.TimerHandle] = None
+
+        def flush():
+            nonlocal buffer, replace, flush_timer
+            flush_timer = None
+            if generation != self.__stream_generation:
+                return
+            chunk, buffer = buffer, []
+            self.__send_stream(generation, chunk, replace)
+            replace = False
+
+        try:
+            async for chunk in items:
+                if generation != self.__stream_generation:
+                    return
+                if isinstance(chunk, (list, tuple)):
+                    buffer.extend(chunk)
+                else:
+                    buffer.append(chunk)
+                # the batch goes out after a frame even if the next chunk is slow
+                if flush_timer is None:
+                    flush_timer = loop.call_later(_STREAM_INTERVAL, flush)
+        finally:
+            if flush_timer is not None:
+                flush_timer.cancel()
+        if buffer or replace:
+            flush()
+
+    def __send_stream(self, generation: int, items: MenuItems, replace: bool):
+        items = [_item_to_json(item) for item in items]
+        if replace:
+            self.__streamed = items
+        else:
+            self.__streamed.extend(items)
+        self.__invoke_stream(generation, items, replace)
+
+    def __invoke_stream(self, generation: int, items: list, replace: bool):
+        self.invoke_method(
+            "stream_items",
+            {
+                "generation": generation,
+                "replace": "true" if replace else None,
+                "items": json.dumps(items, separators=(",", ":")),
+            },
+        )
+
+    async def __handle_stream_sync(self, e: ControlEvent):
+        # the menu was built after items had been streamed
+        self.__invoke_stream(self.__stream_generation, self.__streamed, True)
+
+    def __handle_fetch(self, e: ControlEvent):
+        if self.__fetch is None:
+            return
+        request = json.loads(e.data)
+        offset, limit = request["offset"], request["limit"]
+        if inspect.iscoroutinefunction(self.__fetch):
+            self.page.run_task(
+                self.__fetch_async, offset, limit, request.get("revision")
+            )
+        else:
+            self.__send_items(
+                offset, self.__fetch(offset, limit), request.get("revision")
+            )
+
+    async def __fetch_async(self, offset: int, limit: int, revision: Any):
+        self.__send_items(offset, await self.__fetch(offset, limit), revision)
+
+    def __send_items(self, offset: int, items: MenuItems, revision: Any):
+        self.invoke_method(
+            "set_items",
+            {
+                "offset": offset,
+                "revision": revision,
+                "items": json.dumps(
+                    [_item_to_json(item) for item in items], separators=(",", ":")
+                ),
+            },
+        )
+
+
+def _item_to_json(item: Union[PopoverMenuItem, str]) -> dict:
+    if isinstance(item, str):
+        return {"title": item}
+    d = {"title": item.title}
+    if item.subtitle is not None:
+        d["subtitle"] = item.subtitle
+    if item.result is not None:
+        d["result"] = item.result
+    return d
@@ -0,0 +1,134 @@
+import json
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Deque, Dict, List, Optional, Sequence, Tuple
+
+from flet.core.control_event import ControlEvent
+
+if TYPE_CHECKING:
+    from flet_popover.flet_popover import FletPopover
+
+
+@dataclass
+class PopoverMetrics:
+    """
+    Timings of one popover open, in milliseconds since the open was triggered on the
+    client or requested with `open()`.
+    """
+
+    source: str
+    """
+    `"trigger"` for a gesture on the client, `"method"` for a request from the server.
+    """
+
+    body_ms: Optional[float] = None
+    """
+    When the body had been built and measured, including a lazy body's round trip.
+    """
+
+    first_frame_ms: Optional[float] = None
+    """
+    When the first frame of the transition started.
+    """
+
+    shown_ms: Optional[float] = None
+    """
+    When the transition ended.
+    """
+
+    frames: int = 0
+    """
+    The number of frames of the transition.
+    """
+
+    dropped_frames: int = 0
+    """
+    The number of frames missed during the transition.
+    """
+
+
+class PopoverMetricsEvent(ControlEvent):
+    def __init__(self, e: ControlEvent):
+        super().__init__(e.target, e.name, e.data, e.control, e.page)
+        self.samples: List[PopoverMetrics] = [
+            PopoverMetrics(**d) for d in json.loads(e.data)
+        ]
+
+
+class PopoverMetricsCollector:
+    """
+    Keeps the timings of the latest `window` opens of each popover, to find slow bodies
+    in production.
+
+    Register it with `track()`, which makes it the popover's `on_metrics` handler.
+    """
+
+    def __init__(self, window: int = 500):
+        self.window = window
+        self.__samples: Dict[str, Deque[PopoverMetrics]] = {}
+        self.__popovers: Dict[str, "FletPopover"] = {}
+
+    def track(self, popover: "FletPopover") -> "FletPopover":
+        """
+        Collects the timings of `popover`, and returns it.
+        """
+        popover.on_metrics = self.record
+        return popover
+
+    def record(self, e: PopoverMetricsEvent):
+        """
+        The `on_metrics` handler of tracked popovers.
+        """
+        key = e.control.uid
+        samples = self.__samples.get(key)
+        if samples is None:
+            samples = self.__samples[key] = deque(maxlen=self.window)
+        samples.extend(e.samples)
+        self.__popovers[key] = e.control
+
+    def samples(self, popover: "FletPopover") -> List[PopoverMetrics]:
+        """
+        The collected timings of `popover`, oldest first.
+        """
+        return list(self.__samples.get(popover.uid, ()))
+
+    def percentiles(
+        self,
+        popover: "FletPopover",
+        field: str = "shown_ms",
+        q: Sequence[float] = (50, 90, 99),
+    ) -> Dict[float, Optional[float]]:
+        """
+        Returns the `q` percentiles of `field` over the collected timings of `popover`,
+        e.g. `{50: 42.0, 90: 80.5, 99: 120.3}`. Values are `None` without timings.
+        """
+        values = sorted(
+            v
+            for v in (getattr(s, field) for s in self.__samples.get(popover.uid, ()))
+            if v is not None
+        )
+        return {p: _percentile(values, p) for p in q}
+
+    def slowest(
+        self, field: str = "shown_ms", q: float = 90, n: int = 10
+    ) -> List[Tuple["FletPopover", float]]:
+        """
+        Returns the `n` popovers with the highest `q` percentile of `field`, slowest
+        first.
+        """
+        ranked = []
+        for key, popover in self.__popovers.items():
+            value = self.percentiles(popover, field, (q,))[q]
+            if value is not None:
+                ranked.append((popover, value))
+        ranked.sort(key=lambda item: item[1], reverse=True)
+        return ranked[:n]
+
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    # nearest rank
+    if not values:
+        return None
+    rank = max(1, math.ceil(q / 100 * len(values)))
+    return values[min(rank, len(values)) - 1]
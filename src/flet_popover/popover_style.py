@@ -0,0 +1,148 @@
+import itertools
+from typing import Any, Optional
+
+from flet.core.control import Control, OptionalNumber
+from flet.core.types import ColorValue, Duration
+
+from flet_popover.popover_attrs import (
+    BOOL,
+    COLOR,
+    DURATION,
+    NUMBER,
+    PopoverAttr,
+)
+
+_style_keys = itertools.count(1)
+
+
+class PopoverStyleAttrs:
+    """
+    Styling attributes a `FletPopover` can take from a `PopoverStyle`.
+    """
+
+    background_color = PopoverAttr("backgroundColor", COLOR, styled=True)
+    """
+    The background color of the popover.
+    """
+
+    barrier_color = PopoverAttr("barrierColor", COLOR, styled=True)
+    """
+    The color of the barrier (overlay) behind the popover.
+    """
+
+    transition_duration = PopoverAttr(
+        "transitionDuration", DURATION, default=200, styled=True
+    )
+    """
+    The duration of the transition animation, as a `Duration` or in milliseconds.
+    """
+
+    radius = PopoverAttr("radius", NUMBER, default=8.0, styled=True)
+    """
+    The border radius of the popover.
+    """
+
+    arrow_width = PopoverAttr("arrowWidth", NUMBER, default=24.0, styled=True)
+    """
+    The width of the popover arrow.
+    """
+
+    arrow_height = PopoverAttr("arrowHeight", NUMBER, default=12.0, styled=True)
+    """
+    The height of the popover arrow.
+    """
+
+    arrow_dx_offset = PopoverAttr("arrowDxOffset", NUMBER, default=0.0, styled=True)
+    """
+    The horizontal offset of the popover arrow.
+    """
+
+    arrow_dy_offset = PopoverAttr("arrowDyOffset", NUMBER, default=0.0, styled=True)
+    """
+    The vertical offset of the popover arrow.
+    """
+
+    content_dx_offset = PopoverAttr(
+        "contentDxOffset", NUMBER, default=0.0, styled=True
+    )
+    """
+    The horizontal offset of the popover content.
+    """
+
+    content_dy_offset = PopoverAttr(
+        "contentDyOffset", NUMBER, default=0.0, styled=True
+    )
+    """
+    The vertical offset of the popover content.
+    """
+
+
+class PopoverStyle(Control, PopoverStyleAttrs):
+    """
+    Styling shared by any number of `FletPopover` controls.
+
+    A style is a non-visual control: add it once to `page.overlay` and pass it as the
+    `style` of the popovers that should look alike. The client parses it once per
+    popover, and changing it updates every popover that uses it with a single message.
+
+    A style added with `is_default=True` applies to every popover on the page that has
+    no `style` of its own. Attributes set on a popover take precedence over its style,
+    and its style over the page default.
+    """
+
+    def __init__(
+        self,
+        background_color: Optional[ColorValue] = None,
+        barrier_color: Optional[ColorValue] = None,
+        transition_duration: Optional[Duration] = None,
+        radius: OptionalNumber = None,
+        arrow_width: OptionalNumber = None,
+        arrow_height: OptionalNumber = None,
+        arrow_dx_offset: OptionalNumber = None,
+        arrow_dy_offset: OptionalNumber = None,
+        content_dx_offset: OptionalNumber = None,
+        content_dy_offset: OptionalNumber = None,
+        is_default: Optional[bool] = None,
+        ref=None,
+        data: Any = None,
+    ):
+        Control.__init__(
+            self,
+            ref=ref,
+            data=data,
+        )
+
+        self.background_color = background_color
+        self.barrier_color = barrier_color
+        self.transition_duration = transition_duration
+        self.radius = radius
+        self.arrow_width = arrow_width
+        self.arrow_height = arrow_height
+        self.arrow_dx_offset = arrow_dx_offset
+        self.arrow_dy_offset = arrow_dy_offset
+        self.content_dx_offset = content_dx_offset
+        self.content_dy_offset = content_dy_offset
+        self.is_default = is_default
+
+    def _get_control_name(self):
+        return "flet_popover_style"
+
+    def _get_style_key(self) -> str:
+        """
+        Returns the key popovers use to find this style on the client. A key is generated
+        if the style is referenced before it has been added to the page.
+        """
+        key = self._get_attr("styleKey")
+        if key:
+            return key
+        if self.uid is not None:
+            return self.uid
+        key = f"style{next(_style_keys)}"
+        self._set_attr("styleKey", key)
+        return key
+
+    # Attributes
+    is_default = PopoverAttr("default", BOOL, default=False)
+    """
+    Whether this style applies to popovers on the page that have no `style`.
+    """
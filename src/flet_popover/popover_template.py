@@ -0,0 +1,151 @@
+import itertools
+from typing import Any, Optional
+
+from flet.core.control import Control, OptionalNumber
+from flet.core.types import ColorValue, FontWeight
+
+from flet_popover.popover_attrs import (
+    COLOR,
+    INT,
+    NUMBER,
+    STRING,
+    PopoverAttr,
+)
+
+_template_keys = itertools.count(1)
+
+
+class PopoverTemplate(Control):
+    """
+    A popover body sent to the client once and shared by any number of popovers.
+
+    A template is a non-visual control: add it once to `page.overlay` and create the
+    popovers with `FletPopover.from_template()`. Each of them sends only its
+    `template_data`, and the client builds the template's `body` for it, filling
+    every `PopoverField` from that data. Creating and updating such a popover costs the
+    bound values rather than the whole body.
+
+    The controls of the body are shared by all popovers of the template, so only
+    fields differ between them. Keep per-popover state, such as text input or nested
+    popovers, out of templates; `PopoverAction` results and `on_pop` still belong to
+    the popover that was open.
+    """
+
+    def __init__(
+        self,
+        body: Optional[Control] = None,
+        ref=None,
+        data: Any = None,
+    ):
+        Control.__init__(
+            self,
+            ref=ref,
+            data=data,
+        )
+
+        self.__body = None
+
+        self.body = body
+
+    def _get_control_name(self):
+        return "flet_popover_template"
+
+    def _get_children(self):
+        if self.__body is None:
+            return []
+        self.__body._set_attr_internal("n", "body")
+        return [self.__body]
+
+    def _get_template_key(self) -> str:
+        """
+        Returns the key popovers use to find this template on the client. A key is
+        generated if the template is referenced before it has been added to the page.
+        """
+        key = self._get_attr("templateKey")
+        if key:
+            return key
+        if self.uid is not None:
+            return self.uid
+        key = f"template{next(_template_keys)}"
+        self._set_attr("templateKey", key)
+        return key
+
+    # body
+    @property
+    def body(self) -> Optional[Control]:
+        """
+        The body shown by the popovers of this template.
+        """
+        return self.__body
+
+    @body.setter
+    def body(self, value: Optional[Control]):
+        self.__body = value
+
+
+class PopoverField(Control):
+    """
+    A text in the body of a `PopoverTemplate`, showing the value bound to `name` in
+    the `template_data` of the popover that shows the body.
+    """
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        placeholder: Optional[str] = None,
+        size: OptionalNumber = None,
+        color: Optional[ColorValue] = None,
+        weight: Optional[FontWeight] = None,
+        max_lines: Optional[int] = None,
+        ref=None,
+        visible: Optional[bool] = None,
+        data: Any = None,
+    ):
+        Control.__init__(
+            self,
+            ref=ref,
+            visible=visible,
+            data=data,
+        )
+
+        self.name = name
+        self.placeholder = placeholder
+        self.size = size
+        self.color = color
+        self.weight = weight
+        self.max_lines = max_lines
+
+    def _get_control_name(self):
+        return "flet_popover_field"
+
+    # Attributes
+    name = PopoverAttr("field", STRING)
+    """
+    The key of the value in `template_data`. Values that aren't strings are shown as
+    JSON.
+    """
+
+    placeholder = PopoverAttr("placeholder", STRING)
+    """
+    The text shown when the data has no value for `name`.
+    """
+
+    size = PopoverAttr("size", NUMBER)
+    """
+    The font size of the text.
+    """
+
+    color = PopoverAttr("color", COLOR)
+    """
+    The color of the text.
+    """
+
+    weight = PopoverAttr("weight", FontWeight)
+    """
+    The font weight of the text.
+    """
+
+    max_lines = PopoverAttr("maxLines", INT)
+    """
+    The maximum number of lines; longer text is cut with an ellipsis.
+    """
@@ -0,0 +1,81 @@
+"""
+A fake connection for running a `Page` headless, without a Flutter client. The test
+suite and the benchmarks use it.
+"""
+
+import json
+from typing import Dict, List, Optional, Tuple
+
+from flet.core.connection import Connection
+from flet.core.control import Control
+from flet.core.protocol import (
+    Command,
+    CommandEncoder,
+    PageCommandRequestPayload,
+    PageCommandResponsePayload,
+    PageCommandsBatchRequestPayload,
+    PageCommandsBatchResponsePayload,
+)
+
+
+class FakeConnection(Connection):
+    """
+    Answers `add` commands with fresh control ids, like a Flutter client would.
+
+    With `record`, every command the page sends is kept in `commands`. With
+    `count_bytes`, the messages are encoded the way Flet's socket server encodes them
+    and their size is added up in `bytes_sent`, which matches what goes over the wire.
+    """
+
+    def __init__(self, record: bool = True, count_bytes: bool = False):
+        super().__init__()
+        self.commands: List[Command] = []
+        self.bytes_sent = 0
+        self.__record = record
+        self.__count_bytes = count_bytes
+        self.__next_id = 0
+
+    def send_command(self, session_id: str, command: Command):
+        if self.__record:
+            self.commands.append(command)
+        if self.__count_bytes:
+            self.__count(PageCommandRequestPayload("", session_id, command))
+        return PageCommandResponsePayload(result="", error="")
+
+    def send_commands(self, session_id: str, commands: List[Command]):
+        if self.__record:
+            self.commands.extend(commands)
+        if self.__count_bytes:
+            self.__count(PageCommandsBatchRequestPayload("", session_id, commands))
+        results = []
+        for command in commands:
+            if command.name == "add":
+                ids = []
+                for _ in command.commands:
+                    self.__next_id += 1
+                    ids.append(f"_{self.__next_id}")
+                results.append(" ".join(ids))
+        return PageCommandsBatchResponsePayload(results=results, error="")
+
+    def __count(self, payload):
+        self.bytes_sent += len(
+            json.dumps(payload, cls=CommandEncoder, separators=(",", ":")).encode()
+        )
+
+    def invoked(self, control: Optional[Control] = None) -> List[Tuple[str, Dict]]:
+        """
+        The methods invoked on `control`, or on any control, as `(name, args)`.
+        """
+        return [
+            (c.values[1], c.attrs)
+            for c in self.commands
+            if c.name == "invokeMethod"
+            and (control is None or c.values[2] == control.uid)
+        ]
+
+    def clear(self):
+        """
+        Forgets the commands sent so far and resets `bytes_sent`.
+        """
+        self.commands.clear()
+        self.bytes_sent = 0
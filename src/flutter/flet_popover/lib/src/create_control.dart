@@ -1,6 +1,12 @@
 import 'package:flet/flet.dart';
 
 import 'flet_popover.dart';
+import 'flet_popover_action.dart';
+import 'flet_popover_anchor.dart';
+import 'flet_popover_manager.dart';
+import 'flet_popover_menu.dart';
+import 'popover_style.dart';
+import 'popover_template.dart';
 
 CreateControlFactory createControl = (CreateControlArgs args) {
   switch (args.control.type) {
@@ -13,6 +19,39 @@ CreateControlFactory createControl = (CreateControlArgs args) {
         parentAdaptive: args.parentAdaptive,
         backend: args.backend,
       );
+    case "flet_popover_anchor":
+      return FletPopoverAnchorControl(
+        parent: args.parent,
+        control: args.control,
+        children: args.children,
+        parentDisabled: args.parentDisabled,
+        parentAdaptive: args.parentAdaptive,
+      );
+    case "flet_popover_action":
+      return FletPopoverActionControl(
+        parent: args.parent,
+        control: args.control,
+        children: args.children,
+        parentDisabled: args.parentDisabled,
+        parentAdaptive: args.parentAdaptive,
+      );
+    case "flet_popover_menu":
+      return FletPopoverMenuControl(
+        parent: args.parent,
+        control: args.control,
+        parentDisabled: args.parentDisabled,
+        backend: args.backend,
+      );
+    case "flet_popover_manager":
+      return FletPopoverManagerControl(
+          control: args.control, backend: args.backend);
+    case "flet_popover_style":
+      return FletPopoverStyleControl(control: args.control);
+    case "flet_popover_template":
+      return FletPopoverTemplateControl(
+          control: args.control, children: args.children);
+    case "flet_popover_field":
+      return FletPopoverFieldControl(control: args.control);
     default:
       return null;
   }
@@ -1,20 +1,58 @@
+import 'dart:async';
+import 'dart:convert';
+import 'dart:math';
+
 import 'package:flet/flet.dart';
+import 'package:flutter/gestures.dart';
 import 'package:flutter/material.dart';
-import 'package:popover/popover.dart';
-
-/// Configuration class for optimal popover positioning
-class _PopoverConfig {
-  final PopoverDirection direction;
-  final double? width;
-  final double? height;
-  final BoxConstraints constraints;
-
-  _PopoverConfig({
-    required this.direction,
-    this.width,
-    this.height,
-    required this.constraints,
+import 'package:flutter/scheduler.dart';
+
+import 'placement.dart';
+import 'popover_attrs.g.dart';
+import 'popover_keep_alive.dart';
+import 'popover_measure.dart';
+import 'popover_metrics.dart';
+import 'popover_options.dart';
+import 'popover_overlay.dart';
+import 'popover_registry.dart';
+import 'popover_scope.dart';
+import 'popover_style.dart';
+import 'popover_template.dart';
+import 'popover_trigger.dart';
+
+/// Distance kept between a popover and the screen edges
+const double _popoverMargin = 16.0;
+
+/// Minimum interval between two `on_reposition` events
+const Duration _repositionEventInterval = Duration(milliseconds: 100);
+
+/// Where an open popover is shown, kept to tell when it has to move.
+class _Placement {
+  BuildContext anchorContext;
+  final PopoverOptions options;
+  final Widget bodyWidget;
+  final String bodyId;
+
+  /// The size the body was placed by, which follows its content while open.
+  Size? bodySize;
+  Rect anchorRect;
+  Size screenSize;
+  EdgeInsets padding;
+  PopoverPlacementResult result;
+
+  _Placement({
+    required this.anchorContext,
+    required this.options,
+    required this.bodyWidget,
+    required this.bodyId,
+    required this.bodySize,
+    required this.anchorRect,
+    required this.screenSize,
+    required this.padding,
+    required this.result,
   });
+
+  Rect get bounds => placementBounds(screenSize, padding, _popoverMargin);
 }
 
 class FletPopoverControl extends StatefulWidget {
@@ -39,315 +77,1341 @@ class FletPopoverControl extends StatefulWidget {
   State<FletPopoverControl> createState() => _FletPopoverControlState();
 }
 
-class _FletPopoverControlState extends State<FletPopoverControl> {
+class _FletPopoverControlState extends State<FletPopoverControl>
+    with TickerProviderStateMixin
+    implements PopoverHost {
+  // Set while this popover's route is shown, so repeated opens are ignored
+  bool _isOpen = false;
+
+  // Parsed attributes and body widget, reused until the control changes
+  PopoverOptions? _options;
+  Widget? _routeBody;
+
+  // Incremented on every open and cancelled open, so a delayed open can tell
+  // it was cancelled while the body was being measured
+  int _openSeq = 0;
+
+  // Route pushed by this popover and how it is being closed
+  ModalRoute<dynamic>? _route;
+  String? _closeReason;
+  String? _closeResult;
+  bool _lastPointerDownOutside = false;
+  bool _routeRemoved = false;
+  GlobalKey _bodyKey = GlobalKey();
+
+  // Overlay entry showing a non-modal popover and its transition. Entries
+  // that are animating out stay in [_overlays] until they are removed.
+  OverlayEntry? _overlayEntry;
+  AnimationController? _overlayAnimation;
+  final Map<OverlayEntry, AnimationController> _overlays = {};
+
+  // Client-side timers: a delayed open, a hover popover's close and the
+  // auto-dismiss, which is held while the pointer is over the body
+  Timer? _openTimer;
+  Timer? _closeTimer;
+  Timer? _dismissTimer;
+  bool _pointerOverBody = false;
+
+  // Latency trace of the current open, when it is sampled, and traces
+  // waiting to be sent in the next `on_metrics` event
+  PopoverOpenTrace? _trace;
+  late final PopoverMetricsBuffer _metrics = PopoverMetricsBuffer(
+      onFlush: (records) => widget.backend.triggerControlEvent(
+          widget.control.id, "on_metrics", jsonEncode(records)));
+  static final Random _sampler = Random();
+
+  // Popover whose body this popover is nested in, and the nested popover
+  // that is open, while this one is open
+  PopoverHost? _parent;
+  PopoverHost? _openChild;
+
+  // Exclusivity group the open popover was registered in
+  String? _openGroup;
+
+  // Placement of the open popover, followed while it is open; the version
+  // ticks when it changes, so the route or overlay entry lays out again
+  _Placement? _placement;
+  final ValueNotifier<int> _placementVersion = ValueNotifier(0);
+  Timer? _repositionTimer;
+
+  // Body kept mounted between openings with keep_alive, or built ahead of an
+  // open with prewarm
+  KeptPopoverBody? _keptBody;
+  bool _parkingBody = false;
+  Timer? _prewarmTimer;
+
+  // Last open state requested by the server, applied once per frame
+  bool? _desiredOpen;
+  String? _desiredAnchorId;
+  Offset? _desiredPoint;
+  bool _applyScheduled = false;
+
+  // Anchor or point the open popover points at
+  String? _openAnchorId;
+  Offset? _openPoint;
+
+  // Lazy body: open requested before the body control reached the client
+  bool _pendingOpen = false;
+  String? _pendingAnchorId;
+  Offset? _pendingPoint;
+  bool _bodyRequested = false;
+
+  // Zero-size placeholder a popover shown at a point is anchored to
+  OverlayEntry? _pointEntry;
+  GlobalKey _pointKey = GlobalKey();
+
+  // Key anchors use for a host referenced before it had a control id
+  String? _hostKey;
+
+  // Current body id, so an open popover follows a rebound body
+  late final ValueNotifier<String?> _bodyId;
+
+  // Values the fields of a template body are bound to
+  late final ValueNotifier<Map<String, dynamic>> _templateData;
+
   @override
   void initState() {
     super.initState();
+    _bodyId = ValueNotifier(_bodyControlId());
+    _templateData = ValueNotifier(PopoverTemplateScope.parse(
+        widget.control.attrString(PopoverAttrs.templateData)));
+    PopoverStyles.changes.addListener(_onStylesChanged);
+    PopoverTemplates.changes.addListener(_onTemplatesChanged);
     widget.backend.subscribeMethods(widget.control.id, _onMethodCall);
+    _hostKey = widget.control.attrString("hostKey");
+    PopoverRegistry.registerHost(widget.control.id, this);
+    if (_hostKey != null) {
+      PopoverRegistry.registerHost(_hostKey!, this);
+    }
+    if (prewarmMode == PopoverPrewarm.onIdle) {
+      SchedulerBinding.instance.scheduleTask(() {
+        if (mounted) {
+          prewarm();
+        }
+      }, Priority.idle);
+    }
+  }
+
+  @override
+  void didChangeDependencies() {
+    super.didChangeDependencies();
+    // colors may come from the theme
+    _options = null;
+  }
+
+  /// A shared style changed; options are parsed again on the next open.
+  void _onStylesChanged() {
+    _options = null;
+  }
+
+  /// A template was added or changed; its body is picked up after the frame,
+  /// as templates register while building.
+  void _onTemplatesChanged() {
+    WidgetsBinding.instance.addPostFrameCallback((_) {
+      if (mounted) {
+        _bodyId.value = _bodyControlId();
+      }
+    });
+  }
+
+  @override
+  void didUpdateWidget(covariant FletPopoverControl oldWidget) {
+    super.didUpdateWidget(oldWidget);
+    if (PopoverOptions.changed(oldWidget.control, widget.control) ||
+        oldWidget.parentDisabled != widget.parentDisabled ||
+        oldWidget.parentAdaptive != widget.parentAdaptive) {
+      _options = null;
+      _routeBody = null;
+      _releaseKeptBody();
+    }
+    var templateData = widget.control.attrString(PopoverAttrs.templateData);
+    if (templateData !=
+        oldWidget.control.attrString(PopoverAttrs.templateData)) {
+      _templateData.value = PopoverTemplateScope.parse(templateData);
+    }
+    var bodyId = _bodyControlId();
+    var oldBodyId = _bodyId.value;
+    if (oldBodyId != null &&
+        (oldBodyId != bodyId ||
+            templateData !=
+                oldWidget.control.attrString(PopoverAttrs.templateData))) {
+      PopoverBodySizes.remove(_sizeKey(oldBodyId));
+    }
+    _bodyId.value = bodyId;
+    if (bodyId == null) {
+      // body has been evicted or not sent yet
+      _releaseKeptBody();
+      return;
+    }
+    var bodyRequested = _bodyRequested;
+    _bodyRequested = false;
+    if (_pendingOpen) {
+      var anchorId = _pendingAnchorId;
+      var point = _pendingPoint;
+      _pendingOpen = false;
+      _pendingAnchorId = null;
+      _pendingPoint = null;
+      WidgetsBinding.instance.addPostFrameCallback((_) {
+        if (mounted) {
+          _showPopover(anchorId: anchorId, point: point);
+        }
+      });
+    } else if (bodyRequested) {
+      // the body was requested speculatively by prewarm
+      WidgetsBinding.instance.addPostFrameCallback((_) => prewarm());
+    }
   }
 
   @override
   void dispose() {
+    PopoverRegistry.unregisterHost(widget.control.id, this);
+    if (_hostKey != null) {
+      PopoverRegistry.unregisterHost(_hostKey!, this);
+    }
     widget.backend.unsubscribeMethods(widget.control.id);
+    PopoverStyles.changes.removeListener(_onStylesChanged);
+    PopoverTemplates.changes.removeListener(_onTemplatesChanged);
+    _prewarmTimer?.cancel();
+    _repositionTimer?.cancel();
+    _openTimer?.cancel();
+    _cancelDismissTimers();
+    _leaveGroup();
+    _leaveParent();
+    _metrics.flush();
+    for (var entry in _overlays.keys.toList()) {
+      _removeOverlay(entry);
+    }
+    _releaseKeptBody();
+    _removePointEntry();
+    _bodyId.dispose();
+    _templateData.dispose();
+    _placementVersion.dispose();
     super.dispose();
   }
 
+  @override
+  PopoverTriggerMode get triggerMode => parsePopoverTriggerMode(
+      widget.control.attrString(PopoverAttrs.triggerMode));
+
+  @override
+  PopoverPrewarm get prewarmMode =>
+      parsePopoverPrewarm(widget.control.attrString(PopoverAttrs.prewarm));
+
+  bool get _keepAlive => widget.control
+      .attrBool(PopoverAttrs.keepAlive, PopoverAttrDefaults.keepAlive)!;
+
+  bool get _lazyBody => widget.control
+      .attrBool(PopoverAttrs.lazyBody, PopoverAttrDefaults.lazyBody)!;
+
+  @override
+  void showAtAnchor(BuildContext anchorContext, String anchorId) {
+    _triggerOpen(anchorId: anchorId);
+  }
+
+  @override
+  bool get isOpen => _isOpen;
+
+  @override
+  void dismiss(String reason) {
+    cancelPendingOpen();
+    _pendingOpen = false;
+    _hidePopover(reason);
+  }
+
+  @override
+  void closeWithResult(String? result) => _closeWithResult(result);
+
+  @override
+  void childOpened(PopoverHost child) {
+    if (_openChild != child) {
+      // a sibling submenu gives way
+      _openChild?.dismiss(PopoverDismissReason.group);
+      _openChild = child;
+    }
+  }
+
+  @override
+  void childClosed(PopoverHost child) {
+    if (_openChild == child) {
+      _openChild = null;
+    }
+  }
+
+  @override
+  Rect? get bodyRect => _bodyRect();
+
+  @override
+  bool containsPosition(Offset position) =>
+      _bodyRect()?.contains(position) == true ||
+      _openChild?.containsPosition(position) == true;
+
+  /// Registers with the popover whose body this popover is in, if any.
+  void _joinParent() {
+    var parent =
+        context.getInheritedWidgetOfExactType<PopoverScope>()?.host;
+    if (parent != null && parent != this) {
+      _parent = parent;
+      parent.childOpened(this);
+    }
+  }
+
+  void _leaveParent() {
+    _parent?.childClosed(this);
+    _parent = null;
+  }
+
+  /// Closes the open popover of this popover's group, if any.
+  void _joinGroup() {
+    var group = widget.control.attrString(PopoverAttrs.group);
+    if (group == null) {
+      return;
+    }
+    _openGroup = group;
+    PopoverRegistry.openInGroup(group, this)
+        ?.dismiss(PopoverDismissReason.group);
+  }
+
+  void _leaveGroup() {
+    if (_openGroup != null) {
+      PopoverRegistry.closedInGroup(_openGroup!, this);
+      _openGroup = null;
+    }
+  }
+
+  @override
+  void cancelPendingOpen() {
+    _openTimer?.cancel();
+    _openTimer = null;
+  }
+
+  /// A delay attribute in milliseconds, or null if it isn't positive.
+  Duration? _delay(String name, [int? defaultValue]) {
+    var ms = widget.control.attrInt(name, defaultValue);
+    return ms != null && ms > 0 ? Duration(milliseconds: ms) : null;
+  }
+
+  /// Opens the popover for a gesture on an anchor or on the content, after
+  /// `openDelay`.
+  void _triggerOpen({String? anchorId}) {
+    cancelPendingOpen();
+    var delay =
+        _delay(PopoverAttrs.openDelay, PopoverAttrDefaults.openDelay);
+    if (delay == null) {
+      _beginTrace("trigger");
+      _showPopover(anchorId: anchorId);
+      return;
+    }
+    _openTimer = Timer(delay, () {
+      _openTimer = null;
+      if (mounted) {
+        _beginTrace("trigger");
+        _showPopover(anchorId: anchorId);
+      }
+    });
+  }
+
+  /// Starts timing an open when `on_metrics` is handled and the open is
+  /// sampled.
+  void _beginTrace(String source) {
+    if (_isOpen || !widget.control.attrBool("onMetrics", false)!) {
+      return;
+    }
+    var rate = widget.control.attrDouble(
+        PopoverAttrs.metricsSampleRate, PopoverAttrDefaults.metricsSampleRate)!;
+    _trace = _sampler.nextDouble() < rate ? PopoverOpenTrace(source) : null;
+  }
+
+  /// Counts the frames of the enter transition and records its first frame
+  /// and its end.
+  void _traceTransition() {
+    final trace = _trace;
+    if (trace == null) {
+      return;
+    }
+    var refreshRate = View.maybeOf(context)?.display.refreshRate ?? 60;
+    var budget = Duration(microseconds: (1000000 / refreshRate).round());
+    Animation<double>? animation;
+
+    void onStatus(AnimationStatus status) {
+      if (status != AnimationStatus.completed) {
+        return;
+      }
+      animation?.removeStatusListener(onStatus);
+      if (_trace == trace) {
+        trace.mark("shown");
+        _trace = null;
+        _metrics.add(trace);
+      }
+    }
+
+    void onFrame(Duration timeStamp) {
+      if (!mounted || _trace != trace) {
+        return;
+      }
+      if (!_isOpen) {
+        // dismissed before it was shown
+        _trace = null;
+        return;
+      }
+      trace.frame(timeStamp, budget);
+      if (animation == null &&
+          (_route?.animation ?? _overlayAnimation) != null) {
+        animation = _route?.animation ?? _overlayAnimation;
+        animation!.addStatusListener(onStatus);
+        onStatus(animation!.status);
+      }
+      if (_trace == trace) {
+        SchedulerBinding.instance.scheduleFrameCallback(onFrame);
+      }
+    }
+
+    SchedulerBinding.instance.scheduleFrameCallback(onFrame);
+  }
+
+  /// Starts the auto-dismiss over, if the popover has one.
+  void _startDismissTimer() {
+    _dismissTimer?.cancel();
+    var after = _delay(PopoverAttrs.autoDismissAfter);
+    _dismissTimer = after == null
+        ? null
+        : Timer(after, () {
+            _dismissTimer = null;
+            _closePopover(PopoverDismissReason.timeout, null);
+          });
+  }
+
+  void _cancelDismissTimers() {
+    _closeTimer?.cancel();
+    _closeTimer = null;
+    _dismissTimer?.cancel();
+    _dismissTimer = null;
+    _pointerOverBody = false;
+  }
+
+  @override
+  BuildContext? get anchorContext => mounted ? context : null;
+
+  /// Builds and lays out the body offstage, so opening only has to move it
+  /// into the route. The measured size is cached on the way.
+  @override
+  void prewarm() {
+    if (!mounted || _isOpen || _parkingBody) {
+      return;
+    }
+    var bodyId = _bodyControlId();
+    if (bodyId == null) {
+      if (_lazyBody) {
+        _requestBody(null, open: false);
+      }
+      return;
+    }
+    _holdBodyOffstage(_routeBody ??= _buildRouteBody(), bodyId);
+    _schedulePrewarmExpiry();
+  }
+
+  /// Mounts [bodyWidget] in an offstage holder under the key the route shows
+  /// it with, unless it already is, so opening moves that one element over.
+  KeptPopoverBody _holdBodyOffstage(Widget bodyWidget, String bodyId) {
+    var kept = _keptBody;
+    if (kept == null ||
+        kept.isEvicted ||
+        kept.body != bodyWidget ||
+        kept.constraints != _measureConstraints()) {
+      if (!_keepAlive) {
+        // a closing route may still build the previous key
+        _bodyKey = GlobalKey();
+      }
+      kept = _keptBody = _holdBody(bodyWidget, bodyId);
+    }
+    PopoverKeepAlive.touch(widget.control.id, kept);
+    kept.attach(Overlay.of(context, rootOverlay: true));
+    return kept;
+  }
+
+  void _schedulePrewarmExpiry() {
+    _prewarmTimer?.cancel();
+    _prewarmTimer = null;
+    if (_keepAlive) {
+      // kept bodies stay until the keep-alive LRU evicts them
+      return;
+    }
+    _prewarmTimer = Timer(
+        Duration(
+            milliseconds: widget.control.attrInt(
+                PopoverAttrs.prewarmTtl, PopoverAttrDefaults.prewarmTtl)!),
+        () {
+      _prewarmTimer = null;
+      if (mounted && !_isOpen) {
+        _releaseKeptBody();
+      }
+    });
+  }
+
+  /// An offstage holder for [bodyWidget] that keeps its cached size current.
+  KeptPopoverBody _holdBody(Widget bodyWidget, String bodyId) {
+    var constraints = _measureConstraints();
+    var sizeKey = _sizeKey(bodyId);
+    return KeptPopoverBody(
+      bodyKey: _bodyKey,
+      body: bodyWidget,
+      constraints: constraints,
+      onSize: (size) => PopoverBodySizes.put(sizeKey, constraints, size),
+    );
+  }
+
   Future<String?> _onMethodCall(
       String methodName, Map<String, String> args) async {
     switch (methodName) {
       case "show_popover":
       case "open":
-        _showPopover();
+        if (args["await_body"] == "true" && _bodyControlId() == null) {
+          // the body is already on its way with the preceding update
+          _beginTrace("method");
+          _desiredOpen = null;
+          _pendingOpen = true;
+          _pendingAnchorId = args["anchor"];
+          _pendingPoint = _parsePoint(args);
+          return null;
+        }
+        _requestOpenState(true,
+            anchorId: args["anchor"], point: _parsePoint(args));
         return null;
       case "hide_popover":
       case "close":
-        _hidePopover();
+        if (_pendingOpen) {
+          _pendingOpen = false;
+          _trace = null;
+        }
+        _requestOpenState(false);
         return null;
       default:
         return null;
     }
   }
 
-  void _hidePopover() {
-    if (Navigator.canPop(context)) {
-      Navigator.of(context).pop();
+  /// Records the requested state; calls arriving within one frame collapse to
+  /// the last one.
+  void _requestOpenState(bool open, {String? anchorId, Offset? point}) {
+    _desiredOpen = open;
+    _desiredAnchorId = anchorId;
+    _desiredPoint = point;
+    if (_applyScheduled) {
+      return;
+    }
+    _applyScheduled = true;
+    SchedulerBinding.instance.addPostFrameCallback((_) => _applyOpenState());
+    SchedulerBinding.instance.scheduleFrame();
+  }
+
+  void _applyOpenState() {
+    _applyScheduled = false;
+    var open = _desiredOpen;
+    _desiredOpen = null;
+    if (!mounted || open == null) {
+      return;
+    }
+    if (open && _isOpen) {
+      _moveTo(_desiredAnchorId, _desiredPoint);
+      return;
+    }
+    if (open == _isOpen) {
+      return;
+    }
+    if (open) {
+      _beginTrace("method");
+      _showPopover(anchorId: _desiredAnchorId, point: _desiredPoint);
+    } else {
+      _hidePopover();
+    }
+  }
+
+  /// Mirrors the open state to the control's `open` property in Python.
+  void _syncOpenState(bool open) {
+    widget.backend
+        .updateControlState(widget.control.id, {"open": open.toString()});
+  }
+
+  void _hidePopover([String reason = PopoverDismissReason.programmatic]) {
+    // a show queued in this frame would reopen the popover after closing it
+    _desiredOpen = null;
+    // an open cancelled before it was shown isn't timed
+    _trace = null;
+    if (_isOpen && _route == null && _overlayEntry == null) {
+      // still measuring the body, the route hasn't been pushed yet
+      _openSeq++;
+      _isOpen = false;
+      _removePointEntry();
+      return;
+    }
+    _closePopover(reason, null);
+  }
+
+  /// Pops the route pushed by this popover, leaving other routes alone, or
+  /// removes its overlay entry.
+  void _closePopover(String reason, String? result) {
+    _desiredOpen = null;
+    var route = _route;
+    var inOverlay = _overlayEntry != null;
+    if (!inOverlay && (route == null || !route.isActive)) {
+      return;
+    }
+    // nested popovers close first, as their anchors are in this body
+    _openChild?.dismiss(PopoverDismissReason.parent);
+    _openChild = null;
+    _closeReason = reason;
+    _closeResult = result;
+    if (inOverlay) {
+      _closeOverlay();
+      return;
+    }
+    var navigator = route!.navigator!;
+    if (route.isCurrent) {
+      navigator.pop();
+    } else {
+      _routeRemoved = true;
+      navigator.removeRoute(route);
+    }
+  }
+
+  void _closeOverlay() {
+    var entry = _overlayEntry!;
+    var animation = _overlayAnimation!;
+    var barrierDismissible = _placement?.options.barrierDismissible ?? false;
+    _overlayEntry = null;
+    _overlayAnimation = null;
+    animation.reverse().whenCompleteOrCancel(() => _removeOverlay(entry));
+    _onPopoverClosed(barrierDismissible, animation);
+  }
+
+  void _removeOverlay(OverlayEntry entry) {
+    var animation = _overlays.remove(entry);
+    if (animation == null) {
+      return;
+    }
+    entry.remove();
+    entry.dispose();
+    animation.dispose();
+  }
+
+  void _closeWithResult(String? result) {
+    var parent = _parent;
+    if (parent != null) {
+      // the outermost popover reports the selection, closing this one
+      parent.closeWithResult(result);
+      return;
+    }
+    _closePopover(PopoverDismissReason.result, result);
+  }
+
+  /// Remembers whether the last pointer went down outside the body, which is
+  /// how a barrier tap is told apart from a back navigation.
+  void _onGlobalPointerEvent(PointerEvent event) {
+    if (event is PointerHoverEvent) {
+      _onPointerHover(event.position);
+      return;
+    }
+    if (event is! PointerDownEvent) {
+      return;
+    }
+    var bodyRect = _bodyRect();
+    if (bodyRect == null) {
+      return;
+    }
+    _lastPointerDownOutside = !bodyRect.contains(event.position);
+    var placement = _placement;
+    if (_overlayEntry != null &&
+        placement != null &&
+        placement.options.barrierDismissible &&
+        !containsPosition(event.position) &&
+        !placement.anchorRect.contains(event.position)) {
+      // a non-modal popover has no barrier; the tap still reaches the page
+      _closePopover(PopoverDismissReason.barrier, null);
+    }
+  }
+
+  Rect? _bodyRect() {
+    var box = _bodyKey.currentContext?.findRenderObject() as RenderBox?;
+    if (box == null || !box.attached || !box.hasSize) {
+      return null;
+    }
+    return box.localToGlobal(Offset.zero) & box.size;
+  }
+
+  /// Holds the auto-dismiss while the pointer is over the body, and closes a
+  /// hover popover once the pointer has been away for `closeDelay`.
+  ///
+  /// The route's barrier covers the content, so the pointer is followed here
+  /// rather than with mouse regions.
+  void _onPointerHover(Offset position) {
+    var bodyRect = _bodyRect();
+    if (bodyRect == null) {
+      return;
+    }
+    var overBody = bodyRect.contains(position);
+    if (overBody != _pointerOverBody) {
+      _pointerOverBody = overBody;
+      if (overBody) {
+        _dismissTimer?.cancel();
+        _dismissTimer = null;
+      } else {
+        _startDismissTimer();
+      }
+    }
+    if (triggerMode != PopoverTriggerMode.hover) {
+      return;
+    }
+    var anchorRect = _placement?.anchorRect;
+    // the gap between the content and the body, under the arrow, counts too
+    var inside = anchorRect != null
+        ? bodyRect.expandToInclude(anchorRect).contains(position)
+        : overBody;
+    if (inside) {
+      _closeTimer?.cancel();
+      _closeTimer = null;
+      return;
+    }
+    _closeTimer ??= Timer(
+        _delay(PopoverAttrs.closeDelay, PopoverAttrDefaults.closeDelay) ??
+            Duration.zero, () {
+      _closeTimer = null;
+      _closePopover(PopoverDismissReason.hoverExit, null);
+    });
+  }
+
+  void _onPopoverClosed(bool barrierDismissible,
+      [Animation<double>? overlayAnimation]) {
+    GestureBinding.instance.pointerRouter
+        .removeGlobalRoute(_onGlobalPointerEvent);
+    _placement = null;
+    _cancelDismissTimers();
+    _leaveGroup();
+    _leaveParent();
+    _openChild?.dismiss(PopoverDismissReason.parent);
+    _openChild = null;
+    var reason = _closeReason ??
+        (barrierDismissible && _lastPointerDownOutside
+            ? PopoverDismissReason.barrier
+            : PopoverDismissReason.route);
+    var result = _closeResult;
+    var animation = overlayAnimation ?? _route?.animation;
+    _isOpen = false;
+    if (mounted) {
+      _syncOpenState(false);
+      if (_keepAlive) {
+        _keepBodyAlive(animation, _routeRemoved);
+      }
     }
+    _removePointEntryAfter(animation);
+    _route = null;
+    _routeRemoved = false;
+    _closeReason = null;
+    _closeResult = null;
+    _lastPointerDownOutside = false;
+
+    if (reason == PopoverDismissReason.parent) {
+      // the outermost popover reports the close of the chain
+      return;
+    }
+    // Dismissal reason and selection result travel in a single event
+    widget.backend.triggerControlEvent(
+        widget.control.id,
+        "on_pop",
+        jsonEncode({
+          "reason": reason,
+          "result": result != null ? jsonDecode(result) : null,
+        }));
   }
 
-  void _showPopover() {
+  /// Hands the body over to an offstage holder once the route or the overlay
+  /// entry no longer builds it, i.e. when its exit [animation] is over.
+  void _keepBodyAlive(Animation<double>? animation, bool routeRemoved) {
+    var bodyWidget = _routeBody;
+    var bodyId = _bodyId.value;
+    if (bodyWidget == null || bodyId == null) {
+      return;
+    }
+    var kept = _keptBody;
+    if (kept == null || kept.isEvicted || kept.body != bodyWidget) {
+      kept = _keptBody = _holdBody(bodyWidget, bodyId);
+    }
+    final keptBody = kept;
+    PopoverKeepAlive.touch(widget.control.id, keptBody);
+    var overlay = Overlay.of(context, rootOverlay: true);
+    if (routeRemoved ||
+        animation == null ||
+        animation.status == AnimationStatus.dismissed) {
+      keptBody.attach(overlay);
+      return;
+    }
+    // the exiting route still shows the body, so it can't be reopened yet
+    _parkingBody = true;
+    void onStatus(AnimationStatus status) {
+      if (status != AnimationStatus.dismissed) {
+        return;
+      }
+      animation.removeStatusListener(onStatus);
+      _parkingBody = false;
+      if (mounted) {
+        keptBody.attach(overlay);
+      }
+    }
+
+    animation.addStatusListener(onStatus);
+  }
+
+  void _releaseKeptBody() {
+    if (_keptBody != null) {
+      PopoverKeepAlive.remove(widget.control.id);
+      _keptBody = null;
+    }
+  }
+
+  /// The id of the body control, the popover's own or its template's.
+  String? _bodyControlId() {
+    var bodyControls =
+        widget.children.where((c) => c.name == "body" && c.isVisible);
+    return bodyControls.isNotEmpty ? bodyControls.first.id : _template?.bodyId;
+  }
+
+  PopoverTemplateEntry? get _template =>
+      PopoverTemplates.lookup(widget.control.attrString("template"));
+
+  /// The key the measured size of [bodyId] is cached under. Popovers of a
+  /// template share the body, but not its size.
+  String _sizeKey(String bodyId) => _template?.bodyId == bodyId
+      ? "$bodyId@${widget.control.id}"
+      : bodyId;
+
+  /// Asks the server for a lazy body and, unless the request is speculative,
+  /// opens the popover once it arrives.
+  void _requestBody(String? anchorId, {Offset? point, bool open = true}) {
+    if (open) {
+      _pendingOpen = true;
+      _pendingAnchorId = anchorId;
+      _pendingPoint = point;
+    }
+    if (_bodyRequested) {
+      return;
+    }
+    _bodyRequested = true;
+    widget.backend.triggerControlEvent(widget.control.id, "request_body");
+  }
+
+  void _showPopover({String? anchorId, Offset? point}) {
+    if (_isOpen) {
+      return;
+    }
+    if (_parkingBody) {
+      _openFailed("The body is still closing");
+      return;
+    }
+
+    // Resolve the widget the popover points at
+    if (point == null && _anchorContext(anchorId) == null) {
+      _openFailed("Anchor $anchorId not found");
+      return;
+    }
+
     // Get the body control
-    var bodyControls = widget.children.where((c) => c.name == "body" && c.isVisible);
-    if (bodyControls.isEmpty) {
-      debugPrint("FletPopover: No body control found");
+    var bodyId = _bodyControlId();
+    if (bodyId == null) {
+      if (_lazyBody) {
+        _requestBody(anchorId, point: point);
+        return;
+      }
+      _openFailed("No body control found");
       return;
     }
 
-    // Parse original direction preference
-    PopoverDirection preferredDirection = _parseDirection(widget.control.attrString("direction", "bottom"));
+    var options = _options ??= PopoverOptions.parse(widget.control, context);
+    var bodyWidget = _routeBody ??= _buildRouteBody();
+    var seq = ++_openSeq;
+    _isOpen = true;
+    if (point != null) {
+      _insertPointEntry(point);
+    }
 
-    // Parse transition
-    PopoverTransition transition = _parseTransition(widget.control.attrString("transition", "scale"));
+    // Place by the body's real size unless both dimensions are given
+    var measureConstraints = _measureConstraints();
+    Size? bodySize;
+    if (options.width == null || options.height == null) {
+      bodySize = PopoverBodySizes.get(_sizeKey(bodyId), measureConstraints);
+      if (bodySize == null) {
+        // The body is laid out once offstage and moved into the route under
+        // its key: a second copy of the Flet controls would unsubscribe the
+        // route's copy from their methods when it is disposed
+        _holdBodyOffstage(bodyWidget, bodyId).laidOut.then((size) {
+          if (mounted && seq == _openSeq) {
+            _presentPopover(
+                seq, anchorId, point, options, bodyWidget, bodyId, size);
+          }
+        });
+        // releases the holder if the open is cancelled meanwhile
+        _schedulePrewarmExpiry();
+        return;
+      }
+    }
+    _presentPopover(
+        seq, anchorId, point, options, bodyWidget, bodyId, bodySize);
+  }
 
-    // Parse colors
-    Color? backgroundColor = widget.control.attrColor("backgroundColor", context);
-    Color? barrierColor = widget.control.attrColor("barrierColor", context);
+  /// Reports an open that couldn't be carried out as a dismissal, so the
+  /// server doesn't take the popover for open.
+  void _openFailed(String message) {
+    debugPrint("FletPopover: $message");
+    _trace = null;
+    widget.backend.triggerControlEvent(
+        widget.control.id,
+        "on_pop",
+        jsonEncode({"reason": PopoverDismissReason.failed, "result": null}));
+  }
 
-    // Parse dimensions and offsets
-    double? width = widget.control.attrDouble("width");
-    double? height = widget.control.attrDouble("height");
-    double radius = widget.control.attrDouble("radius", 8.0)!;
-    double arrowWidth = widget.control.attrDouble("arrowWidth", 24.0)!;
-    double arrowHeight = widget.control.attrDouble("arrowHeight", 12.0)!;
-    double arrowDxOffset = widget.control.attrDouble("arrowDxOffset", 0.0)!;
-    double arrowDyOffset = widget.control.attrDouble("arrowDyOffset", 0.0)!;
-    double contentDxOffset = widget.control.attrDouble("contentDxOffset", 0.0)!;
-    double contentDyOffset = widget.control.attrDouble("contentDyOffset", 0.0)!;
+  /// Reports what the popover was opened at: its own content, an anchor,
+  /// another popover by its host key, or a point.
+  void _reportOpen(String? anchorId, Offset? point) {
+    if (!widget.control.attrBool("onOpen", false)!) {
+      return;
+    }
+    var kind = point != null
+        ? "point"
+        : anchorId == null
+            ? "content"
+            : PopoverRegistry.anchor(anchorId) != null
+                ? "anchor"
+                : "host";
+    widget.backend.triggerControlEvent(
+        widget.control.id,
+        "on_open",
+        jsonEncode({
+          "kind": kind,
+          "key": anchorId,
+          if (point != null) "x": point.dx,
+          if (point != null) "y": point.dy,
+        }));
+  }
 
-    // Parse behavior
-    bool barrierDismissible = widget.control.attrBool("barrierDismissible", true)!;
+  /// Points the open popover at another anchor or point, keeping its route
+  /// and body.
+  void _moveTo(String? anchorId, Offset? point) {
+    if (anchorId == _openAnchorId && point == _openPoint) {
+      return;
+    }
+    var placement = _placement;
+    if (placement == null) {
+      // still measuring the body, so start over at the new target, timed
+      // from the first request
+      var trace = _trace;
+      _hidePopover();
+      _trace = trace;
+      _showPopover(anchorId: anchorId, point: point);
+      return;
+    }
+    BuildContext? anchorContext;
+    if (point == null) {
+      anchorContext = _anchorContext(anchorId);
+      if (anchorContext == null) {
+        debugPrint("FletPopover: Anchor $anchorId not found");
+        _closePopover(PopoverDismissReason.failed, null);
+        return;
+      }
+      _removePointEntry();
+      placement.anchorContext = anchorContext;
+    } else {
+      _insertPointEntry(point);
+      // the point placeholder is laid out in the coming frame
+      WidgetsBinding.instance.addPostFrameCallback((_) {
+        var pointContext = _pointKey.currentContext;
+        if (mounted && _placement == placement && pointContext != null) {
+          placement.anchorContext = pointContext;
+          _updatePlacement(placement);
+        }
+      });
+    }
+    _openAnchorId = anchorId;
+    _openPoint = point;
+    if (anchorContext != null) {
+      _updatePlacement(placement);
+    }
+    // lets the server rebind the body for the new anchor
+    _reportOpen(anchorId, point);
+  }
 
-    // Parse transition duration
-    int transitionDurationMs = widget.control.attrInt("transitionDuration", 200)!;
-    Duration transitionDuration = Duration(milliseconds: transitionDurationMs);
+  Offset? _parsePoint(Map<String, String> args) {
+    var x = double.tryParse(args["x"] ?? "");
+    var y = double.tryParse(args["y"] ?? "");
+    return x != null && y != null ? Offset(x, y) : null;
+  }
 
-    // Parse shadow
-    List<BoxShadow> shadow = _parseShadow();
+  /// The widget the popover points at: the placeholder of a point, another
+  /// anchor or popover, or this popover's content.
+  BuildContext? _anchorContext(String? anchorId, {bool atPoint = false}) {
+    if (atPoint) {
+      return _pointKey.currentContext;
+    }
+    return anchorId != null ? PopoverRegistry.target(anchorId) : context;
+  }
 
-    // Create the body widget
-    bool? adaptive = widget.control.attrBool("adaptive") ?? widget.parentAdaptive;
-    bool disabled = widget.control.isDisabled || widget.parentDisabled;
+  /// Puts a zero-size placeholder at [point] in the root overlay, so the
+  /// popover can be anchored to a position instead of a control.
+  void _insertPointEntry(Offset point) {
+    _removePointEntry();
+    var key = _pointKey = GlobalKey();
+    var entry = _pointEntry = OverlayEntry(
+      builder: (context) => Positioned(
+        left: point.dx,
+        top: point.dy,
+        child: IgnorePointer(child: SizedBox.shrink(key: key)),
+      ),
+    );
+    Overlay.of(context, rootOverlay: true).insert(entry);
+  }
 
-    Widget bodyWidget = createControl(
-      widget.control,
-      bodyControls.first.id,
-      disabled,
-      parentAdaptive: adaptive
+  void _removePointEntry() {
+    _pointEntry?.remove();
+    _pointEntry = null;
+  }
+
+  /// Removes the point placeholder once the exit [animation] is over, as the
+  /// popover still points at it until then.
+  void _removePointEntryAfter(Animation<double>? animation) {
+    var entry = _pointEntry;
+    if (entry == null) {
+      return;
+    }
+    void remove() {
+      if (_pointEntry == entry) {
+        _removePointEntry();
+      }
+    }
+
+    if (animation == null || animation.status == AnimationStatus.dismissed) {
+      remove();
+      return;
+    }
+    void onStatus(AnimationStatus status) {
+      if (status == AnimationStatus.dismissed) {
+        animation.removeStatusListener(onStatus);
+        remove();
+      }
+    }
+
+    animation.addStatusListener(onStatus);
+  }
+
+  /// Bodies are measured under the screen size minus the placement margins.
+  BoxConstraints _measureConstraints() {
+    var screenSize = MediaQuery.sizeOf(context);
+    return BoxConstraints(
+      maxWidth: screenSize.width - 2 * _popoverMargin,
+      maxHeight: screenSize.height - 2 * _popoverMargin,
     );
+  }
 
-    // Get screen dimensions and trigger position
-    final screenSize = MediaQuery.of(context).size;
-    final renderBox = context.findRenderObject() as RenderBox?;
-    
-    if (renderBox == null) {
-      debugPrint("FletPopover: Could not find render box");
+  void _presentPopover(int seq, String? anchorId, Offset? point,
+      PopoverOptions options, Widget bodyWidget, String bodyId,
+      Size? bodySize) {
+    // The anchor may have gone away while the body was measured
+    BuildContext? anchorContext =
+        _anchorContext(anchorId, atPoint: point != null);
+    final renderBox = anchorContext?.findRenderObject() as RenderBox?;
+    if (point != null && (renderBox == null || !renderBox.hasSize)) {
+      // the point placeholder is laid out in the coming frame
+      WidgetsBinding.instance.addPostFrameCallback((_) {
+        if (mounted && seq == _openSeq) {
+          _presentPopover(
+              seq, anchorId, point, options, bodyWidget, bodyId, bodySize);
+        }
+      });
+      SchedulerBinding.instance.scheduleFrame();
       return;
     }
+    if (anchorContext == null || renderBox == null) {
+      _isOpen = false;
+      _removePointEntry();
+      _openFailed("Could not find render box");
+      return;
+    }
+
+    var anchorRect = renderBox.localToGlobal(Offset.zero) & renderBox.size;
+    var screenSize = MediaQuery.sizeOf(context);
+    var padding = _placementPadding();
 
-    final triggerPosition = renderBox.localToGlobal(Offset.zero);
-    final triggerSize = renderBox.size;
+    _prewarmTimer?.cancel();
+    _prewarmTimer = null;
+    if (_keepAlive) {
+      var limit = widget.control.attrInt(PopoverAttrs.keepAliveLimit);
+      if (limit != null) {
+        PopoverKeepAlive.capacity = limit;
+      }
+      // the route takes the body over from the holder in the same frame
+      _keptBody?.detach();
+    } else if (_keptBody != null && !_keptBody!.isEvicted) {
+      // a prewarmed body moves into the route under its key
+      _releaseKeptBody();
+    } else {
+      // a closing route may still build the previous key
+      _bodyKey = GlobalKey();
+    }
+    _syncOpenState(true);
+    _openAnchorId = anchorId;
+    _openPoint = point;
+    _reportOpen(anchorId, point);
 
-    // Calculate optimal direction and constraints based on available space
-    final optimalConfig = _calculateOptimalPopoverConfig(
+    _trace?.mark("body");
+    _joinGroup();
+    _joinParent();
+    var placement = _placement = _Placement(
+      anchorContext: anchorContext,
+      options: options,
+      bodyWidget: bodyWidget,
+      bodyId: bodyId,
+      bodySize: bodySize,
+      anchorRect: anchorRect,
       screenSize: screenSize,
-      triggerPosition: triggerPosition,
-      triggerSize: triggerSize,
-      preferredDirection: preferredDirection,
-      popoverWidth: width,
-      popoverHeight: height,
-      arrowHeight: arrowHeight,
+      padding: padding,
+      result: _place(anchorRect, screenSize, padding, options, bodySize),
     );
+    if (options.modal) {
+      _pushRoute(placement);
+    } else {
+      _pushOverlay(placement);
+    }
+    _watchPlacement();
+    _startDismissTimer();
+    _traceTransition();
+  }
 
-    showPopover(
-      context: context,
-      bodyBuilder: (context) => bodyWidget,
-      direction: optimalConfig.direction,
-      transition: transition,
-      backgroundColor: backgroundColor ?? const Color(0xFFFFFFFF),
-      barrierColor: barrierColor ?? const Color(0x80000000),
-      transitionDuration: transitionDuration,
-      radius: radius,
-      shadow: shadow,
-      arrowWidth: arrowWidth,
-      arrowHeight: arrowHeight,
-      arrowDxOffset: arrowDxOffset,
-      arrowDyOffset: arrowDyOffset,
-      contentDxOffset: contentDxOffset,
-      contentDyOffset: contentDyOffset,
-      barrierDismissible: barrierDismissible,
-      width: optimalConfig.width,
-      height: optimalConfig.height,
-      constraints: optimalConfig.constraints,
-      onPop: () {
-        // Trigger the on_pop event
-        widget.backend.triggerControlEvent(widget.control.id, "on_pop", "");
-      },
+  /// The body as the route or the overlay entry shows it, under [bodyKey]
+  /// even when the entry is rebuilt after a newer open replaced the key.
+  Widget _popoverChild(_Placement placement, GlobalKey bodyKey) {
+    var sizeKey = _sizeKey(placement.bodyId);
+    var measureConstraints = _measureConstraints();
+    return PopoverScope(
+      close: _closeWithResult,
+      host: this,
+      child: PopoverSizeReporter(
+        // keeps the cached size and the placement in step with the body's
+        // content
+        onSize: (size) {
+          var c = placement.result.constraints;
+          // a body squeezed by the available space says nothing about
+          // its own size
+          if (size.width > c.minWidth &&
+              size.width < c.maxWidth &&
+              size.height > c.minHeight &&
+              size.height < c.maxHeight) {
+            PopoverBodySizes.put(sizeKey, measureConstraints, size);
+            if (mounted &&
+                _placement == placement &&
+                size != placement.bodySize) {
+              // placed by a stale size, e.g. the body control was updated
+              // since it was measured
+              placement.bodySize = size;
+              _replace(placement);
+            }
+          }
+        },
+        child: KeyedSubtree(key: bodyKey, child: placement.bodyWidget),
+      ),
     );
   }
 
-  PopoverDirection _parseDirection(String? direction) {
-    switch (direction?.toLowerCase()) {
-      case "top":
-        return PopoverDirection.top;
-      case "left":
-        return PopoverDirection.left;
-      case "right":
-        return PopoverDirection.right;
-      case "bottom":
-      default:
-        return PopoverDirection.bottom;
+  /// The body laid out next to the anchor; it lays out again whenever
+  /// [_placementVersion] ticks.
+  Widget _popoverLayout(_Placement placement, Animation<double> animation,
+      GlobalKey bodyKey) {
+    return ListenableBuilder(
+      listenable: _placementVersion,
+      builder: (context, child) => PopoverOverlayBody(
+        anchorRect: placement.anchorRect,
+        placement: placement.result.placement,
+        options: placement.options,
+        constraints: placement.result.constraints,
+        width: placement.options.width,
+        height: placement.options.height,
+        bounds: placement.bounds,
+        animation: animation,
+        child: child!,
+      ),
+      child: _popoverChild(placement, bodyKey),
+    );
+  }
+
+  void _pushRoute(_Placement placement) {
+    var options = placement.options;
+    var bodyKey = _bodyKey;
+    GestureBinding.instance.pointerRouter.addGlobalRoute(_onGlobalPointerEvent);
+
+    var route = _route = PopoverRoute(
+      builder: (context, animation) =>
+          _popoverLayout(placement, animation, bodyKey),
+      barrierColor: options.barrierColor,
+      barrierDismissible: options.barrierDismissible,
+      barrierLabel: options.barrierDismissible
+          ? MaterialLocalizations.of(context).modalBarrierDismissLabel
+          : null,
+      transitionDuration: options.transitionDuration,
+    );
+    Navigator.of(placement.anchorContext)
+        .push(route)
+        .whenComplete(() => _onPopoverClosed(options.barrierDismissible));
+  }
+
+  /// Shows a non-modal popover in an overlay entry: no route and no barrier,
+  /// so the page stays interactive, the route stack is left alone and any
+  /// number of popovers can be open.
+  void _pushOverlay(_Placement placement) {
+    var options = placement.options;
+    var animation = AnimationController(
+        vsync: this, duration: options.transitionDuration);
+    var bodyKey = _bodyKey;
+    var entry = OverlayEntry(
+      builder: (context) => _popoverLayout(placement, animation, bodyKey),
+    );
+    _overlayEntry = entry;
+    _overlayAnimation = animation;
+    _overlays[entry] = animation;
+    GestureBinding.instance.pointerRouter.addGlobalRoute(_onGlobalPointerEvent);
+    Overlay.of(context, rootOverlay: true).insert(entry);
+    animation.forward();
+  }
+
+  /// Checks the anchor and the viewport after every frame while the popover
+  /// is open. Frames only happen when something changed, e.g. a scroll, a
+  /// resize or a rotation, so an idle popover costs nothing.
+  void _watchPlacement() {
+    SchedulerBinding.instance.addPostFrameCallback((_) {
+      var placement = _placement;
+      if (!mounted || placement == null) {
+        return;
+      }
+      _updatePlacement(placement);
+      _watchPlacement();
+    });
+  }
+
+  /// Moves the popover with its anchor. Placement is only recomputed when the
+  /// anchor rect, the viewport or its insets changed.
+  void _updatePlacement(_Placement placement) {
+    var anchorContext = placement.anchorContext;
+    var box = anchorContext.mounted
+        ? anchorContext.findRenderObject() as RenderBox?
+        : null;
+    if (box == null || !box.attached || !box.hasSize) {
+      // the anchor went away, the popover stays where it is
+      return;
     }
+    var anchorRect = box.localToGlobal(Offset.zero) & box.size;
+    var screenSize = MediaQuery.sizeOf(context);
+    var padding = _placementPadding();
+    if (anchorRect == placement.anchorRect &&
+        screenSize == placement.screenSize &&
+        padding == placement.padding) {
+      return;
+    }
+    placement.anchorRect = anchorRect;
+    placement.screenSize = screenSize;
+    placement.padding = padding;
+    _replace(placement);
   }
 
-  PopoverTransition _parseTransition(String? transition) {
-    switch (transition?.toLowerCase()) {
-      case "fade":
-        return PopoverTransition.other;
-      case "scale":
-      default:
-        return PopoverTransition.scale;
-    }
-  }
-
-  List<BoxShadow> _parseShadow() {
-    // Default shadow
-    List<BoxShadow> defaultShadow = [
-      const BoxShadow(
-        color: Color(0x1F000000),
-        blurRadius: 5,
-      )
-    ];
-
-    return defaultShadow;
-  }
-
-  /// Calculate optimal popover configuration to ensure it stays within screen bounds
-  _PopoverConfig _calculateOptimalPopoverConfig({
-    required Size screenSize,
-    required Offset triggerPosition,
-    required Size triggerSize,
-    required PopoverDirection preferredDirection,
-    double? popoverWidth,
-    double? popoverHeight,
-    required double arrowHeight,
-  }) {
-    // Define margins to keep popover away from screen edges
-    const double margin = 16.0;
-    
-    // Calculate available space in each direction
-    final double spaceAbove = triggerPosition.dy - margin;
-    final double spaceBelow = screenSize.height - (triggerPosition.dy + triggerSize.height) - margin;
-    final double spaceLeft = triggerPosition.dx - margin;
-    final double spaceRight = screenSize.width - (triggerPosition.dx + triggerSize.width) - margin;
-    
-    // Estimate popover dimensions if not provided
-    final double estimatedWidth = popoverWidth ?? (screenSize.width * 0.6);
-    final double estimatedHeight = popoverHeight ?? (screenSize.height * 0.4);
-    
-    // Add arrow height to required space
-    final double requiredHeightWithArrow = estimatedHeight + arrowHeight;
-    final double requiredWidthWithArrow = estimatedWidth + arrowHeight; // For left/right directions
-    
-    // Determine optimal direction based on available space
-    PopoverDirection optimalDirection = preferredDirection;
-    
-    switch (preferredDirection) {
-      case PopoverDirection.bottom:
-        if (spaceBelow < requiredHeightWithArrow) {
-          // Not enough space below, try other directions
-          if (spaceAbove >= requiredHeightWithArrow) {
-            optimalDirection = PopoverDirection.top;
-          } else if (spaceRight >= requiredWidthWithArrow) {
-            optimalDirection = PopoverDirection.right;
-          } else if (spaceLeft >= requiredWidthWithArrow) {
-            optimalDirection = PopoverDirection.left;
-          }
-          // If no direction has enough space, keep original but constrain size
-        }
-        break;
-        
-      case PopoverDirection.top:
-        if (spaceAbove < requiredHeightWithArrow) {
-          if (spaceBelow >= requiredHeightWithArrow) {
-            optimalDirection = PopoverDirection.bottom;
-          } else if (spaceRight >= requiredWidthWithArrow) {
-            optimalDirection = PopoverDirection.right;
-          } else if (spaceLeft >= requiredWidthWithArrow) {
-            optimalDirection = PopoverDirection.left;
-          }
-        }
-        break;
-        
-      case PopoverDirection.right:
-        if (spaceRight < requiredWidthWithArrow) {
-          if (spaceLeft >= requiredWidthWithArrow) {
-            optimalDirection = PopoverDirection.left;
-          } else if (spaceBelow >= requiredHeightWithArrow) {
-            optimalDirection = PopoverDirection.bottom;
-          } else if (spaceAbove >= requiredHeightWithArrow) {
-            optimalDirection = PopoverDirection.top;
-          }
+  /// Places the open popover again, by its current anchor rect, viewport and
+  /// body size.
+  void _replace(_Placement placement) {
+    placement.result = _place(placement.anchorRect, placement.screenSize,
+        placement.padding, placement.options, placement.bodySize);
+    // the body is laid out again, on whichever side
+    _placementVersion.value++;
+    _reportReposition();
+  }
+
+  /// Insets a popover stays clear of: safe areas and the keyboard.
+  EdgeInsets _placementPadding() =>
+      MediaQuery.paddingOf(context) + MediaQuery.viewInsetsOf(context);
+
+  /// Places the body next to [anchorRect], clear of the other open popovers.
+  ///
+  /// [bodySize] is the measured size of the body. Dimensions that are given
+  /// explicitly take precedence, and a body that couldn't be measured is
+  /// assumed to take a good part of the screen.
+  PopoverPlacementResult _place(Rect anchorRect, Size screenSize,
+      EdgeInsets padding, PopoverOptions options, Size? bodySize) {
+    return placePopover(
+      anchor: anchorRect,
+      screen: screenSize,
+      padding: padding,
+      margin: _popoverMargin,
+      gap: options.arrowHeight,
+      body: Size(
+        options.width ?? bodySize?.width ?? screenSize.width * 0.6,
+        options.height ?? bodySize?.height ?? screenSize.height * 0.4,
+      ),
+      preferred: options.placement,
+      fallbacks: options.fallbackPlacements,
+      obstacles: [
+        for (var host in PopoverRegistry.hosts)
+          if (host != this && host.isOpen)
+            if (host.bodyRect case var rect?) rect,
+      ],
+    );
+  }
+
+  /// Sends `on_reposition` at most once per [_repositionEventInterval], with
+  /// the latest placement.
+  void _reportReposition() {
+    if (_repositionTimer != null ||
+        !widget.control.attrBool("onReposition", false)!) {
+      return;
+    }
+    _repositionTimer = Timer(_repositionEventInterval, () {
+      _repositionTimer = null;
+      var placement = _placement;
+      if (!mounted || placement == null) {
+        return;
+      }
+      var rect = placement.anchorRect;
+      widget.backend.triggerControlEvent(
+          widget.control.id,
+          "on_reposition",
+          jsonEncode({
+            "x": rect.left,
+            "y": rect.top,
+            "width": rect.width,
+            "height": rect.height,
+            "direction": placement.result.direction.name,
+            "placement": placement.result.placement.toString(),
+          }));
+    });
+  }
+
+  /// The body shown in the route; it follows [_bodyId] so a rebound body is
+  /// picked up while the popover is open, and [_templateData] so an open
+  /// template popover shows new values.
+  Widget _buildRouteBody() {
+    bool? adaptive =
+        widget.control.attrBool("adaptive") ?? widget.parentAdaptive;
+    bool disabled = widget.control.isDisabled || widget.parentDisabled;
+
+    return ValueListenableBuilder<String?>(
+      valueListenable: _bodyId,
+      builder: (context, bodyId, _) {
+        if (bodyId == null) {
+          return const SizedBox.shrink();
         }
-        break;
-        
-      case PopoverDirection.left:
-        if (spaceLeft < requiredWidthWithArrow) {
-          if (spaceRight >= requiredWidthWithArrow) {
-            optimalDirection = PopoverDirection.right;
-          } else if (spaceBelow >= requiredHeightWithArrow) {
-            optimalDirection = PopoverDirection.bottom;
-          } else if (spaceAbove >= requiredHeightWithArrow) {
-            optimalDirection = PopoverDirection.top;
-          }
+        var template = _template;
+        if (template == null || template.bodyId != bodyId) {
+          return createControl(widget.control, bodyId, disabled,
+              parentAdaptive: adaptive);
         }
-        break;
-    }
-    
-    // Calculate constrained dimensions based on chosen direction
-    double? constrainedWidth = popoverWidth;
-    double? constrainedHeight = popoverHeight;
-    BoxConstraints constraints;
-    
-    switch (optimalDirection) {
-      case PopoverDirection.top:
-      case PopoverDirection.bottom:
-        // Constrain height based on available vertical space
-        final double availableHeight = (optimalDirection == PopoverDirection.bottom ? spaceBelow : spaceAbove) - arrowHeight;
-        constrainedHeight = popoverHeight != null 
-            ? (popoverHeight > availableHeight ? availableHeight : popoverHeight)
-            : (estimatedHeight > availableHeight ? availableHeight : estimatedHeight);
-        
-        // Constrain width to screen width with margins
-        final double maxScreenWidth = screenSize.width - (2 * margin);
-        constrainedWidth = popoverWidth != null
-            ? (popoverWidth > maxScreenWidth ? maxScreenWidth : popoverWidth)
-            : (estimatedWidth > maxScreenWidth ? maxScreenWidth : estimatedWidth);
-            
-        constraints = BoxConstraints(
-          maxWidth: maxScreenWidth,
-          maxHeight: availableHeight,
-          minWidth: 100,
-          minHeight: 50,
+        // the template's body, with its fields bound to this popover's data
+        return ValueListenableBuilder<Map<String, dynamic>>(
+          valueListenable: _templateData,
+          builder: (context, data, child) =>
+              PopoverTemplateScope(data: data, child: child!),
+          child: createControl(template.control, bodyId, disabled,
+              parentAdaptive: adaptive),
         );
-        break;
-        
-      case PopoverDirection.left:
-      case PopoverDirection.right:
-        // Constrain width based on available horizontal space
-        final double availableWidth = (optimalDirection == PopoverDirection.right ? spaceRight : spaceLeft) - arrowHeight;
-        constrainedWidth = popoverWidth != null
-            ? (popoverWidth > availableWidth ? availableWidth : popoverWidth)
-            : (estimatedWidth > availableWidth ? availableWidth : estimatedWidth);
-        
-        // Constrain height to screen height with margins
-        final double maxScreenHeight = screenSize.height - (2 * margin);
-        constrainedHeight = popoverHeight != null
-            ? (popoverHeight > maxScreenHeight ? maxScreenHeight : popoverHeight)
-            : (estimatedHeight > maxScreenHeight ? maxScreenHeight : estimatedHeight);
-            
-        constraints = BoxConstraints(
-          maxWidth: availableWidth,
-          maxHeight: maxScreenHeight,
-          minWidth: 100,
-          minHeight: 50,
-        );
-        break;
-    }
-    
-    return _PopoverConfig(
-      direction: optimalDirection,
-      width: constrainedWidth,
-      height: constrainedHeight,
-      constraints: constraints,
+      },
     );
   }
 
@@ -377,15 +1441,14 @@ class _FletPopoverControlState extends State<FletPopoverControl> {
       parentAdaptive: adaptive
     );
 
-    // Wrap with LayoutBuilder to get accurate viewport information
-    return LayoutBuilder(
-      builder: (BuildContext context, BoxConstraints constraints) {
-        // Wrap the content widget with GestureDetector to handle taps
-        return GestureDetector(
-          onTap: disabled ? null : _showPopover,
-          child: contentWidget,
-        );
-      },
+    // Open on the client without a round trip to the server
+    return PopoverTrigger(
+      mode: triggerMode,
+      onTrigger: disabled ? null : _triggerOpen,
+      onLeave: cancelPendingOpen,
+      prewarm: prewarmMode,
+      onPrewarm: disabled ? null : prewarm,
+      child: contentWidget,
     );
   }
 }
@@ -0,0 +1,45 @@
+import 'package:flet/flet.dart';
+import 'package:flutter/material.dart';
+
+import 'popover_scope.dart';
+import 'popover_trigger.dart';
+
+/// Closes the enclosing popover with a result when its content is tapped.
+class FletPopoverActionControl extends StatelessWidget {
+  final Control? parent;
+  final Control control;
+  final List<Control> children;
+  final bool parentDisabled;
+  final bool? parentAdaptive;
+
+  const FletPopoverActionControl({
+    super.key,
+    required this.parent,
+    required this.control,
+    required this.children,
+    required this.parentDisabled,
+    required this.parentAdaptive,
+  });
+
+  @override
+  Widget build(BuildContext context) {
+    var contentControls =
+        children.where((c) => c.name == "content" && c.isVisible);
+    if (contentControls.isEmpty) {
+      return const SizedBox.shrink();
+    }
+
+    bool? adaptive = control.attrBool("adaptive") ?? parentAdaptive;
+    bool disabled = control.isDisabled || parentDisabled;
+    var scope = PopoverScope.maybeOf(context);
+
+    return PopoverTrigger(
+      mode: PopoverTriggerMode.tap,
+      onTrigger: disabled || scope == null
+          ? null
+          : () => scope.close(control.attrString("result")),
+      child: createControl(control, contentControls.first.id, disabled,
+          parentAdaptive: adaptive),
+    );
+  }
+}
@@ -0,0 +1,78 @@
+import 'package:flet/flet.dart';
+import 'package:flutter/material.dart';
+
+import 'popover_registry.dart';
+import 'popover_trigger.dart';
+
+/// A trigger for a shared host popover. It holds no body and no method
+/// subscription; a tap forwards its own position to the host.
+class FletPopoverAnchorControl extends StatefulWidget {
+  final Control? parent;
+  final Control control;
+  final List<Control> children;
+  final bool parentDisabled;
+  final bool? parentAdaptive;
+
+  const FletPopoverAnchorControl({
+    super.key,
+    required this.parent,
+    required this.control,
+    required this.children,
+    required this.parentDisabled,
+    required this.parentAdaptive,
+  });
+
+  @override
+  State<FletPopoverAnchorControl> createState() =>
+      _FletPopoverAnchorControlState();
+}
+
+class _FletPopoverAnchorControlState extends State<FletPopoverAnchorControl> {
+  @override
+  void initState() {
+    super.initState();
+    PopoverRegistry.registerAnchor(widget.control.id, context);
+  }
+
+  @override
+  void dispose() {
+    PopoverRegistry.unregisterAnchor(widget.control.id, context);
+    super.dispose();
+  }
+
+  PopoverHost? _host() =>
+      PopoverRegistry.host(widget.control.attrString("popover"));
+
+  void _open() {
+    var host = _host();
+    if (host == null) {
+      debugPrint("FletPopoverAnchor: host popover not found");
+      return;
+    }
+    host.showAtAnchor(context, widget.control.id);
+  }
+
+  @override
+  Widget build(BuildContext context) {
+    var contentControls =
+        widget.children.where((c) => c.name == "content" && c.isVisible);
+    if (contentControls.isEmpty) {
+      return const SizedBox.shrink();
+    }
+
+    bool? adaptive =
+        widget.control.attrBool("adaptive") ?? widget.parentAdaptive;
+    bool disabled = widget.control.isDisabled || widget.parentDisabled;
+
+    var host = _host();
+    return PopoverTrigger(
+      mode: host?.triggerMode ?? PopoverTriggerMode.tap,
+      onTrigger: disabled ? null : _open,
+      onLeave: () => _host()?.cancelPendingOpen(),
+      prewarm: host?.prewarmMode ?? PopoverPrewarm.none,
+      onPrewarm: disabled ? null : () => _host()?.prewarm(),
+      child: createControl(widget.control, contentControls.first.id, disabled,
+          parentAdaptive: adaptive),
+    );
+  }
+}
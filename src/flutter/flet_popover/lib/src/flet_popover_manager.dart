@@ -0,0 +1,56 @@
+import 'dart:convert';
+
+import 'package:flet/flet.dart';
+import 'package:flutter/widgets.dart';
+
+import 'popover_registry.dart';
+import 'popover_scope.dart';
+
+/// A non-visual control that closes popovers on the page in bulk.
+class FletPopoverManagerControl extends StatefulWidget {
+  final Control control;
+  final FletControlBackend backend;
+
+  const FletPopoverManagerControl(
+      {super.key, required this.control, required this.backend});
+
+  @override
+  State<FletPopoverManagerControl> createState() =>
+      _FletPopoverManagerControlState();
+}
+
+class _FletPopoverManagerControlState extends State<FletPopoverManagerControl> {
+  @override
+  void initState() {
+    super.initState();
+    widget.backend.subscribeMethods(widget.control.id, _onMethodCall);
+  }
+
+  @override
+  void dispose() {
+    widget.backend.unsubscribeMethods(widget.control.id);
+    super.dispose();
+  }
+
+  Future<String?> _onMethodCall(
+      String methodName, Map<String, String> args) async {
+    if (methodName != "close") {
+      return null;
+    }
+    var ids = args["ids"];
+    // without ids, every popover on the page is closed
+    var hosts = ids == null
+        ? PopoverRegistry.hosts.toList()
+        : (jsonDecode(ids) as List)
+            .map((id) => PopoverRegistry.host(id))
+            .whereType<PopoverHost>()
+            .toList();
+    for (var host in hosts) {
+      host.dismiss(PopoverDismissReason.programmatic);
+    }
+    return null;
+  }
+
+  @override
+  Widget build(BuildContext context) => const SizedBox.shrink();
+}
@@ -0,0 +1,279 @@
+import 'dart:async';
+import 'dart:collection';
+import 'dart:convert';
+import 'dart:math';
+
+import 'package:flet/flet.dart';
+import 'package:flutter/material.dart';
+import 'package:flutter/scheduler.dart';
+
+import 'popover_attrs.g.dart';
+import 'popover_scope.dart';
+
+class _MenuItem {
+  final String title;
+  final String? subtitle;
+  final String result;
+
+  _MenuItem(this.title, this.subtitle, this.result);
+
+  factory _MenuItem.fromJson(Map<String, dynamic> json) => _MenuItem(
+        json["title"] ?? "",
+        json["subtitle"],
+        jsonEncode(json["result"] ?? json["title"]),
+      );
+}
+
+/// A virtualized list whose items are fetched from Python a page at a time.
+///
+/// Rows have a fixed extent, so the list lays out in constant time whatever
+/// the item count, and only pages that are scrolled into view are requested.
+/// Pages are kept in an LRU bounded by `cachePages`.
+///
+/// Items streamed from Python replace the pages. Chunks are applied once per
+/// frame, and chunks of an older stream generation are dropped.
+class FletPopoverMenuControl extends StatefulWidget {
+  final Control? parent;
+  final Control control;
+  final bool parentDisabled;
+  final FletControlBackend backend;
+
+  const FletPopoverMenuControl({
+    super.key,
+    required this.parent,
+    required this.control,
+    required this.parentDisabled,
+    required this.backend,
+  });
+
+  @override
+  State<FletPopoverMenuControl> createState() => _FletPopoverMenuControlState();
+}
+
+class _FletPopoverMenuControlState extends State<FletPopoverMenuControl> {
+  final LinkedHashMap<int, List<_MenuItem>> _pages = LinkedHashMap();
+  final Set<int> _requested = {};
+  String? _revision;
+
+  // Streamed items, and chunks waiting for the next frame
+  final ScrollController _scrollController = ScrollController();
+  List<_MenuItem>? _streamItems;
+  int _streamGeneration = 0;
+  List<_MenuItem>? _pendingItems;
+  bool _pendingReplace = false;
+  bool _applyScheduled = false;
+
+  @override
+  void initState() {
+    super.initState();
+    _revision = widget.control.attrString("revision");
+    widget.backend.subscribeMethods(widget.control.id, _onMethodCall);
+    _syncStream();
+  }
+
+  bool get _streamed => widget.control.attrBool("streamed", false)!;
+
+  /// Asks for the items streamed before this menu was built.
+  void _syncStream() {
+    if (_streamed && _streamItems == null) {
+      scheduleMicrotask(() {
+        if (mounted) {
+          widget.backend.triggerControlEvent(widget.control.id, "stream_sync");
+        }
+      });
+    }
+  }
+
+  @override
+  void didUpdateWidget(covariant FletPopoverMenuControl oldWidget) {
+    super.didUpdateWidget(oldWidget);
+    var revision = widget.control.attrString("revision");
+    if (revision != _revision ||
+        widget.control.attrString(PopoverMenuAttrs.pageSize) !=
+            oldWidget.control.attrString(PopoverMenuAttrs.pageSize)) {
+      _revision = revision;
+      _pages.clear();
+      _requested.clear();
+    }
+    if (!oldWidget.control.attrBool("streamed", false)!) {
+      _syncStream();
+    }
+  }
+
+  @override
+  void dispose() {
+    widget.backend.unsubscribeMethods(widget.control.id);
+    _scrollController.dispose();
+    super.dispose();
+  }
+
+  int get _pageSize => max(
+      1,
+      widget.control.attrInt(
+          PopoverMenuAttrs.pageSize, PopoverMenuAttrDefaults.pageSize)!);
+
+  // the visible rows may span a few pages, which must not evict each other
+  int get _cachePages => max(
+      3,
+      widget.control.attrInt(
+          PopoverMenuAttrs.cachePages, PopoverMenuAttrDefaults.cachePages)!);
+
+  Future<String?> _onMethodCall(
+      String methodName, Map<String, String> args) async {
+    if (methodName == "stream_items") {
+      _onStreamItems(args);
+      return null;
+    }
+    if (methodName != "set_items" || args["revision"] != _revision) {
+      // a reply to a request made before the items were refreshed
+      return null;
+    }
+    var offset = int.tryParse(args["offset"] ?? "");
+    if (offset == null || !mounted) {
+      return null;
+    }
+    var page = offset ~/ _pageSize;
+    var items = (jsonDecode(args["items"] ?? "[]") as List)
+        .map((item) => _MenuItem.fromJson(item))
+        .toList();
+    setState(() {
+      _requested.remove(page);
+      _pages.remove(page);
+      _pages[page] = items;
+      while (_pages.length > _cachePages) {
+        _pages.remove(_pages.keys.first);
+      }
+    });
+    return null;
+  }
+
+  void _onStreamItems(Map<String, String> args) {
+    var generation = int.tryParse(args["generation"] ?? "") ?? 0;
+    if (generation < _streamGeneration) {
+      // a newer stream has started
+      return;
+    }
+    var items = (jsonDecode(args["items"] ?? "[]") as List)
+        .map((item) => _MenuItem.fromJson(item))
+        .toList();
+    if (generation > _streamGeneration || args["replace"] == "true") {
+      _streamGeneration = generation;
+      _pendingItems = items;
+      _pendingReplace = true;
+    } else {
+      (_pendingItems ??= []).addAll(items);
+    }
+    if (_applyScheduled) {
+      return;
+    }
+    _applyScheduled = true;
+    SchedulerBinding.instance.addPostFrameCallback((_) => _applyStream());
+    SchedulerBinding.instance.scheduleFrame();
+  }
+
+  void _applyStream() {
+    _applyScheduled = false;
+    var items = _pendingItems;
+    _pendingItems = null;
+    if (!mounted || items == null) {
+      return;
+    }
+    var replace = _pendingReplace;
+    _pendingReplace = false;
+    setState(() {
+      if (replace || _streamItems == null) {
+        _streamItems = items;
+      } else {
+        _streamItems!.addAll(items);
+      }
+    });
+    if (replace && _scrollController.hasClients) {
+      _scrollController.jumpTo(0);
+    }
+  }
+
+  _MenuItem? _item(int index) {
+    var streamItems = _streamItems;
+    if (_streamed) {
+      return streamItems != null && index < streamItems.length
+          ? streamItems[index]
+          : null;
+    }
+    var pageSize = _pageSize;
+    var page = index ~/ pageSize;
+    var items = _pages.remove(page);
+    if (items == null) {
+      _request(page);
+      return null;
+    }
+    _pages[page] = items;
+    var i = index - page * pageSize;
+    return i < items.length ? items[i] : null;
+  }
+
+  void _request(int page) {
+    if (!_requested.add(page)) {
+      return;
+    }
+    var pageSize = _pageSize;
+    var data = jsonEncode({
+      "offset": page * pageSize,
+      "limit": pageSize,
+      "revision": _revision,
+    });
+    // events can't be sent while building
+    scheduleMicrotask(() {
+      if (mounted) {
+        widget.backend.triggerControlEvent(widget.control.id, "fetch", data);
+      }
+    });
+  }
+
+  @override
+  Widget build(BuildContext context) {
+    var control = widget.control;
+    var streamed = _streamed;
+    var itemCount = streamed
+        ? _streamItems?.length ?? 0
+        : max(
+            0,
+            control.attrInt(PopoverMenuAttrs.itemCount,
+                PopoverMenuAttrDefaults.itemCount)!);
+    var itemExtent = control.attrDouble(
+        PopoverMenuAttrs.itemExtent, PopoverMenuAttrDefaults.itemExtent)!;
+    var maxHeight = control.attrDouble(
+        PopoverMenuAttrs.maxHeight, PopoverMenuAttrDefaults.maxHeight)!;
+    bool disabled = control.isDisabled || widget.parentDisabled;
+    var scope = PopoverScope.maybeOf(context);
+
+    return SizedBox(
+      width: control.attrDouble(
+          PopoverMenuAttrs.width, PopoverMenuAttrDefaults.width),
+      // a streamed menu keeps its size, so the popover doesn't move between
+      // chunks
+      height: streamed ? maxHeight : min(itemCount * itemExtent, maxHeight),
+      child: ListView.builder(
+        controller: _scrollController,
+        padding: EdgeInsets.zero,
+        itemCount: itemCount,
+        itemExtent: itemExtent,
+        itemBuilder: (context, index) {
+          var item = _item(index);
+          if (item == null) {
+            return const SizedBox.shrink();
+          }
+          return ListTile(
+            title:
+                Text(item.title, maxLines: 1, overflow: TextOverflow.ellipsis),
+            subtitle: item.subtitle != null
+                ? Text(item.subtitle!,
+                    maxLines: 1, overflow: TextOverflow.ellipsis)
+                : null,
+            enabled: !disabled,
+            onTap: scope != null ? () => scope.close(item.result) : null,
+          );
+        },
+      ),
+    );
+  }
+}
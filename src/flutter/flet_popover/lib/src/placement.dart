@@ -0,0 +1,281 @@
+import 'dart:math';
+
+import 'package:flutter/rendering.dart';
+import 'package:popover/popover.dart';
+
+/// How a popover lines up with its anchor along the side it is shown on:
+/// with the anchor's leading edge, its center or its trailing edge.
+enum PopoverAlignment { start, center, end }
+
+/// A side of the anchor and an alignment along it, e.g. `bottom_start`.
+class PopoverPlacement {
+  final PopoverDirection direction;
+  final PopoverAlignment alignment;
+
+  const PopoverPlacement(this.direction,
+      [this.alignment = PopoverAlignment.center]);
+
+  /// Every placement, sides first.
+  static final List<PopoverPlacement> all = [
+    for (var direction in PopoverDirection.values)
+      for (var alignment in PopoverAlignment.values)
+        PopoverPlacement(direction, alignment),
+  ];
+
+  bool get isVertical =>
+      direction == PopoverDirection.top ||
+      direction == PopoverDirection.bottom;
+
+  /// Parses `side` or `side_alignment`, e.g. `top` or `left_end`.
+  static PopoverPlacement? parse(String? value) {
+    if (value == null) {
+      return null;
+    }
+    var parts = value.toLowerCase().split("_");
+    var direction = PopoverDirection.values
+        .where((d) => d.name == parts.first)
+        .firstOrNull;
+    if (direction == null) {
+      return null;
+    }
+    var alignment = parts.length > 1
+        ? PopoverAlignment.values.where((a) => a.name == parts[1]).firstOrNull
+        : PopoverAlignment.center;
+    return alignment != null ? PopoverPlacement(direction, alignment) : null;
+  }
+
+  /// Parses a comma-separated list, skipping unknown placements.
+  static List<PopoverPlacement> parseList(String? value) => [
+        for (var part in (value ?? "").split(","))
+          if (parse(part.trim()) case var placement?) placement,
+      ];
+
+  @override
+  bool operator ==(Object other) =>
+      other is PopoverPlacement &&
+      other.direction == direction &&
+      other.alignment == alignment;
+
+  @override
+  int get hashCode => Object.hash(direction, alignment);
+
+  @override
+  String toString() => alignment == PopoverAlignment.center
+      ? direction.name
+      : "${direction.name}_${alignment.name}";
+}
+
+/// The placement chosen for a popover.
+class PopoverPlacementResult {
+  final PopoverPlacement placement;
+
+  /// Where the body goes, for the size it was placed with.
+  final Rect rect;
+
+  /// How far the body was moved along its side to stay within the bounds.
+  final Offset shift;
+
+  /// The body has to fit these to stay on screen.
+  final BoxConstraints constraints;
+
+  /// Whether the whole body is within the bounds.
+  final bool fits;
+
+  /// Lower is better; see [placePopover].
+  final double score;
+
+  const PopoverPlacementResult({
+    required this.placement,
+    required this.rect,
+    required this.shift,
+    required this.constraints,
+    required this.fits,
+    required this.score,
+  });
+
+  PopoverDirection get direction => placement.direction;
+}
+
+/// The candidates in order of preference: [preferred] and [fallbacks], or,
+/// without fallbacks, every placement starting with the other alignments on
+/// the preferred side, then the opposite side and then the perpendicular
+/// ones.
+List<PopoverPlacement> placementCandidates(
+    PopoverPlacement preferred, List<PopoverPlacement> fallbacks) {
+  if (fallbacks.isNotEmpty) {
+    return {preferred, ...fallbacks}.toList();
+  }
+  var alignments = [
+    preferred.alignment,
+    ...[PopoverAlignment.center, PopoverAlignment.start, PopoverAlignment.end]
+        .where((a) => a != preferred.alignment),
+  ];
+  var opposite = _opposite(preferred.direction);
+  var perpendicular = preferred.isVertical
+      ? [PopoverDirection.right, PopoverDirection.left]
+      : [PopoverDirection.bottom, PopoverDirection.top];
+  return [
+    for (var direction in [preferred.direction, opposite, ...perpendicular])
+      for (var alignment in alignments) PopoverPlacement(direction, alignment),
+  ];
+}
+
+PopoverDirection _opposite(PopoverDirection direction) => switch (direction) {
+      PopoverDirection.top => PopoverDirection.bottom,
+      PopoverDirection.bottom => PopoverDirection.top,
+      PopoverDirection.left => PopoverDirection.right,
+      PopoverDirection.right => PopoverDirection.left,
+    };
+
+/// The rect of a body of [size] shown at [placement] of [anchor], [gap] away
+/// from it, before it is kept within any bounds.
+Rect alignBody(
+    Rect anchor, Size size, PopoverPlacement placement, double gap) {
+  double cross(double start, double end, double extent) =>
+      switch (placement.alignment) {
+        PopoverAlignment.start => start,
+        PopoverAlignment.center => (start + end - extent) / 2,
+        PopoverAlignment.end => end - extent,
+      };
+  var offset = switch (placement.direction) {
+    PopoverDirection.top => Offset(
+        cross(anchor.left, anchor.right, size.width),
+        anchor.top - gap - size.height),
+    PopoverDirection.bottom => Offset(
+        cross(anchor.left, anchor.right, size.width), anchor.bottom + gap),
+    PopoverDirection.left => Offset(anchor.left - gap - size.width,
+        cross(anchor.top, anchor.bottom, size.height)),
+    PopoverDirection.right => Offset(
+        anchor.right + gap, cross(anchor.top, anchor.bottom, size.height)),
+  };
+  return offset & size;
+}
+
+/// Like [alignBody], moving the body along its side so it stays within
+/// [bounds] where it can. It is never moved towards or over the anchor.
+Rect placeBody(Rect anchor, Size size, PopoverPlacement placement,
+    double gap, Rect bounds) {
+  var rect = alignBody(anchor, size, placement, gap);
+  double clamp(double start, double extent, double min, double max) =>
+      extent >= max - min ? min : start.clamp(min, max - extent);
+  return placement.isVertical
+      ? Offset(clamp(rect.left, size.width, bounds.left, bounds.right),
+              rect.top) &
+          size
+      : Offset(rect.left,
+              clamp(rect.top, size.height, bounds.top, bounds.bottom)) &
+          size;
+}
+
+/// Moves an arrow's [tip] along the side of [body] facing the anchor, if need
+/// be, so that the arrow's base of [arrowWidth] stays on the straight part of
+/// the side, between its corners rounded by [borderRadius]. The tip is
+/// centered on a side too short for the arrow.
+Offset clampArrowTip({
+  required Offset tip,
+  required Rect body,
+  required PopoverDirection direction,
+  required BorderRadius borderRadius,
+  required double arrowWidth,
+}) {
+  var half = arrowWidth / 2;
+  double clamp(double value, double start, double end) =>
+      start <= end ? value.clamp(start, end) : (start + end) / 2;
+  return switch (direction) {
+    PopoverDirection.top => Offset(
+        clamp(tip.dx, body.left + borderRadius.bottomLeft.x + half,
+            body.right - borderRadius.bottomRight.x - half),
+        tip.dy),
+    PopoverDirection.bottom => Offset(
+        clamp(tip.dx, body.left + borderRadius.topLeft.x + half,
+            body.right - borderRadius.topRight.x - half),
+        tip.dy),
+    PopoverDirection.left => Offset(
+        tip.dx,
+        clamp(tip.dy, body.top + borderRadius.topRight.y + half,
+            body.bottom - borderRadius.bottomRight.y - half)),
+    PopoverDirection.right => Offset(
+        tip.dx,
+        clamp(tip.dy, body.top + borderRadius.topLeft.y + half,
+            body.bottom - borderRadius.bottomLeft.y - half)),
+  };
+}
+
+/// The space the body has at [placement]: along the side up to the bounds,
+/// across it the whole bounds.
+BoxConstraints placementConstraints(
+    Rect anchor, PopoverPlacement placement, double gap, Rect bounds) {
+  var main = switch (placement.direction) {
+    PopoverDirection.top => anchor.top - gap - bounds.top,
+    PopoverDirection.bottom => bounds.bottom - anchor.bottom - gap,
+    PopoverDirection.left => anchor.left - gap - bounds.left,
+    PopoverDirection.right => bounds.right - anchor.right - gap,
+  };
+  main = max(0.0, main);
+  return placement.isVertical
+      ? BoxConstraints(maxWidth: max(0.0, bounds.width), maxHeight: main)
+      : BoxConstraints(maxWidth: main, maxHeight: max(0.0, bounds.height));
+}
+
+/// The part of [screen] a popover is kept in: less [padding] (safe areas and
+/// the keyboard) and [margin].
+Rect placementBounds(Size screen, EdgeInsets padding, double margin) =>
+    padding.deflateRect(Offset.zero & screen).deflate(margin);
+
+/// Picks the placement of a body of [body] size next to [anchor] in one pass
+/// over the candidates (see [placementCandidates]).
+///
+/// The body is kept within [placementBounds]. Every candidate is placed with
+/// [placeBody] and scored by, most important first, whether any of the body
+/// is outside the bounds and how much, the share covered by [obstacles] such
+/// as other open popovers, then its rank among the candidates and how far it
+/// had to be shifted, a fifth of the screen weighing as much as one rank. The
+/// lowest score wins, so a body that fits is never cut off for a better rank.
+PopoverPlacementResult placePopover({
+  required Rect anchor,
+  required Size screen,
+  EdgeInsets padding = EdgeInsets.zero,
+  double margin = 0,
+  required double gap,
+  required Size body,
+  required PopoverPlacement preferred,
+  List<PopoverPlacement> fallbacks = const [],
+  List<Rect> obstacles = const [],
+}) {
+  var bounds = placementBounds(screen, padding, margin);
+  var area = max(body.width * body.height, 1.0);
+  var longestSide = max(screen.longestSide, 1.0);
+  PopoverPlacementResult? best;
+  var candidates = placementCandidates(preferred, fallbacks);
+  for (var i = 0; i < candidates.length; i++) {
+    var placement = candidates[i];
+    var rect = placeBody(anchor, body, placement, gap, bounds);
+    var shift =
+        rect.topLeft - alignBody(anchor, body, placement, gap).topLeft;
+    var overflow = (area - _area(rect.intersect(bounds))) / area;
+    var fits = overflow <= 1e-9;
+    var covered = 0.0;
+    for (var obstacle in obstacles) {
+      covered += _area(rect.intersect(obstacle)) / area;
+    }
+    var score = (fits ? 0 : 100) +
+        overflow * 100 +
+        min(covered, 1.0) * 10 +
+        i * 0.1 +
+        shift.distance / longestSide * 0.5;
+    if (best == null || score < best.score) {
+      best = PopoverPlacementResult(
+        placement: placement,
+        rect: rect,
+        shift: shift,
+        constraints: placementConstraints(anchor, placement, gap, bounds),
+        fits: fits,
+        score: score,
+      );
+    }
+  }
+  return best!;
+}
+
+double _area(Rect rect) =>
+    rect.width > 0 && rect.height > 0 ? rect.width * rect.height : 0;
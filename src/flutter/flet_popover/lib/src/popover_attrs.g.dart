@@ -0,0 +1,116 @@
+// GENERATED by tools/gen_dart_attrs.py from the Python attribute spec.
+// Do not edit by hand.
+
+/// Wire names of `FletPopover` attributes.
+class PopoverAttrs {
+  static const String backgroundColor = "backgroundColor";
+  static const String barrierColor = "barrierColor";
+  static const String transitionDuration = "transitionDuration";
+  static const String radius = "radius";
+  static const String arrowWidth = "arrowWidth";
+  static const String arrowHeight = "arrowHeight";
+  static const String arrowDxOffset = "arrowDxOffset";
+  static const String arrowDyOffset = "arrowDyOffset";
+  static const String contentDxOffset = "contentDxOffset";
+  static const String contentDyOffset = "contentDyOffset";
+  static const String templateData = "templateData";
+  static const String lazyBody = "lazyBody";
+  static const String evictBodyOnPop = "evictBodyOnPop";
+  static const String keepAlive = "keepAlive";
+  static const String keepAliveLimit = "keepAliveLimit";
+  static const String direction = "direction";
+  static const String placement = "placement";
+  static const String fallbackPlacements = "fallbackPlacements";
+  static const String transition = "transition";
+  static const String triggerMode = "triggerMode";
+  static const String openDelay = "openDelay";
+  static const String closeDelay = "closeDelay";
+  static const String autoDismissAfter = "autoDismissAfter";
+  static const String group = "group";
+  static const String prewarm = "prewarm";
+  static const String prewarmTtl = "prewarmTtl";
+  static const String metricsSampleRate = "metricsSampleRate";
+  static const String borderRadius = "borderRadius";
+  static const String barrierDismissible = "barrierDismissible";
+  static const String modal = "modal";
+}
+
+/// Wire names of `PopoverStyle` attributes besides the styled ones.
+class PopoverStyleAttrs {
+  static const String isDefault = "default";
+}
+
+/// Wire names of `PopoverMenu` attributes.
+class PopoverMenuAttrs {
+  static const String itemCount = "itemCount";
+  static const String itemExtent = "itemExtent";
+  static const String pageSize = "pageSize";
+  static const String cachePages = "cachePages";
+  static const String width = "width";
+  static const String maxHeight = "maxHeight";
+}
+
+/// Wire names of `PopoverField` attributes.
+class PopoverFieldAttrs {
+  static const String name = "field";
+  static const String placeholder = "placeholder";
+  static const String size = "size";
+  static const String color = "color";
+  static const String weight = "weight";
+  static const String maxLines = "maxLines";
+}
+
+/// Values the client uses for `FletPopover` attributes that aren't set. Python
+/// leaves unstyled attributes equal to these out of the wire.
+class PopoverAttrDefaults {
+  static const int transitionDuration = 200;
+  static const double radius = 8.0;
+  static const double arrowWidth = 24.0;
+  static const double arrowHeight = 12.0;
+  static const double arrowDxOffset = 0.0;
+  static const double arrowDyOffset = 0.0;
+  static const double contentDxOffset = 0.0;
+  static const double contentDyOffset = 0.0;
+  static const bool lazyBody = false;
+  static const bool evictBodyOnPop = false;
+  static const bool keepAlive = false;
+  static const String direction = "bottom";
+  static const String transition = "scale";
+  static const String triggerMode = "tap";
+  static const int openDelay = 0;
+  static const int closeDelay = 0;
+  static const int prewarmTtl = 5000;
+  static const double metricsSampleRate = 1.0;
+  static const bool barrierDismissible = true;
+}
+
+/// Values the client uses for `PopoverStyle` attributes that aren't set. Python
+/// leaves unstyled attributes equal to these out of the wire.
+class PopoverStyleAttrDefaults {
+  static const bool isDefault = false;
+}
+
+/// Values the client uses for `PopoverMenu` attributes that aren't set. Python
+/// leaves unstyled attributes equal to these out of the wire.
+class PopoverMenuAttrDefaults {
+  static const int itemCount = 0;
+  static const double itemExtent = 48.0;
+  static const int pageSize = 50;
+  static const int cachePages = 8;
+  static const double width = 280.0;
+  static const double maxHeight = 320.0;
+}
+
+/// Attributes a popover can take from a `PopoverStyle`.
+const Set<String> popoverStyledAttrs = {
+  PopoverAttrs.backgroundColor,
+  PopoverAttrs.barrierColor,
+  PopoverAttrs.transitionDuration,
+  PopoverAttrs.radius,
+  PopoverAttrs.arrowWidth,
+  PopoverAttrs.arrowHeight,
+  PopoverAttrs.arrowDxOffset,
+  PopoverAttrs.arrowDyOffset,
+  PopoverAttrs.contentDxOffset,
+  PopoverAttrs.contentDyOffset,
+};
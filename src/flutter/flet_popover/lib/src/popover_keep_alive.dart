@@ -0,0 +1,117 @@
+import 'dart:async';
+import 'dart:collection';
+
+import 'package:flutter/widgets.dart';
+
+import 'popover_measure.dart';
+
+/// A closed or prewarmed popover body kept mounted offstage in the root
+/// overlay.
+///
+/// The body is wrapped with the same [GlobalKey] in the holder and in the
+/// popover route. Removing the holder in the frame the route is pushed (and
+/// inserting it in the frame the route is removed) lets Flutter move the
+/// element subtree between them, so state, scroll positions and render
+/// objects survive between openings.
+class KeptPopoverBody {
+  final GlobalKey bodyKey;
+  final Widget body;
+  final BoxConstraints constraints;
+  final ValueChanged<Size>? onSize;
+  final Completer<Size?> _laidOut = Completer();
+  OverlayEntry? _entry;
+  bool _evicted = false;
+
+  KeptPopoverBody({
+    required this.bodyKey,
+    required this.body,
+    required this.constraints,
+    this.onSize,
+  });
+
+  bool get isEvicted => _evicted;
+
+  /// Completes with the size of the body once the holder has laid it out,
+  /// or with null if it is evicted first.
+  Future<Size?> get laidOut => _laidOut.future;
+
+  void _onSize(Size size) {
+    if (!_laidOut.isCompleted) {
+      _laidOut.complete(size);
+    }
+    onSize?.call(size);
+  }
+
+  /// Adopts the body into an offstage holder entry.
+  void attach(OverlayState overlay) {
+    if (_evicted || _entry != null) {
+      return;
+    }
+    _entry = OverlayEntry(
+      maintainState: true,
+      builder: (context) => Offstage(
+        child: TickerMode(
+          enabled: false,
+          child: Align(
+            alignment: Alignment.topLeft,
+            child: ConstrainedBox(
+              constraints: constraints,
+              child: PopoverSizeReporter(
+                onSize: _onSize,
+                child: KeyedSubtree(key: bodyKey, child: body),
+              ),
+            ),
+          ),
+        ),
+      ),
+    );
+    overlay.insert(_entry!);
+  }
+
+  /// Releases the body so a popover route can take it over.
+  void detach() {
+    _entry?.remove();
+    _entry = null;
+  }
+
+  void _evict() {
+    _evicted = true;
+    detach();
+    if (!_laidOut.isCompleted) {
+      _laidOut.complete(null);
+    }
+  }
+}
+
+/// Page-wide LRU of kept popover bodies, keyed by popover control id.
+class PopoverKeepAlive {
+  static const int defaultCapacity = 8;
+
+  static int _capacity = defaultCapacity;
+  static final LinkedHashMap<String, KeptPopoverBody> _bodies =
+      LinkedHashMap();
+
+  static set capacity(int value) {
+    _capacity = value < 0 ? 0 : value;
+    _trim();
+  }
+
+  /// Marks [body] as the most recently used and evicts the least recently
+  /// used bodies over capacity.
+  static void touch(String id, KeptPopoverBody body) {
+    var previous = _bodies.remove(id);
+    if (previous != null && previous != body) {
+      previous._evict();
+    }
+    _bodies[id] = body;
+    _trim();
+  }
+
+  static void remove(String id) => _bodies.remove(id)?._evict();
+
+  static void _trim() {
+    while (_bodies.length > _capacity) {
+      remove(_bodies.keys.first);
+    }
+  }
+}
@@ -0,0 +1,73 @@
+import 'package:flutter/rendering.dart';
+import 'package:flutter/widgets.dart';
+
+/// Last laid out size of popover bodies, keyed by body control id.
+///
+/// Entries are refreshed by [PopoverSizeReporter] whenever a shown body lays
+/// out again, so the cache follows the body's current content. An entry may
+/// still be stale when a popover opens, e.g. after the body control was
+/// updated while it was closed; the open popover is placed again once its
+/// body reports another size. An entry is only valid for the constraints it
+/// was measured with.
+class PopoverBodySizes {
+  static final Map<String, _MeasuredSize> _sizes = {};
+
+  static Size? get(String bodyId, BoxConstraints constraints) {
+    var measured = _sizes[bodyId];
+    return measured != null && measured.constraints == constraints
+        ? measured.size
+        : null;
+  }
+
+  static void put(String bodyId, BoxConstraints constraints, Size size) =>
+      _sizes[bodyId] = _MeasuredSize(constraints, size);
+
+  static void remove(String bodyId) => _sizes.remove(bodyId);
+}
+
+class _MeasuredSize {
+  final BoxConstraints constraints;
+  final Size size;
+
+  const _MeasuredSize(this.constraints, this.size);
+}
+
+/// Reports the size of [child] after every layout that changes it.
+class PopoverSizeReporter extends SingleChildRenderObjectWidget {
+  final ValueChanged<Size> onSize;
+
+  const PopoverSizeReporter({
+    super.key,
+    required this.onSize,
+    required super.child,
+  });
+
+  @override
+  RenderObject createRenderObject(BuildContext context) =>
+      _RenderSizeReporter(onSize);
+
+  @override
+  void updateRenderObject(
+      BuildContext context, _RenderSizeReporter renderObject) {
+    renderObject.onSize = onSize;
+  }
+}
+
+class _RenderSizeReporter extends RenderProxyBox {
+  ValueChanged<Size> onSize;
+  Size? _lastSize;
+
+  _RenderSizeReporter(this.onSize);
+
+  @override
+  void performLayout() {
+    super.performLayout();
+    if (size == _lastSize) {
+      return;
+    }
+    _lastSize = size;
+    var reported = size;
+    // callbacks may change the widget tree, which isn't allowed during layout
+    WidgetsBinding.instance.addPostFrameCallback((_) => onSize(reported));
+  }
+}
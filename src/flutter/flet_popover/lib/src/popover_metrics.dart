@@ -0,0 +1,78 @@
+import 'dart:async';
+
+/// Latency marks of one popover open, in milliseconds since the open was
+/// triggered on the client or requested by the server.
+class PopoverOpenTrace {
+  /// "trigger" or "method".
+  final String source;
+  final Stopwatch _stopwatch = Stopwatch()..start();
+  final Map<String, double> _marks = {};
+  Duration? _lastFrame;
+  int _frames = 0;
+  int _droppedFrames = 0;
+
+  PopoverOpenTrace(this.source);
+
+  /// Records the time of [name], unless it has been recorded already.
+  void mark(String name) =>
+      _marks.putIfAbsent(name, () => _stopwatch.elapsedMicroseconds / 1000);
+
+  /// Counts a frame of the transition. A frame that starts more than a frame
+  /// budget after the previous one counts the frames skipped in between as
+  /// dropped.
+  void frame(Duration timeStamp, Duration budget) {
+    if (_frames == 0) {
+      mark("first_frame");
+    }
+    var last = _lastFrame;
+    if (last != null) {
+      var missed = (timeStamp - last).inMicroseconds / budget.inMicroseconds;
+      if (missed >= 1.5) {
+        _droppedFrames += missed.round() - 1;
+      }
+    }
+    _lastFrame = timeStamp;
+    _frames++;
+  }
+
+  Map<String, dynamic> toJson() => {
+        "source": source,
+        "body_ms": _marks["body"],
+        "first_frame_ms": _marks["first_frame"],
+        "shown_ms": _marks["shown"],
+        "frames": _frames,
+        "dropped_frames": _droppedFrames,
+      };
+}
+
+/// Finished traces waiting to be sent, so a burst of opens costs one event.
+class PopoverMetricsBuffer {
+  static const int batchSize = 20;
+  static const Duration flushInterval = Duration(seconds: 2);
+
+  final void Function(List<Map<String, dynamic>> records) onFlush;
+  final List<Map<String, dynamic>> _records = [];
+  Timer? _timer;
+
+  PopoverMetricsBuffer({required this.onFlush});
+
+  void add(PopoverOpenTrace trace) {
+    _records.add(trace.toJson());
+    if (_records.length >= batchSize) {
+      flush();
+    } else {
+      _timer ??= Timer(flushInterval, flush);
+    }
+  }
+
+  void flush() {
+    _timer?.cancel();
+    _timer = null;
+    if (_records.isEmpty) {
+      return;
+    }
+    var records = List.of(_records);
+    _records.clear();
+    onFlush(records);
+  }
+}
@@ -0,0 +1,172 @@
+import 'package:flet/flet.dart';
+import 'package:flutter/material.dart';
+import 'package:popover/popover.dart';
+
+import 'placement.dart';
+import 'popover_attrs.g.dart';
+import 'popover_style.dart';
+
+/// Popover attributes parsed once and reused by every open until the control
+/// changes.
+class PopoverOptions {
+  static const List<BoxShadow> defaultShadow = [
+    BoxShadow(
+      color: Color(0x1F000000),
+      blurRadius: 5,
+    )
+  ];
+
+  final PopoverDirection direction;
+
+  /// Where the popover is preferably shown; `direction` unless set.
+  final PopoverPlacement placement;
+
+  /// The placements tried besides [placement]; all of them when empty.
+  final List<PopoverPlacement> fallbackPlacements;
+  final PopoverTransition transition;
+  final Color backgroundColor;
+  final Color barrierColor;
+  final double? width;
+  final double? height;
+  final double radius;
+
+  /// The body's corners: `borderRadius` if set, [radius] on every corner
+  /// otherwise.
+  final BorderRadius borderRadius;
+  final double arrowWidth;
+  final double arrowHeight;
+  final double arrowDxOffset;
+  final double arrowDyOffset;
+  final double contentDxOffset;
+  final double contentDyOffset;
+  final bool barrierDismissible;
+
+  /// Whether the popover is shown in a route with a barrier rather than in
+  /// an overlay entry.
+  final bool modal;
+  final Duration transitionDuration;
+  final List<BoxShadow> shadow;
+
+  const PopoverOptions({
+    required this.direction,
+    required this.placement,
+    required this.fallbackPlacements,
+    required this.transition,
+    required this.backgroundColor,
+    required this.barrierColor,
+    required this.width,
+    required this.height,
+    required this.radius,
+    required this.borderRadius,
+    required this.arrowWidth,
+    required this.arrowHeight,
+    required this.arrowDxOffset,
+    required this.arrowDyOffset,
+    required this.contentDxOffset,
+    required this.contentDyOffset,
+    required this.barrierDismissible,
+    required this.modal,
+    required this.transitionDuration,
+    required this.shadow,
+  });
+
+  /// Styling attributes come from the popover, then its [PopoverStyles]
+  /// style, then the page default style.
+  factory PopoverOptions.parse(Control control, BuildContext context) {
+    var chain = PopoverStyles.chain(control);
+    Control source(String name) => popoverStyledAttrs.contains(name)
+        ? chain.firstWhere((c) => c.attrs.containsKey(name.toLowerCase()),
+            orElse: () => control)
+        : control;
+    double number(String name, double defValue) =>
+        source(name).attrDouble(name, defValue)!;
+
+    var radius = number(PopoverAttrs.radius, PopoverAttrDefaults.radius);
+    var direction = parsePopoverDirection(control.attrString(
+        PopoverAttrs.direction, PopoverAttrDefaults.direction));
+    return PopoverOptions(
+      direction: direction,
+      placement: PopoverPlacement.parse(
+              control.attrString(PopoverAttrs.placement)) ??
+          PopoverPlacement(direction),
+      fallbackPlacements: PopoverPlacement.parseList(
+          control.attrString(PopoverAttrs.fallbackPlacements)),
+      transition: parsePopoverTransition(control.attrString(
+          PopoverAttrs.transition, PopoverAttrDefaults.transition)),
+      backgroundColor: source(PopoverAttrs.backgroundColor)
+              .attrColor(PopoverAttrs.backgroundColor, context) ??
+          const Color(0xFFFFFFFF),
+      barrierColor: source(PopoverAttrs.barrierColor)
+              .attrColor(PopoverAttrs.barrierColor, context) ??
+          const Color(0x80000000),
+      width: control.attrDouble("width"),
+      height: control.attrDouble("height"),
+      radius: radius,
+      borderRadius: parseBorderRadius(control, PopoverAttrs.borderRadius) ??
+          BorderRadius.circular(radius),
+      arrowWidth:
+          number(PopoverAttrs.arrowWidth, PopoverAttrDefaults.arrowWidth),
+      arrowHeight:
+          number(PopoverAttrs.arrowHeight, PopoverAttrDefaults.arrowHeight),
+      arrowDxOffset:
+          number(PopoverAttrs.arrowDxOffset, PopoverAttrDefaults.arrowDxOffset),
+      arrowDyOffset:
+          number(PopoverAttrs.arrowDyOffset, PopoverAttrDefaults.arrowDyOffset),
+      contentDxOffset: number(
+          PopoverAttrs.contentDxOffset, PopoverAttrDefaults.contentDxOffset),
+      contentDyOffset: number(
+          PopoverAttrs.contentDyOffset, PopoverAttrDefaults.contentDyOffset),
+      barrierDismissible: control.attrBool(PopoverAttrs.barrierDismissible,
+          PopoverAttrDefaults.barrierDismissible)!,
+      // only an explicit false leaves the route out
+      modal: control.attrBool(PopoverAttrs.modal) ?? true,
+      transitionDuration: Duration(
+          milliseconds: source(PopoverAttrs.transitionDuration).attrInt(
+              PopoverAttrs.transitionDuration,
+              PopoverAttrDefaults.transitionDuration)!),
+      shadow: defaultShadow,
+    );
+  }
+
+  /// Whether [a] and [b] differ in anything but their client-synced state and
+  /// template data, i.e. whether options parsed from [a] are stale for [b].
+  static bool changed(Control a, Control b) {
+    if (identical(a, b)) {
+      return false;
+    }
+    // attribute keys arrive lowercased
+    var templateData = PopoverAttrs.templateData.toLowerCase();
+    for (var key in {...a.attrs.keys, ...b.attrs.keys}) {
+      if (key != "open" &&
+          key != templateData &&
+          a.attrs[key] != b.attrs[key]) {
+        return true;
+      }
+    }
+    return false;
+  }
+}
+
+PopoverDirection parsePopoverDirection(String? direction) {
+  switch (direction?.toLowerCase()) {
+    case "top":
+      return PopoverDirection.top;
+    case "left":
+      return PopoverDirection.left;
+    case "right":
+      return PopoverDirection.right;
+    case "bottom":
+    default:
+      return PopoverDirection.bottom;
+  }
+}
+
+PopoverTransition parsePopoverTransition(String? transition) {
+  switch (transition?.toLowerCase()) {
+    case "fade":
+      return PopoverTransition.other;
+    case "scale":
+    default:
+      return PopoverTransition.scale;
+  }
+}
@@ -0,0 +1,254 @@
+import 'package:flutter/material.dart';
+import 'package:popover/popover.dart';
+
+import 'placement.dart';
+import 'popover_options.dart';
+
+/// A popover body laid out next to its anchor, in an overlay entry or in a
+/// popover route.
+///
+/// The body is placed [PopoverOptions.arrowHeight] away from [anchorRect] at
+/// [placement] and moved along its side to stay within [bounds], see
+/// [placeBody]. The arrow is painted between the two, kept clear of the
+/// body's rounded corners. The overlay or route is expected to cover the
+/// screen, so its coordinates are global ones.
+class PopoverOverlayBody extends StatelessWidget {
+  final Rect anchorRect;
+  final PopoverPlacement placement;
+  final PopoverOptions options;
+  final BoxConstraints constraints;
+  final double? width;
+  final double? height;
+  final Rect bounds;
+  final Animation<double> animation;
+  final Widget child;
+
+  const PopoverOverlayBody({
+    super.key,
+    required this.anchorRect,
+    required this.placement,
+    required this.options,
+    required this.constraints,
+    required this.width,
+    required this.height,
+    required this.bounds,
+    required this.animation,
+    required this.child,
+  });
+
+  PopoverDirection get direction => placement.direction;
+
+  /// Where the arrow points, in overlay coordinates.
+  Offset get _tip {
+    var tip = switch (direction) {
+      PopoverDirection.top => anchorRect.topCenter,
+      PopoverDirection.left => anchorRect.centerLeft,
+      PopoverDirection.right => anchorRect.centerRight,
+      PopoverDirection.bottom => anchorRect.bottomCenter,
+    };
+    return tip + Offset(options.arrowDxOffset, options.arrowDyOffset);
+  }
+
+  @override
+  Widget build(BuildContext context) {
+    var radius = options.borderRadius;
+    var tip = _tip;
+    var layout = _PopoverOverlayLayout(
+      anchorRect: anchorRect,
+      placement: placement,
+      constraints: constraints,
+      bounds: bounds,
+      gap: options.arrowHeight,
+      offset: Offset(options.contentDxOffset, options.contentDyOffset),
+    );
+    Widget popover = CustomSingleChildLayout(
+      delegate: layout,
+      // the arrow is painted behind the body, outside of it
+      child: CustomPaint(
+        painter: _PopoverArrowPainter(
+          tip: tip,
+          layout: layout,
+          direction: direction,
+          borderRadius: radius,
+          color: options.backgroundColor,
+          width: options.arrowWidth,
+          height: options.arrowHeight,
+        ),
+        child: DecoratedBox(
+          decoration: BoxDecoration(
+            color: options.backgroundColor,
+            borderRadius: radius,
+            boxShadow: options.shadow,
+          ),
+          child: ClipRRect(
+            borderRadius: radius,
+            child: SizedBox(width: width, height: height, child: child),
+          ),
+        ),
+      ),
+    );
+    var curved = CurvedAnimation(parent: animation, curve: Curves.easeOut);
+    popover = FadeTransition(opacity: curved, child: popover);
+    if (options.transition != PopoverTransition.scale) {
+      return popover;
+    }
+    // grows out of the arrow's tip
+    return LayoutBuilder(
+      builder: (context, screen) => ScaleTransition(
+        scale: curved,
+        alignment: Alignment(
+          screen.maxWidth > 0 ? tip.dx / screen.maxWidth * 2 - 1 : 0,
+          screen.maxHeight > 0 ? tip.dy / screen.maxHeight * 2 - 1 : 0,
+        ),
+        child: popover,
+      ),
+    );
+  }
+}
+
+/// The route of a modal popover: a barrier and the page [builder] returns.
+///
+/// The page is built once, with the route's animation, and runs the
+/// popover's transition itself.
+class PopoverRoute<T> extends PopupRoute<T> {
+  final Widget Function(BuildContext context, Animation<double> animation)
+      builder;
+
+  @override
+  final Color? barrierColor;
+
+  @override
+  final bool barrierDismissible;
+
+  @override
+  final String? barrierLabel;
+
+  @override
+  final Duration transitionDuration;
+
+  PopoverRoute({
+    required this.builder,
+    required this.barrierColor,
+    required this.barrierDismissible,
+    required this.transitionDuration,
+    this.barrierLabel,
+  });
+
+  @override
+  Widget buildPage(BuildContext context, Animation<double> animation,
+          Animation<double> secondaryAnimation) =>
+      builder(context, animation);
+}
+
+class _PopoverOverlayLayout extends SingleChildLayoutDelegate {
+  final Rect anchorRect;
+  final PopoverPlacement placement;
+  final BoxConstraints constraints;
+  final Rect bounds;
+  final double gap;
+  final Offset offset;
+
+  _PopoverOverlayLayout({
+    required this.anchorRect,
+    required this.placement,
+    required this.constraints,
+    required this.bounds,
+    required this.gap,
+    required this.offset,
+  });
+
+  @override
+  BoxConstraints getConstraintsForChild(BoxConstraints screen) =>
+      constraints.loosen().enforce(screen.loosen());
+
+  @override
+  Offset getPositionForChild(Size screen, Size body) =>
+      bodyRect(body).topLeft;
+
+  /// Where a body of size [body] is placed, in overlay coordinates.
+  Rect bodyRect(Size body) =>
+      placeBody(anchorRect, body, placement, gap, bounds).shift(offset);
+
+  @override
+  bool shouldRelayout(_PopoverOverlayLayout oldDelegate) =>
+      anchorRect != oldDelegate.anchorRect ||
+      placement != oldDelegate.placement ||
+      constraints != oldDelegate.constraints ||
+      bounds != oldDelegate.bounds ||
+      gap != oldDelegate.gap ||
+      offset != oldDelegate.offset;
+}
+
+/// Paints the arrow from [tip] towards the body, as the background of the
+/// body placed by [layout]. The tip is kept clear of the body's rounded
+/// corners, see [clampArrowTip].
+class _PopoverArrowPainter extends CustomPainter {
+  final Offset tip;
+  final _PopoverOverlayLayout layout;
+  final PopoverDirection direction;
+  final BorderRadius borderRadius;
+  final Color color;
+  final double width;
+  final double height;
+
+  _PopoverArrowPainter({
+    required this.tip,
+    required this.layout,
+    required this.direction,
+    required this.borderRadius,
+    required this.color,
+    required this.width,
+    required this.height,
+  });
+
+  @override
+  void paint(Canvas canvas, Size size) {
+    if (width <= 0 || height <= 0) {
+      return;
+    }
+    var body = layout.bodyRect(size);
+    var clamped = clampArrowTip(
+        tip: tip,
+        body: body,
+        direction: direction,
+        borderRadius: borderRadius,
+        arrowWidth: width);
+    // the canvas is the body's
+    var at = clamped - body.topLeft;
+    var half = width / 2;
+    var path = Path()..moveTo(at.dx, at.dy);
+    switch (direction) {
+      case PopoverDirection.top:
+        path
+          ..lineTo(at.dx - half, at.dy - height)
+          ..lineTo(at.dx + half, at.dy - height);
+        break;
+      case PopoverDirection.left:
+        path
+          ..lineTo(at.dx - height, at.dy - half)
+          ..lineTo(at.dx - height, at.dy + half);
+        break;
+      case PopoverDirection.right:
+        path
+          ..lineTo(at.dx + height, at.dy - half)
+          ..lineTo(at.dx + height, at.dy + half);
+        break;
+      case PopoverDirection.bottom:
+        path
+          ..lineTo(at.dx - half, at.dy + height)
+          ..lineTo(at.dx + half, at.dy + height);
+        break;
+    }
+    canvas.drawPath(path..close(), Paint()..color = color);
+  }
+
+  @override
+  bool shouldRepaint(_PopoverArrowPainter oldDelegate) =>
+      tip != oldDelegate.tip ||
+      layout.shouldRelayout(oldDelegate.layout) ||
+      direction != oldDelegate.direction ||
+      borderRadius != oldDelegate.borderRadius ||
+      color != oldDelegate.color ||
+      width != oldDelegate.width ||
+      height != oldDelegate.height;
+}
@@ -0,0 +1,104 @@
+import 'package:flutter/widgets.dart';
+
+import 'popover_trigger.dart';
+
+/// A popover that can be opened at another widget's position.
+abstract class PopoverHost {
+  PopoverTriggerMode get triggerMode;
+
+  PopoverPrewarm get prewarmMode;
+
+  void showAtAnchor(BuildContext anchorContext, String anchorId);
+
+  /// The pointer left the anchor before a delayed open happened.
+  void cancelPendingOpen();
+
+  bool get isOpen;
+
+  /// Closes the popover, or cancels its open, reporting [reason].
+  void dismiss(String reason);
+
+  /// Closes the popover and the popovers it is nested in, reporting [result]
+  /// from the outermost one.
+  void closeWithResult(String? result);
+
+  /// A popover nested in this popover's body opened or closed.
+  void childOpened(PopoverHost child);
+
+  void childClosed(PopoverHost child);
+
+  /// Where the body of the open popover is, in global coordinates.
+  Rect? get bodyRect;
+
+  /// Whether [position] is over the body of this popover or of a popover
+  /// nested in it.
+  bool containsPosition(Offset position);
+
+  /// The widget other popovers point at when they are shown at this one.
+  BuildContext? get anchorContext;
+
+  /// Builds and lays out the body ahead of an expected open.
+  void prewarm();
+}
+
+/// Page-wide lookup of popover hosts and anchors by control id.
+///
+/// A popover can be shown at an anchor or at another host, see [target].
+///
+/// Anchors only register their element here, they don't subscribe to backend
+/// methods, so a shared host can serve any number of them.
+class PopoverRegistry {
+  static final Map<String, PopoverHost> _hosts = {};
+  static final Map<String, BuildContext> _anchors = {};
+  static final Map<String, PopoverHost> _groups = {};
+
+  static void registerHost(String id, PopoverHost host) => _hosts[id] = host;
+
+  static void unregisterHost(String id, PopoverHost host) {
+    if (_hosts[id] == host) {
+      _hosts.remove(id);
+    }
+  }
+
+  static PopoverHost? host(String? id) => id == null ? null : _hosts[id];
+
+  /// Every host on the page; a host registered under a key as well is listed
+  /// once.
+  static Iterable<PopoverHost> get hosts => _hosts.values.toSet();
+
+  /// Records [host] as the open popover of [group] and returns the one that
+  /// was open before, which the caller closes.
+  static PopoverHost? openInGroup(String group, PopoverHost host) {
+    var previous = _groups[group];
+    _groups[group] = host;
+    return previous != host && previous?.isOpen == true ? previous : null;
+  }
+
+  static void closedInGroup(String group, PopoverHost host) {
+    if (_groups[group] == host) {
+      _groups.remove(group);
+    }
+  }
+
+  static void registerAnchor(String id, BuildContext context) =>
+      _anchors[id] = context;
+
+  static void unregisterAnchor(String id, BuildContext context) {
+    if (_anchors[id] == context) {
+      _anchors.remove(id);
+    }
+  }
+
+  static BuildContext? anchor(String? id) {
+    if (id == null) {
+      return null;
+    }
+    var context = _anchors[id];
+    return context != null && context.mounted ? context : null;
+  }
+
+  /// The widget a popover shown at [id] points at: an anchor, or another
+  /// popover's content.
+  static BuildContext? target(String id) =>
+      anchor(id) ?? host(id)?.anchorContext;
+}
@@ -0,0 +1,43 @@
+import 'package:flutter/widgets.dart';
+
+import 'popover_registry.dart';
+
+/// Why a popover was dismissed, reported to Python with `on_pop`.
+class PopoverDismissReason {
+  static const barrier = "barrier";
+  static const programmatic = "programmatic";
+  static const result = "result";
+  static const route = "route";
+  static const timeout = "timeout";
+  static const hoverExit = "hover_exit";
+  static const group = "group";
+
+  /// The popover couldn't be opened, e.g. its anchor wasn't found.
+  static const failed = "failed";
+
+  /// Closed along with the popover it is nested in; not reported.
+  static const parent = "parent";
+}
+
+/// Exposes the popover that shows a body to the controls inside it.
+class PopoverScope extends InheritedWidget {
+  /// Closes the popover, reporting [result] (a JSON string) to Python.
+  final void Function(String? result) close;
+
+  /// The popover, for popovers nested in its body.
+  final PopoverHost? host;
+
+  const PopoverScope({
+    super.key,
+    required this.close,
+    this.host,
+    required super.child,
+  });
+
+  static PopoverScope? maybeOf(BuildContext context) =>
+      context.dependOnInheritedWidgetOfExactType<PopoverScope>();
+
+  @override
+  bool updateShouldNotify(PopoverScope oldWidget) =>
+      close != oldWidget.close || host != oldWidget.host;
+}
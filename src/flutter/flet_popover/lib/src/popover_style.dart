@@ -0,0 +1,96 @@
+import 'package:flet/flet.dart';
+import 'package:flutter/widgets.dart';
+
+import 'popover_attrs.g.dart';
+
+/// Page-wide lookup of shared popover styles by control id or style key.
+///
+/// [changes] ticks whenever a style is added, updated or removed, so popovers
+/// can drop the options they parsed from it.
+class PopoverStyles {
+  static final Map<String, Control> _styles = {};
+  static final ValueNotifier<int> changes = ValueNotifier(0);
+  static String? _defaultId;
+
+  static void register(Control control) {
+    _styles[control.id] = control;
+    var key = control.attrString("styleKey");
+    if (key != null) {
+      _styles[key] = control;
+    }
+    if (control.attrBool(
+        PopoverStyleAttrs.isDefault, PopoverStyleAttrDefaults.isDefault)!) {
+      _defaultId = control.id;
+    } else if (_defaultId == control.id) {
+      _defaultId = null;
+    }
+    changes.value++;
+  }
+
+  static void unregister(Control control) {
+    if (_styles[control.id]?.id == control.id) {
+      _styles.remove(control.id);
+    }
+    var key = control.attrString("styleKey");
+    if (key != null && _styles[key]?.id == control.id) {
+      _styles.remove(key);
+    }
+    if (_defaultId == control.id) {
+      _defaultId = null;
+    }
+    changes.value++;
+  }
+
+  /// The style [popover] resolves its attributes from, most specific first:
+  /// the popover itself, its own style and the page default style.
+  static List<Control> chain(Control popover) {
+    var chain = [popover];
+    var styleId = popover.attrString("style");
+    var style = styleId != null ? _styles[styleId] : null;
+    if (style != null) {
+      chain.add(style);
+    }
+    var defaultStyle = _defaultId != null ? _styles[_defaultId] : null;
+    if (defaultStyle != null && defaultStyle != style) {
+      chain.add(defaultStyle);
+    }
+    return chain;
+  }
+}
+
+/// A non-visual control holding styling shared by popovers.
+class FletPopoverStyleControl extends StatefulWidget {
+  final Control control;
+
+  const FletPopoverStyleControl({super.key, required this.control});
+
+  @override
+  State<FletPopoverStyleControl> createState() =>
+      _FletPopoverStyleControlState();
+}
+
+class _FletPopoverStyleControlState extends State<FletPopoverStyleControl> {
+  @override
+  void initState() {
+    super.initState();
+    PopoverStyles.register(widget.control);
+  }
+
+  @override
+  void didUpdateWidget(covariant FletPopoverStyleControl oldWidget) {
+    super.didUpdateWidget(oldWidget);
+    if (oldWidget.control != widget.control) {
+      PopoverStyles.unregister(oldWidget.control);
+      PopoverStyles.register(widget.control);
+    }
+  }
+
+  @override
+  void dispose() {
+    PopoverStyles.unregister(widget.control);
+    super.dispose();
+  }
+
+  @override
+  Widget build(BuildContext context) => const SizedBox.shrink();
+}
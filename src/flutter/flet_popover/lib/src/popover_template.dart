@@ -0,0 +1,152 @@
+import 'dart:convert';
+
+import 'package:flet/flet.dart';
+import 'package:flutter/material.dart';
+
+import 'popover_attrs.g.dart';
+
+/// A registered template: its control and the id of its body.
+class PopoverTemplateEntry {
+  final Control control;
+  final String? bodyId;
+
+  const PopoverTemplateEntry(this.control, this.bodyId);
+}
+
+/// Page-wide lookup of popover templates by control id or template key.
+///
+/// [changes] ticks whenever a template is added, updated or removed, so
+/// popovers can pick up its body.
+class PopoverTemplates {
+  static final Map<String, PopoverTemplateEntry> _templates = {};
+  static final ValueNotifier<int> changes = ValueNotifier(0);
+
+  static void register(Control control, String? bodyId) {
+    var entry = PopoverTemplateEntry(control, bodyId);
+    _templates[control.id] = entry;
+    var key = control.attrString("templateKey");
+    if (key != null) {
+      _templates[key] = entry;
+    }
+    changes.value++;
+  }
+
+  static void unregister(Control control) {
+    if (_templates[control.id]?.control.id == control.id) {
+      _templates.remove(control.id);
+    }
+    var key = control.attrString("templateKey");
+    if (key != null && _templates[key]?.control.id == control.id) {
+      _templates.remove(key);
+    }
+    changes.value++;
+  }
+
+  static PopoverTemplateEntry? lookup(String? id) =>
+      id != null ? _templates[id] : null;
+}
+
+/// A non-visual control holding a body shared by popovers.
+class FletPopoverTemplateControl extends StatefulWidget {
+  final Control control;
+  final List<Control> children;
+
+  const FletPopoverTemplateControl(
+      {super.key, required this.control, required this.children});
+
+  @override
+  State<FletPopoverTemplateControl> createState() =>
+      _FletPopoverTemplateControlState();
+}
+
+class _FletPopoverTemplateControlState
+    extends State<FletPopoverTemplateControl> {
+  String? get _bodyId {
+    var bodyControls =
+        widget.children.where((c) => c.name == "body" && c.isVisible);
+    return bodyControls.isEmpty ? null : bodyControls.first.id;
+  }
+
+  @override
+  void initState() {
+    super.initState();
+    PopoverTemplates.register(widget.control, _bodyId);
+  }
+
+  @override
+  void didUpdateWidget(covariant FletPopoverTemplateControl oldWidget) {
+    super.didUpdateWidget(oldWidget);
+    var entry = PopoverTemplates.lookup(widget.control.id);
+    if (oldWidget.control != widget.control || entry?.bodyId != _bodyId) {
+      PopoverTemplates.unregister(oldWidget.control);
+      PopoverTemplates.register(widget.control, _bodyId);
+    }
+  }
+
+  @override
+  void dispose() {
+    PopoverTemplates.unregister(widget.control);
+    super.dispose();
+  }
+
+  @override
+  Widget build(BuildContext context) => const SizedBox.shrink();
+}
+
+/// The data the fields of a template body are bound to.
+class PopoverTemplateScope extends InheritedWidget {
+  final Map<String, dynamic> data;
+
+  const PopoverTemplateScope({
+    super.key,
+    required this.data,
+    required super.child,
+  });
+
+  /// Decodes the `templateData` attribute of a popover.
+  static Map<String, dynamic> parse(String? value) {
+    if (value == null) {
+      return const {};
+    }
+    var data = jsonDecode(value);
+    return data is Map<String, dynamic> ? data : const {};
+  }
+
+  static PopoverTemplateScope? maybeOf(BuildContext context) =>
+      context.dependOnInheritedWidgetOfExactType<PopoverTemplateScope>();
+
+  @override
+  bool updateShouldNotify(PopoverTemplateScope oldWidget) =>
+      data != oldWidget.data;
+}
+
+/// A text showing the value bound to its name in the enclosing template scope.
+class FletPopoverFieldControl extends StatelessWidget {
+  final Control control;
+
+  const FletPopoverFieldControl({super.key, required this.control});
+
+  @override
+  Widget build(BuildContext context) {
+    var value =
+        PopoverTemplateScope.maybeOf(context)?.data[control.attrString(
+            PopoverFieldAttrs.name)];
+    var text = value == null
+        ? control.attrString(PopoverFieldAttrs.placeholder) ?? ""
+        : value is String
+            ? value
+            : jsonEncode(value);
+    var maxLines = control.attrInt(PopoverFieldAttrs.maxLines);
+    return Text(
+      text,
+      maxLines: maxLines,
+      overflow: maxLines != null ? TextOverflow.ellipsis : null,
+      style: TextStyle(
+        fontSize: control.attrDouble(PopoverFieldAttrs.size),
+        color: control.attrColor(PopoverFieldAttrs.color, context),
+        fontWeight:
+            getFontWeight(control.attrString(PopoverFieldAttrs.weight)),
+      ),
+    );
+  }
+}
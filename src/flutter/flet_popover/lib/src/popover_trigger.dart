@@ -0,0 +1,161 @@
+import 'dart:async';
+
+import 'package:flutter/gestures.dart';
+import 'package:flutter/widgets.dart';
+
+enum PopoverTriggerMode { tap, longPress, hover, manual }
+
+enum PopoverPrewarm { none, onHover, onFocus, onIdle }
+
+PopoverTriggerMode parsePopoverTriggerMode(String? value) {
+  switch (value?.toLowerCase()) {
+    case "long_press":
+      return PopoverTriggerMode.longPress;
+    case "hover":
+      return PopoverTriggerMode.hover;
+    case "manual":
+      return PopoverTriggerMode.manual;
+    case "tap":
+    default:
+      return PopoverTriggerMode.tap;
+  }
+}
+
+PopoverPrewarm parsePopoverPrewarm(String? value) {
+  switch (value?.toLowerCase()) {
+    case "on_hover":
+      return PopoverPrewarm.onHover;
+    case "on_focus":
+      return PopoverPrewarm.onFocus;
+    case "on_idle":
+      return PopoverPrewarm.onIdle;
+    default:
+      return PopoverPrewarm.none;
+  }
+}
+
+/// Opens a popover from raw pointer events.
+///
+/// A [Listener] doesn't take part in the gesture arena, so the trigger fires
+/// even when [child] is a button that handles taps itself.
+///
+/// [onLeave] is called when the pointer leaves [child], e.g. to cancel a
+/// delayed open.
+class PopoverTrigger extends StatefulWidget {
+  final PopoverTriggerMode mode;
+  final VoidCallback? onTrigger;
+  final VoidCallback? onLeave;
+  final PopoverPrewarm prewarm;
+  final VoidCallback? onPrewarm;
+  final Widget child;
+
+  const PopoverTrigger({
+    super.key,
+    required this.mode,
+    required this.onTrigger,
+    this.onLeave,
+    this.prewarm = PopoverPrewarm.none,
+    this.onPrewarm,
+    required this.child,
+  });
+
+  @override
+  State<PopoverTrigger> createState() => _PopoverTriggerState();
+}
+
+class _PopoverTriggerState extends State<PopoverTrigger> {
+  Offset? _downPosition;
+  Timer? _longPressTimer;
+
+  @override
+  void dispose() {
+    _longPressTimer?.cancel();
+    super.dispose();
+  }
+
+  void _reset() {
+    _downPosition = null;
+    _longPressTimer?.cancel();
+    _longPressTimer = null;
+  }
+
+  void _onPointerDown(PointerDownEvent event) {
+    _reset();
+    if (event.buttons & kPrimaryButton == 0) {
+      // a secondary or middle click, e.g. for a context menu
+      return;
+    }
+    _downPosition = event.position;
+    if (widget.mode == PopoverTriggerMode.longPress) {
+      _longPressTimer = Timer(kLongPressTimeout, () {
+        _reset();
+        widget.onTrigger?.call();
+      });
+    }
+  }
+
+  void _onPointerMove(PointerMoveEvent event) {
+    if (_downPosition != null &&
+        (event.position - _downPosition!).distance > kTouchSlop) {
+      _reset();
+    }
+  }
+
+  void _onPointerUp(PointerUpEvent event) {
+    var isTap = widget.mode == PopoverTriggerMode.tap && _downPosition != null;
+    _reset();
+    if (isTap) {
+      widget.onTrigger?.call();
+    }
+  }
+
+  @override
+  Widget build(BuildContext context) {
+    var child = widget.child;
+    var hover = widget.mode == PopoverTriggerMode.hover;
+    if (hover || widget.onLeave != null) {
+      child = MouseRegion(
+        onEnter: hover && widget.onTrigger != null
+            ? (_) => widget.onTrigger!()
+            : null,
+        onExit: widget.onLeave != null ? (_) => widget.onLeave!() : null,
+        child: child,
+      );
+    }
+    if (widget.mode != PopoverTriggerMode.manual &&
+        !hover &&
+        widget.onTrigger != null) {
+      child = Listener(
+        onPointerDown: _onPointerDown,
+        onPointerMove: _onPointerMove,
+        onPointerUp: _onPointerUp,
+        onPointerCancel: (_) => _reset(),
+        child: child,
+      );
+    }
+    if (widget.onPrewarm == null) {
+      return child;
+    }
+    switch (widget.prewarm) {
+      case PopoverPrewarm.onHover:
+        return MouseRegion(
+          onEnter: (_) => widget.onPrewarm!(),
+          child: child,
+        );
+      case PopoverPrewarm.onFocus:
+        // notified when anything inside the trigger gains focus
+        return Focus(
+          canRequestFocus: false,
+          skipTraversal: true,
+          onFocusChange: (focused) {
+            if (focused) {
+              widget.onPrewarm!();
+            }
+          },
+          child: child,
+        );
+      default:
+        return child;
+    }
+  }
+}
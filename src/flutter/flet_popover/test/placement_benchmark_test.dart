@@ -0,0 +1,175 @@
+// Timings are printed rather than asserted, as they depend on the machine:
+//
+//   flutter test test/placement_benchmark_test.dart
+import 'package:flet_popover/src/placement.dart';
+import 'package:flet_popover/src/popover_options.dart';
+import 'package:flet_popover/src/popover_overlay.dart';
+import 'package:flutter/material.dart';
+import 'package:flutter_test/flutter_test.dart';
+import 'package:popover/popover.dart';
+
+const screens = [
+  Size(320, 568),
+  Size(375, 812),
+  Size(768, 1024),
+  Size(1280, 800),
+  Size(1920, 1080),
+];
+const anchorSizes = [Size(24, 24), Size(120, 40), Size(320, 48)];
+const bodySizes = [
+  Size(120, 60),
+  Size(240, 160),
+  Size(360, 480),
+  Size(800, 900),
+];
+const gridSize = 10;
+
+const options = PopoverOptions(
+  direction: PopoverDirection.bottom,
+  placement: PopoverPlacement(PopoverDirection.bottom),
+  fallbackPlacements: [],
+  transition: PopoverTransition.other,
+  backgroundColor: Color(0xFFFFFFFF),
+  barrierColor: Color(0x80000000),
+  width: null,
+  height: null,
+  radius: 8,
+  arrowWidth: 24,
+  arrowHeight: 12,
+  arrowDxOffset: 0,
+  arrowDyOffset: 0,
+  contentDxOffset: 0,
+  contentDyOffset: 0,
+  barrierDismissible: true,
+  modal: true,
+  transitionDuration: Duration.zero,
+  shadow: PopoverOptions.defaultShadow,
+);
+
+/// Runs [body] once to warm up, then [runs] times, and prints the mean time
+/// per run.
+void benchmark(String name, int runs, void Function() body) {
+  body();
+  var stopwatch = Stopwatch()..start();
+  for (var i = 0; i < runs; i++) {
+    body();
+  }
+  stopwatch.stop();
+  var perRun = stopwatch.elapsedMicroseconds / runs;
+  // ignore: avoid_print
+  print("$name: ${perRun.toStringAsFixed(2)} µs");
+}
+
+void main() {
+  test("placement", () {
+    var count = 0;
+    var chosen = 0;
+    benchmark("placement grid", 3, () {
+      count = 0;
+      for (var screen in screens) {
+        for (var anchorSize in anchorSizes) {
+          for (var gx = 0; gx < gridSize; gx++) {
+            for (var gy = 0; gy < gridSize; gy++) {
+              var anchor = Offset(
+                      (screen.width - anchorSize.width) * gx / (gridSize - 1),
+                      (screen.height - anchorSize.height) *
+                          gy /
+                          (gridSize - 1)) &
+                  anchorSize;
+              for (var body in bodySizes) {
+                for (var preferred in PopoverPlacement.all) {
+                  var result = placePopover(
+                    anchor: anchor,
+                    screen: screen,
+                    padding: const EdgeInsets.only(top: 24, bottom: 34),
+                    margin: 16,
+                    gap: 12,
+                    body: body,
+                    preferred: preferred,
+                  );
+                  chosen ^= result.placement.hashCode;
+                  count++;
+                }
+              }
+            }
+          }
+        }
+      }
+    });
+    // ignore: avoid_print
+    print("  $count placements per run ($chosen)");
+    expect(count,
+        screens.length * anchorSizes.length * gridSize * gridSize * 4 * 12);
+  });
+
+  test("placement with obstacles", () {
+    const screen = Size(375, 812);
+    var obstacles = [
+      for (var i = 0; i < 4; i++) Rect.fromLTWH(0, i * 200.0, 200, 120),
+    ];
+    benchmark("placement, 4 open popovers", 10000, () {
+      placePopover(
+        anchor: const Rect.fromLTWH(160, 400, 60, 40),
+        screen: screen,
+        margin: 16,
+        gap: 12,
+        body: const Size(240, 160),
+        preferred: const PopoverPlacement(PopoverDirection.bottom),
+        obstacles: obstacles,
+      );
+    });
+  });
+
+  testWidgets("open and close", (tester) async {
+    // the route and layout a popover opens with; the rest of the open path
+    // needs a Flet backend
+    await tester.pumpWidget(
+        const MaterialApp(home: Scaffold(body: SizedBox.expand())));
+    var navigator = tester.state<NavigatorState>(find.byType(Navigator));
+    var screen = tester.view.physicalSize / tester.view.devicePixelRatio;
+    var bounds = placementBounds(screen, EdgeInsets.zero, 16);
+    const anchor = Rect.fromLTWH(100, 200, 120, 40);
+
+    Future<void> cycle() async {
+      var result = placePopover(
+        anchor: anchor,
+        screen: screen,
+        margin: 16,
+        gap: options.arrowHeight,
+        body: const Size(240, 160),
+        preferred: options.placement,
+      );
+      navigator.push(PopoverRoute<void>(
+        barrierColor: options.barrierColor,
+        barrierDismissible: options.barrierDismissible,
+        transitionDuration: options.transitionDuration,
+        builder: (context, animation) => PopoverOverlayBody(
+          anchorRect: anchor,
+          placement: result.placement,
+          options: options,
+          constraints: result.constraints,
+          width: null,
+          height: null,
+          bounds: bounds,
+          animation: animation,
+          child: const SizedBox(width: 240, height: 160),
+        ),
+      ));
+      await tester.pumpAndSettle();
+      navigator.pop();
+      await tester.pumpAndSettle();
+    }
+
+    await cycle();
+    const runs = 200;
+    var stopwatch = Stopwatch()..start();
+    for (var i = 0; i < runs; i++) {
+      await cycle();
+    }
+    stopwatch.stop();
+    // ignore: avoid_print
+    print("open and close: "
+        "${(stopwatch.elapsedMicroseconds / runs).toStringAsFixed(2)} µs");
+    expect(find.byType(PopoverOverlayBody), findsNothing);
+  });
+}
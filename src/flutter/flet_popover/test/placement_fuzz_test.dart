@@ -0,0 +1,180 @@
+import 'dart:math';
+
+import 'package:flet_popover/src/placement.dart';
+import 'package:flutter/rendering.dart';
+import 'package:flutter_test/flutter_test.dart';
+
+// Fixed seeds, so a failure can be replayed
+const seeds = [1, 7, 42, 1234, 98765];
+const casesPerSeed = 2000;
+const margin = 16.0;
+const epsilon = 1e-6;
+
+/// A random placement problem: any screen, an anchor somewhere on it, bodies
+/// from tiny to larger than the screen, insets and other open popovers.
+class _Case {
+  final Size screen;
+  final EdgeInsets padding;
+  final Rect anchor;
+  final Size body;
+  final double gap;
+  final PopoverPlacement preferred;
+  final List<PopoverPlacement> fallbacks;
+  final List<Rect> obstacles;
+
+  _Case(this.screen, this.padding, this.anchor, this.body, this.gap,
+      this.preferred, this.fallbacks, this.obstacles);
+
+  factory _Case.random(Random random) {
+    double upTo(double value) => random.nextDouble() * value;
+    PopoverPlacement anyPlacement() =>
+        PopoverPlacement.all[random.nextInt(PopoverPlacement.all.length)];
+
+    var screen = Size(200 + upTo(2400), 200 + upTo(1600));
+    var anchorSize =
+        Size(upTo(screen.width / 4) + 1, upTo(screen.height / 8) + 1);
+    return _Case(
+      screen,
+      random.nextBool()
+          ? EdgeInsets.zero
+          : EdgeInsets.fromLTRB(upTo(40), upTo(60), upTo(40), upTo(400)),
+      Offset(upTo(screen.width - anchorSize.width),
+              upTo(screen.height - anchorSize.height)) &
+          anchorSize,
+      Size(upTo(screen.width * 1.2) + 1, upTo(screen.height * 1.2) + 1),
+      upTo(24),
+      anyPlacement(),
+      random.nextInt(3) == 0
+          ? [for (var i = random.nextInt(4); i >= 0; i--) anyPlacement()]
+          : const [],
+      [
+        for (var i = random.nextInt(3); i > 0; i--)
+          Offset(upTo(screen.width), upTo(screen.height)) &
+              Size(upTo(300), upTo(300)),
+      ],
+    );
+  }
+
+  PopoverPlacementResult place({Rect? anchor}) => placePopover(
+        anchor: anchor ?? this.anchor,
+        screen: screen,
+        padding: padding,
+        margin: margin,
+        gap: gap,
+        body: body,
+        preferred: preferred,
+        fallbacks: fallbacks,
+        obstacles: obstacles,
+      );
+
+  Rect get bounds => placementBounds(screen, padding, margin);
+
+  @override
+  String toString() => "screen: $screen, padding: $padding, anchor: $anchor, "
+      "body: $body, gap: $gap, preferred: $preferred, "
+      "fallbacks: $fallbacks, obstacles: $obstacles";
+}
+
+bool _within(Rect rect, Rect bounds) =>
+    rect.left >= bounds.left - epsilon &&
+    rect.top >= bounds.top - epsilon &&
+    rect.right <= bounds.right + epsilon &&
+    rect.bottom <= bounds.bottom + epsilon;
+
+void forEachCase(void Function(_Case c) check) {
+  for (var seed in seeds) {
+    var random = Random(seed);
+    for (var i = 0; i < casesPerSeed; i++) {
+      check(_Case.random(random));
+    }
+  }
+}
+
+void main() {
+  test("a body reported as fitting is on screen", () {
+    forEachCase((c) {
+      var result = c.place();
+      if (result.fits) {
+        expect(_within(result.rect, c.bounds), isTrue, reason: "$c");
+      }
+    });
+  });
+
+  test("a body that fits across its side isn't cut across it", () {
+    forEachCase((c) {
+      var result = c.place();
+      var bounds = c.bounds;
+      var rect = result.rect;
+      if (result.placement.isVertical && c.body.width <= bounds.width) {
+        expect(rect.left, greaterThanOrEqualTo(bounds.left - epsilon),
+            reason: "$c");
+        expect(rect.right, lessThanOrEqualTo(bounds.right + epsilon),
+            reason: "$c");
+      }
+      if (!result.placement.isVertical && c.body.height <= bounds.height) {
+        expect(rect.top, greaterThanOrEqualTo(bounds.top - epsilon),
+            reason: "$c");
+        expect(rect.bottom, lessThanOrEqualTo(bounds.bottom + epsilon),
+            reason: "$c");
+      }
+    });
+  });
+
+  test("constraints are never negative", () {
+    forEachCase((c) {
+      var constraints = c.place().constraints;
+      expect(constraints.minWidth, 0, reason: "$c");
+      expect(constraints.minHeight, 0, reason: "$c");
+      expect(constraints.maxWidth, greaterThanOrEqualTo(0), reason: "$c");
+      expect(constraints.maxHeight, greaterThanOrEqualTo(0), reason: "$c");
+      expect(constraints.isNormalized, isTrue, reason: "$c");
+    });
+  });
+
+  test("a fitting candidate is preferred to any that doesn't fit", () {
+    forEachCase((c) {
+      var anyFits = placementCandidates(c.preferred, c.fallbacks).any((p) =>
+          _within(placeBody(c.anchor, c.body, p, c.gap, c.bounds), c.bounds));
+      expect(c.place().fits, anyFits, reason: "$c");
+    });
+  });
+
+  test("only candidates are chosen", () {
+    forEachCase((c) {
+      expect(placementCandidates(c.preferred, c.fallbacks),
+          contains(c.place().placement),
+          reason: "$c");
+    });
+  });
+
+  test("the preferred placement is kept while it fits unshifted", () {
+    forEachCase((c) {
+      if (c.obstacles.isNotEmpty) {
+        return;
+      }
+      var rect = alignBody(c.anchor, c.body, c.preferred, c.gap);
+      if (_within(rect, c.bounds)) {
+        expect(c.place().placement, c.preferred, reason: "$c");
+      }
+    });
+  });
+
+  test("the choice is stable", () {
+    forEachCase((c) {
+      var result = c.place();
+      expect(c.place().placement, result.placement, reason: "$c");
+      if (c.obstacles.isNotEmpty ||
+          result.placement != c.preferred ||
+          result.shift != Offset.zero) {
+        return;
+      }
+      // an anchor moving a little doesn't make a well placed popover jump,
+      // as long as it still has room
+      var moved = c.anchor.shift(const Offset(0.5, 0.5));
+      if (_within(alignBody(moved, c.body, c.preferred, c.gap), c.bounds)) {
+        expect(c.place(anchor: moved).placement, result.placement,
+            reason: "$c");
+      }
+    });
+  });
+}
@@ -0,0 +1,237 @@
+import 'package:flet_popover/src/placement.dart';
+import 'package:flutter/rendering.dart';
+import 'package:flutter_test/flutter_test.dart';
+import 'package:popover/popover.dart';
+
+const screen = Size(400, 800);
+
+PopoverPlacementResult place(
+  Rect anchor,
+  Size body, {
+  PopoverPlacement preferred = const PopoverPlacement(PopoverDirection.bottom),
+  List<PopoverPlacement> fallbacks = const [],
+  List<Rect> obstacles = const [],
+  EdgeInsets padding = EdgeInsets.zero,
+}) =>
+    placePopover(
+      anchor: anchor,
+      screen: screen,
+      padding: padding,
+      margin: 16,
+      gap: 12,
+      body: body,
+      preferred: preferred,
+      fallbacks: fallbacks,
+      obstacles: obstacles,
+    );
+
+void main() {
+  group("PopoverPlacement", () {
+    test("parses sides and alignments", () {
+      expect(PopoverPlacement.parse("top"),
+          const PopoverPlacement(PopoverDirection.top));
+      expect(PopoverPlacement.parse("left_end"),
+          const PopoverPlacement(PopoverDirection.left, PopoverAlignment.end));
+      expect(PopoverPlacement.parse("middle"), isNull);
+      expect(PopoverPlacement.parse("top_middle"), isNull);
+      expect(PopoverPlacement.parseList("top_start, nope,right"), [
+        const PopoverPlacement(PopoverDirection.top, PopoverAlignment.start),
+        const PopoverPlacement(PopoverDirection.right),
+      ]);
+    });
+
+    test("prints as parsed", () {
+      for (var placement in PopoverPlacement.all) {
+        expect(PopoverPlacement.parse(placement.toString()), placement);
+      }
+    });
+  });
+
+  group("placementCandidates", () {
+    test("tries every placement, preferred side first", () {
+      var candidates = placementCandidates(
+          const PopoverPlacement(PopoverDirection.top, PopoverAlignment.end),
+          const []);
+      expect(candidates.toSet(), PopoverPlacement.all.toSet());
+      expect(candidates.length, PopoverPlacement.all.length);
+      expect(candidates.first,
+          const PopoverPlacement(PopoverDirection.top, PopoverAlignment.end));
+      expect(candidates.take(3).map((p) => p.direction),
+          everyElement(PopoverDirection.top));
+      expect(candidates[3],
+          const PopoverPlacement(PopoverDirection.bottom, PopoverAlignment.end));
+    });
+
+    test("keeps to the fallbacks when given", () {
+      var candidates = placementCandidates(
+          const PopoverPlacement(PopoverDirection.bottom), const [
+        PopoverPlacement(PopoverDirection.top),
+        PopoverPlacement(PopoverDirection.bottom),
+      ]);
+      expect(candidates, const [
+        PopoverPlacement(PopoverDirection.bottom),
+        PopoverPlacement(PopoverDirection.top),
+      ]);
+    });
+  });
+
+  group("alignBody", () {
+    const anchor = Rect.fromLTWH(100, 100, 40, 20);
+    const body = Size(100, 50);
+
+    test("aligns along the side", () {
+      expect(
+          alignBody(
+              anchor,
+              body,
+              const PopoverPlacement(
+                  PopoverDirection.bottom, PopoverAlignment.start),
+              10),
+          const Rect.fromLTWH(100, 130, 100, 50));
+      expect(
+          alignBody(anchor, body,
+              const PopoverPlacement(PopoverDirection.bottom), 10),
+          const Rect.fromLTWH(70, 130, 100, 50));
+      expect(
+          alignBody(
+              anchor,
+              body,
+              const PopoverPlacement(
+                  PopoverDirection.top, PopoverAlignment.end),
+              10),
+          const Rect.fromLTWH(40, 40, 100, 50));
+      expect(
+          alignBody(
+              anchor,
+              body,
+              const PopoverPlacement(
+                  PopoverDirection.right, PopoverAlignment.start),
+              10),
+          const Rect.fromLTWH(150, 100, 100, 50));
+      expect(
+          alignBody(anchor, body,
+              const PopoverPlacement(PopoverDirection.left), 10),
+          const Rect.fromLTWH(-10, 85, 100, 50));
+    });
+  });
+
+  group("clampArrowTip", () {
+    const body = Rect.fromLTWH(100, 100, 200, 100);
+    var radius = BorderRadius.circular(8);
+
+    Offset clamped(Offset tip, PopoverDirection direction,
+            {double arrowWidth = 24, BorderRadius? borderRadius}) =>
+        clampArrowTip(
+            tip: tip,
+            body: body,
+            direction: direction,
+            borderRadius: borderRadius ?? radius,
+            arrowWidth: arrowWidth);
+
+    test("leaves a tip within the side alone", () {
+      expect(clamped(const Offset(200, 90), PopoverDirection.bottom),
+          const Offset(200, 90));
+      expect(clamped(const Offset(310, 150), PopoverDirection.right),
+          const Offset(310, 150));
+    });
+
+    test("keeps the base clear of the rounded corners", () {
+      // 8 of radius and 12 of half the arrow from either end
+      expect(clamped(const Offset(90, 90), PopoverDirection.bottom),
+          const Offset(120, 90));
+      expect(clamped(const Offset(400, 210), PopoverDirection.top),
+          const Offset(280, 210));
+      expect(clamped(const Offset(90, 0), PopoverDirection.left),
+          const Offset(90, 120));
+      expect(clamped(const Offset(310, 500), PopoverDirection.right),
+          const Offset(310, 180));
+    });
+
+    test("uses the corners of the side facing the anchor", () {
+      var borderRadius = const BorderRadius.only(
+          topLeft: Radius.circular(30), bottomRight: Radius.circular(40));
+      expect(
+          clamped(const Offset(0, 90), PopoverDirection.bottom,
+              borderRadius: borderRadius),
+          const Offset(142, 90));
+      expect(
+          clamped(const Offset(0, 210), PopoverDirection.top,
+              borderRadius: borderRadius),
+          const Offset(112, 210));
+      expect(
+          clamped(const Offset(400, 210), PopoverDirection.top,
+              borderRadius: borderRadius),
+          const Offset(248, 210));
+    });
+
+    test("centers the tip on a side too short for the arrow", () {
+      expect(
+          clamped(const Offset(90, 0), PopoverDirection.left,
+              arrowWidth: 100),
+          const Offset(90, 150));
+    });
+  });
+
+  group("placePopover", () {
+    test("keeps the preferred placement when it fits", () {
+      var result = place(const Rect.fromLTWH(150, 300, 100, 40),
+          const Size(200, 100));
+      expect(result.placement, const PopoverPlacement(PopoverDirection.bottom));
+      expect(result.fits, isTrue);
+      expect(result.shift, Offset.zero);
+      expect(result.rect, const Rect.fromLTWH(100, 352, 200, 100));
+    });
+
+    test("flips to the opposite side when there is no room", () {
+      var result = place(const Rect.fromLTWH(150, 700, 100, 40),
+          const Size(200, 100));
+      expect(result.direction, PopoverDirection.top);
+      expect(result.fits, isTrue);
+    });
+
+    test("shifts the body back on screen along its side", () {
+      var result = place(
+          const Rect.fromLTWH(0, 300, 40, 40), const Size(200, 100));
+      expect(result.direction, PopoverDirection.bottom);
+      expect(result.fits, isTrue);
+      expect(result.rect.left, greaterThanOrEqualTo(16));
+    });
+
+    test("stays clear of the insets", () {
+      var anchor = const Rect.fromLTWH(150, 560, 100, 40);
+      expect(place(anchor, const Size(200, 150)).direction,
+          PopoverDirection.bottom);
+      // a keyboard covering the lower part of the screen
+      expect(
+          place(anchor, const Size(200, 150),
+                  padding: const EdgeInsets.only(bottom: 150))
+              .direction,
+          PopoverDirection.top);
+    });
+
+    test("avoids other open popovers", () {
+      var anchor = const Rect.fromLTWH(150, 300, 100, 40);
+      var result = place(anchor, const Size(200, 100),
+          obstacles: const [Rect.fromLTWH(0, 340, 400, 200)]);
+      expect(result.direction, PopoverDirection.top);
+    });
+
+    test("gives the space on its side when nothing fits", () {
+      var result = place(const Rect.fromLTWH(150, 300, 100, 40),
+          const Size(380, 790));
+      expect(result.fits, isFalse);
+      expect(result.constraints.maxWidth, greaterThanOrEqualTo(0));
+      expect(result.constraints.maxHeight, greaterThanOrEqualTo(0));
+      expect(result.constraints.minWidth, 0);
+      expect(result.constraints.minHeight, 0);
+    });
+
+    test("keeps to the fallbacks", () {
+      var result = place(const Rect.fromLTWH(150, 700, 100, 40),
+          const Size(200, 100),
+          fallbacks: const [PopoverPlacement(PopoverDirection.left)]);
+      // the top would fit, but only the left side is allowed besides
+      expect(result.direction, PopoverDirection.left);
+    });
+  });
+}
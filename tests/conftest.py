@@ -0,0 +1,57 @@
+"""
+Headless fixtures: a `Page` backed by a fake connection that records the commands the
+page sends, so no Flutter client is needed.
+"""
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+from flet.core.control import Control
+from flet.core.event import Event
+from flet.core.page import Page
+
+from flet_popover.testing import FakeConnection
+
+
+@pytest.fixture
+def conn() -> FakeConnection:
+    return FakeConnection()
+
+
+@pytest.fixture
+def page(conn):
+    loop = asyncio.new_event_loop()
+    page = Page(conn, "test", loop)
+    yield page
+    loop.close()
+
+
+def run(page: Page, coro):
+    """
+    Runs `coro` on the page's event loop, as event handlers and requests made from them
+    are.
+    """
+    return page.loop.run_until_complete(coro)
+
+
+async def send_event(page: Page, control: Control, name: str, data: Any = ""):
+    """
+    Delivers an event from the client to `control`, e.g. `on_pop`.
+    """
+    if not isinstance(data, str):
+        data = json.dumps(data)
+    await page.on_event_async(Event(control.uid, name, data))
+
+
+def set_client_state(page: Page, control: Control, **props: str):
+    """
+    Applies state the client synced to `control`, e.g. `open="true"`.
+    """
+    run(
+        page,
+        page.on_event_async(
+            Event("page", "change", json.dumps([{"i": control.uid, **props}]))
+        ),
+    )
@@ -0,0 +1,122 @@
+import flet as ft
+import pytest
+
+from flet_popover import FletPopover, popover_frozen
+from flet_popover.popover_frozen import freeze_body
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    popover_frozen._bodies.clear()
+    popover_frozen._sources.clear()
+    yield
+    popover_frozen._bodies.clear()
+    popover_frozen._sources.clear()
+
+
+class Builder:
+    def __init__(self, text="help"):
+        self.text = text
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return ft.Column([ft.Text(self.text, size=20), ft.Text("more")])
+
+
+def added(conn):
+    # control ids differ between sessions
+    return [
+        (sub.values[0], {k: v for k, v in sub.attrs.items() if k != "id"})
+        for c in conn.commands
+        if c.name == "add"
+        for sub in c.commands
+    ]
+
+
+def test_a_source_is_built_once_per_process():
+    builder = Builder()
+    first = freeze_body(builder, builder)
+    second = freeze_body(builder, builder)
+    assert builder.calls == 1
+    assert first is not second
+    assert len(popover_frozen._bodies) == 1
+
+
+def test_identical_bodies_are_stored_once():
+    a, b = Builder(), Builder()
+    freeze_body(a, a)
+    freeze_body(b, b)
+    assert (a.calls, b.calls) == (1, 1)
+    assert len(popover_frozen._bodies) == 1
+
+
+def test_different_bodies_hash_differently():
+    a, b = Builder("help"), Builder("other")
+    freeze_body(a, a)
+    freeze_body(b, b)
+    assert len(popover_frozen._bodies) == 2
+
+
+def test_the_cache_evicts_the_least_recently_used(monkeypatch):
+    monkeypatch.setattr(popover_frozen, "FROZEN_BODY_CACHE_SIZE", 2)
+    builders = [Builder(str(i)) for i in range(3)]
+    freeze_body(builders[0], builders[0])
+    freeze_body(builders[1], builders[1])
+    freeze_body(builders[0], builders[0])  # most recently used again
+    freeze_body(builders[2], builders[2])
+    assert len(popover_frozen._bodies) == 2
+
+    freeze_body(builders[0], builders[0])
+    assert builders[0].calls == 1
+    freeze_body(builders[1], builders[1])
+    assert builders[1].calls == 2
+
+
+def test_sessions_get_the_same_commands(page, conn):
+    builder = Builder()
+    sessions = []
+    for _ in range(2):
+        popover = FletPopover(
+            content=ft.Text("?"), body_builder=builder, frozen_body=True
+        )
+        page.add(popover)
+        conn.clear()
+        popover.show_popover()
+        sessions.append(added(conn))
+    assert builder.calls == 1
+    assert sessions[0] == sessions[1]
+    assert sessions[0] == [
+        ("column", {"n": "body"}),
+        ("text", {"value": "help", "size": "20"}),
+        ("text", {"value": "more"}),
+    ]
+
+
+def test_unfreeze_gives_a_body_of_its_own(page, conn):
+    builder = Builder()
+    popover = FletPopover(
+        content=ft.Text("?"), body_builder=builder, frozen_body=True, lazy_body=False
+    )
+    page.add(popover)
+    body = popover.unfreeze()
+    assert builder.calls == 2
+    assert not popover.frozen_body
+    assert popover.body is body
+    assert body.page is page
+
+
+def test_unfreeze_needs_a_body_without_builder():
+    popover = FletPopover(body=ft.Text("help"), frozen_body=True)
+    with pytest.raises(ValueError):
+        popover.unfreeze()
+
+
+def test_freezing_leaves_the_body_untouched():
+    text = ft.Text("help", size=20)
+    body = ft.Column([text])
+    before = dict(text._Control__attrs), dict(body._Control__attrs)
+    freeze_body(body, lambda: body)
+    assert text.parent is None
+    # still dirty, so a session the body is mounted in sends them
+    assert (dict(text._Control__attrs), dict(body._Control__attrs)) == before
@@ -0,0 +1,14 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def test_dart_attribute_table_is_up_to_date():
+    result = subprocess.run(
+        [sys.executable, os.path.join(ROOT, "tools", "gen_dart_attrs.py"), "--check"],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
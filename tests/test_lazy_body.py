@@ -0,0 +1,96 @@
+import flet as ft
+from conftest import run, send_event
+
+from flet_popover import FletPopover
+
+
+class Builder:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return ft.Text(f"body {self.calls}")
+
+
+def added_names(conn):
+    return [
+        sub.values[0]
+        for c in conn.commands
+        if c.name == "add"
+        for sub in c.commands
+    ]
+
+
+def test_body_builder_runs_on_first_open(page, conn):
+    builder = Builder()
+    popover = FletPopover(content=ft.Text("content"), body_builder=builder)
+    page.add(popover)
+    assert popover.lazy_body
+    assert builder.calls == 0
+    # the content only
+    assert added_names(conn).count("text") == 1
+
+    conn.clear()
+    popover.show_popover()
+    assert builder.calls == 1
+    assert added_names(conn) == ["text"]
+    assert conn.invoked(popover) == [("show_popover", {"await_body": "true"})]
+
+    # the body stays on the client
+    popover.hide_popover()
+    conn.clear()
+    popover.show_popover()
+    assert builder.calls == 1
+    assert added_names(conn) == []
+
+
+def test_request_body_mounts_without_opening(page, conn):
+    builder = Builder()
+    popover = FletPopover(content=ft.Text("content"), body_builder=builder)
+    page.add(popover)
+    assert popover._mount_body()
+    assert not popover._mount_body()
+    assert builder.calls == 1
+
+
+def test_body_is_evicted_on_pop(page, conn):
+    builder = Builder()
+    popover = FletPopover(
+        content=ft.Text("content"), body_builder=builder, evict_body_on_pop=True
+    )
+    page.add(popover)
+    popover.show_popover()
+    body = popover.body
+    assert body.page is page
+
+    run(page, send_event(page, popover, "on_pop", {"reason": "barrier"}))
+    assert popover.body is None
+    assert body.uid not in page._index
+
+    conn.clear()
+    popover.show_popover()
+    assert builder.calls == 2
+    assert popover.body.value == "body 2"
+
+
+def test_a_given_body_is_kept_on_eviction(page, conn):
+    body = ft.Text("body")
+    popover = FletPopover(
+        content=ft.Text("content"), body=body, lazy_body=True, evict_body_on_pop=True
+    )
+    page.add(popover)
+    assert body.page is None
+    popover.show_popover()
+    assert body.page is page
+    run(page, send_event(page, popover, "on_pop", {"reason": "barrier"}))
+    assert popover.body is body
+    assert body.uid not in page._index
+    popover.show_popover()
+    assert body.page is page
+
+
+def test_eager_body_is_sent_with_the_popover(page, conn):
+    popover = FletPopover(content=ft.Text("content"), body=ft.Text("body"))
+    page.add(popover)
+    assert added_names(conn).count("text") == 2
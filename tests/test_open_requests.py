@@ -0,0 +1,183 @@
+import asyncio
+
+import flet as ft
+import pytest
+from conftest import run, send_event, set_client_state
+
+from flet_popover import (
+    FletPopover,
+    PopoverAnchor,
+    PopoverDismissReason,
+    PopoverTargetKind,
+)
+
+
+@pytest.fixture
+def popover(page, conn):
+    popover = FletPopover(content=ft.Text("content"), body=ft.Text("body"))
+    page.add(popover)
+    conn.clear()
+    return popover
+
+
+def names(conn, popover):
+    return [name for name, _ in conn.invoked(popover)]
+
+
+def test_requests_in_one_tick_collapse_to_the_last(page, conn, popover):
+    async def burst():
+        popover.show_popover()
+        popover.hide_popover()
+        popover.show_popover()
+        popover.show_popover()
+        assert conn.invoked(popover) == []
+        await asyncio.sleep(0)
+
+    run(page, burst())
+    assert names(conn, popover) == ["show_popover"]
+
+
+def test_a_request_for_the_current_state_is_dropped(page, conn, popover):
+    popover.hide_popover()
+    assert names(conn, popover) == []
+    popover.show_popover()
+    popover.show_popover()
+    assert names(conn, popover) == ["show_popover"]
+    popover.hide_popover()
+    assert names(conn, popover) == ["show_popover", "hide_popover"]
+
+
+def test_showing_at_another_target_is_sent(page, conn, popover):
+    a = PopoverAnchor(content=ft.Text("a"))
+    b = PopoverAnchor(content=ft.Text("b"))
+    page.add(a, b)
+    conn.clear()
+    popover.show_popover(anchor=a)
+    popover.show_popover(anchor=a)
+    popover.show_popover(anchor=b)
+    popover.show_popover(x=10, y=20)
+    assert conn.invoked(popover) == [
+        ("show_popover", {"anchor": a.uid}),
+        ("show_popover", {"anchor": b.uid}),
+        ("show_popover", {"x": "10", "y": "20"}),
+    ]
+
+
+def test_a_popover_opened_on_the_client_can_be_moved(page, conn, popover):
+    anchor = PopoverAnchor(content=ft.Text("a"))
+    page.add(anchor)
+    set_client_state(page, popover, open="true")
+    conn.clear()
+    assert popover.is_open
+    popover.show_popover(anchor=anchor)
+    assert names(conn, popover) == ["show_popover"]
+
+
+def test_a_failed_open_can_be_retried(page, conn, popover):
+    popover.show_popover()
+    run(page, send_event(page, popover, "on_pop", {"reason": "failed"}))
+    popover.show_popover()
+    assert names(conn, popover) == ["show_popover", "show_popover"]
+
+
+def test_is_open_follows_the_client(page, popover):
+    assert not popover.is_open
+    set_client_state(page, popover, open="true")
+    assert popover.is_open
+    set_client_state(page, popover, open="false")
+    assert not popover.is_open
+
+
+def test_open_async_returns_the_result(page, popover):
+    async def scenario():
+        task = asyncio.ensure_future(popover.open_async())
+        await asyncio.sleep(0)
+        await send_event(page, popover, "on_pop", {"reason": "result", "result": 7})
+        return await task
+
+    assert run(page, scenario()) == 7
+
+
+def test_open_async_returns_none_when_the_open_fails(page, popover):
+    async def scenario():
+        task = asyncio.ensure_future(popover.open_async())
+        await asyncio.sleep(0)
+        await send_event(page, popover, "on_pop", {"reason": "failed"})
+        return await task
+
+    assert run(page, scenario()) is None
+
+
+def test_pop_event_carries_reason_and_result(page, popover):
+    events = []
+
+    async def on_pop(e):
+        events.append(e)
+
+    popover.on_pop = on_pop
+    run(
+        page,
+        send_event(page, popover, "on_pop", {"reason": "barrier", "result": None}),
+    )
+    assert events[0].reason is PopoverDismissReason.BARRIER
+    assert events[0].result is None
+
+
+def test_open_async_is_cancelled_when_the_popover_is_removed(page, popover):
+    async def scenario():
+        task = asyncio.ensure_future(popover.open_async())
+        await asyncio.sleep(0)
+        page.remove(popover)
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    run(page, scenario())
+
+
+def open_events(page, popover, data):
+    events = []
+    popover.on_open = events.append
+    run(page, send_event(page, popover, "on_open", data))
+    return events
+
+
+def test_open_event_resolves_an_anchor(page, popover):
+    anchor = PopoverAnchor(content=ft.Text("a"))
+    page.add(anchor)
+    (event,) = open_events(page, popover, {"kind": "anchor", "key": anchor.uid})
+    assert event.kind is PopoverTargetKind.ANCHOR
+    assert event.anchor_key == anchor.uid
+    assert event.anchor is anchor
+
+
+def test_open_event_resolves_a_host_by_its_generated_key(page, popover):
+    other = FletPopover(content=ft.Text("other"), body=ft.Text("body"))
+    key = other._get_host_key()
+    page.add(other)
+    assert key != other.uid
+    (event,) = open_events(page, popover, {"kind": "host", "key": key})
+    assert event.kind is PopoverTargetKind.HOST
+    assert event.anchor_key == key
+    assert event.anchor is other
+
+
+def test_open_event_at_a_point_has_no_anchor(page, popover):
+    (event,) = open_events(page, popover, {"kind": "point", "x": 10.0, "y": 20.0})
+    assert event.kind is PopoverTargetKind.POINT
+    assert (event.x, event.y) == (10.0, 20.0)
+    assert event.anchor_key is None and event.anchor is None
+
+
+def test_open_event_at_the_content(page, popover):
+    (event,) = open_events(page, popover, {"kind": "content", "key": None})
+    assert event.kind is PopoverTargetKind.CONTENT
+    assert event.anchor is None
+
+
+def test_every_client_dismiss_reason_is_known(page, popover):
+    events = []
+    popover.on_pop = events.append
+    reasons = ["hover_exit", "group", "parent", "failed"]
+    for reason in reasons:
+        run(page, send_event(page, popover, "on_pop", {"reason": reason}))
+    assert [e.reason.value for e in events] == reasons
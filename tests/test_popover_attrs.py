@@ -0,0 +1,124 @@
+import flet as ft
+import pytest
+
+from flet_popover import (
+    FletPopover,
+    PopoverDirection,
+    PopoverPlacement,
+    PopoverStyle,
+    PopoverTransition,
+)
+from flet_popover.popover_attrs import iter_attrs
+
+
+def make_popover(**kwargs) -> FletPopover:
+    return FletPopover(body=ft.Text("body"), **kwargs)
+
+
+def test_default_values_are_left_out():
+    popover = make_popover(
+        direction=PopoverDirection.BOTTOM,
+        transition=PopoverTransition.SCALE,
+        barrier_dismissible=True,
+        lazy_body=False,
+    )
+    for name in ("direction", "transition", "barrierDismissible", "lazyBody"):
+        assert popover._get_attr(name) is None
+    assert popover.direction == PopoverDirection.BOTTOM
+
+
+def test_other_values_are_sent():
+    popover = make_popover(direction=PopoverDirection.TOP, barrier_dismissible=False)
+    assert popover._get_attr("direction") == "top"
+    assert popover._get_attr("barrierDismissible", data_type="bool") is False
+
+
+def test_resetting_to_the_default_removes_the_attribute():
+    popover = make_popover(direction=PopoverDirection.TOP)
+    popover.direction = PopoverDirection.BOTTOM
+    # cleared, so the client falls back to its default
+    assert not popover._get_attr("direction")
+    popover.direction = None
+    assert popover.direction is None
+
+
+def test_styled_values_are_sent_even_when_default():
+    # they take precedence over a PopoverStyle, so the default has to be explicit
+    popover = make_popover(radius=8)
+    assert popover._get_attr("radius", data_type="float") == 8
+    style = PopoverStyle(radius=8)
+    assert style._get_attr("radius", data_type="float") == 8
+
+
+def test_enums_are_converted_from_values():
+    popover = make_popover(direction="left")
+    assert popover.direction is PopoverDirection.LEFT
+    assert popover._get_attr("direction") == "left"
+
+
+def test_enum_lists_are_sent_comma_separated():
+    popover = make_popover(
+        fallback_placements=[PopoverPlacement.TOP, "left_end"],
+    )
+    assert popover.fallback_placements == (
+        PopoverPlacement.TOP,
+        PopoverPlacement.LEFT_END,
+    )
+    assert popover._get_attr("fallbackPlacements") == "top,left_end"
+
+
+def test_a_single_enum_is_a_list_of_one():
+    popover = make_popover(fallback_placements=PopoverPlacement.RIGHT)
+    assert popover._get_attr("fallbackPlacements") == "right"
+
+
+def test_durations_are_sent_in_milliseconds():
+    popover = make_popover(
+        open_delay=ft.Duration(seconds=1, milliseconds=250),
+        close_delay=300,
+        auto_dismiss_after=ft.Duration(minutes=1),
+    )
+    assert popover._get_attr("openDelay", data_type="int") == 1250
+    assert popover._get_attr("closeDelay", data_type="int") == 300
+    assert popover._get_attr("autoDismissAfter", data_type="int") == 60_000
+
+
+def test_json_values_are_encoded():
+    popover = make_popover(template_data={"title": "Hi", "count": 2})
+    assert popover._get_attr("templateData") == '{"title":"Hi","count":2}'
+
+
+@pytest.mark.parametrize(
+    "name, value",
+    [
+        ("direction", "sideways"),
+        ("fallback_placements", ["top", "middle"]),
+        ("fallback_placements", 3),
+        ("open_delay", 0.5),
+        ("open_delay", True),
+        ("keep_alive_limit", "8"),
+        ("keep_alive_limit", True),
+        ("metrics_sample_rate", "high"),
+        ("group", 1),
+        ("barrier_dismissible", "yes"),
+        ("background_color", 0xFFFFFF),
+    ],
+)
+def test_invalid_values_raise(name, value):
+    popover = make_popover()
+    with pytest.raises(ValueError, match=name):
+        setattr(popover, name, value)
+
+
+def test_numbers_accept_ints():
+    popover = make_popover(metrics_sample_rate=1, radius=4)
+    assert popover.metrics_sample_rate == 1
+    assert popover._get_attr("radius", data_type="float") == 4
+
+
+def test_attrs_are_listed_once_including_inherited():
+    names = [attr.wire_name for attr in iter_attrs(FletPopover)]
+    assert len(names) == len(set(names))
+    # declared on PopoverStyleAttrs
+    assert "radius" in names
+    assert "direction" in names
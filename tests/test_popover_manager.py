@@ -0,0 +1,119 @@
+import asyncio
+import json
+
+import flet as ft
+import pytest
+from conftest import run, set_client_state
+from flet.core.page import Page
+
+from flet_popover import FletPopover, PopoverManager
+from flet_popover.testing import FakeConnection
+
+
+@pytest.fixture
+def manager(page):
+    manager = PopoverManager()
+    page.overlay.append(manager)
+    page.update()
+    return manager
+
+
+def make_popover(**kwargs) -> FletPopover:
+    return FletPopover(content=ft.Text("content"), body=ft.Text("body"), **kwargs)
+
+
+def test_popovers_are_registered_while_mounted(page, manager):
+    a, b = make_popover(), make_popover()
+    page.add(a, ft.Column([b]))
+    assert set(manager.popovers) == {a, b}
+    assert manager.get(a.uid) is a
+    assert manager.get("nope") is None
+
+    page.remove(a)
+    assert manager.popovers == [b]
+    assert manager.get(a.uid) is None
+
+
+def test_nested_popovers_are_registered(page, manager):
+    inner = make_popover()
+    outer = FletPopover(content=ft.Text("content"), body=ft.Column([inner]))
+    page.add(outer)
+    assert set(manager.popovers) == {outer, inner}
+
+
+def test_registries_are_per_page(page, manager):
+    other = Page(FakeConnection(), "other", page.loop)
+    popover = make_popover()
+    other.add(popover)
+    assert manager.popovers == []
+
+
+def test_open_popovers_follow_the_client(page, manager):
+    a, b = make_popover(), make_popover()
+    page.add(a, b)
+    assert manager.open_popovers == []
+    set_client_state(page, b, open="true")
+    assert manager.open_popovers == [b]
+
+
+def test_a_manager_off_the_page_has_no_popovers():
+    assert PopoverManager().popovers == []
+
+
+def test_close_where_sends_the_matching_ids(page, manager, conn):
+    a, b = make_popover(data="x"), make_popover(data="y")
+    page.add(a, b)
+    conn.clear()
+    manager.close_where(lambda p: p.data == "x")
+    manager.close_where(lambda p: False)
+    assert conn.invoked(manager) == [("close", {"ids": json.dumps([a.uid])})]
+
+
+def test_close_all_cancels_opens_requested_in_the_same_tick(page, manager, conn):
+    a, b = make_popover(), make_popover()
+    page.add(a, b)
+    conn.clear()
+
+    async def open_then_close():
+        a.show_popover()
+        b.show_popover()
+        manager.close_all()
+        await asyncio.sleep(0)
+
+    run(page, open_then_close())
+    assert conn.invoked() == [("close", {})]
+
+    # later opens go through
+    a.show_popover()
+    assert conn.invoked(a) == [("show_popover", {})]
+
+
+def test_close_where_cancels_only_matching_opens(page, manager, conn):
+    a, b = make_popover(data="x"), make_popover(data="y")
+    page.add(a, b)
+    conn.clear()
+
+    async def open_then_close():
+        a.show_popover()
+        b.show_popover()
+        manager.close_where(lambda p: p.data == "x")
+        await asyncio.sleep(0)
+
+    run(page, open_then_close())
+    assert conn.invoked(a) == []
+    assert conn.invoked(b) == [("show_popover", {})]
+
+
+def test_a_close_right_after_an_open_leaves_the_popover_closed(page, manager, conn):
+    popover = make_popover()
+    page.add(popover)
+    conn.clear()
+    popover.open()
+    manager.close_all()
+    assert conn.invoked() == [("show_popover", {}), ("close", {})]
+    assert not popover.is_open
+
+    # the client drops the open, so the next one is sent again
+    conn.clear()
+    popover.open()
+    assert conn.invoked(popover) == [("show_popover", {})]
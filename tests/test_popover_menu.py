@@ -0,0 +1,73 @@
+import asyncio
+import json
+
+from conftest import run
+
+from flet_popover import PopoverMenu
+
+
+def streamed(conn, menu):
+    return [
+        ([item["title"] for item in json.loads(args["items"])], "replace" in args)
+        for name, args in conn.invoked(menu)
+        if name == "stream_items"
+    ]
+
+
+def test_items_are_sent_before_a_slow_stream_ends(page, conn):
+    menu = PopoverMenu()
+    page.add(menu)
+    conn.clear()
+    during = []
+
+    async def items():
+        yield "a"
+        yield ["b", "c"]
+        await asyncio.sleep(0.1)
+        during.append(streamed(conn, menu))
+        yield "d"
+
+    async def scenario():
+        await asyncio.wrap_future(menu.stream_items(items()))
+
+    run(page, scenario())
+    assert during == [[(["a", "b", "c"], True)]]
+    assert streamed(conn, menu) == [(["a", "b", "c"], True), (["d"], False)]
+
+
+def test_an_empty_stream_clears_the_items(page, conn):
+    menu = PopoverMenu()
+    page.add(menu)
+    conn.clear()
+
+    async def items():
+        return
+        yield
+
+    async def scenario():
+        await asyncio.wrap_future(menu.stream_items(items()))
+
+    run(page, scenario())
+    assert streamed(conn, menu) == [([], True)]
+
+
+def test_a_new_stream_cancels_the_previous_one(page, conn):
+    menu = PopoverMenu()
+    page.add(menu)
+    conn.clear()
+
+    async def slow():
+        yield "old"
+        await asyncio.sleep(1)
+        yield "never"
+
+    async def fast():
+        yield "new"
+
+    async def scenario():
+        menu.stream_items(slow())
+        await asyncio.sleep(0.05)
+        await asyncio.wrap_future(menu.stream_items(fast()))
+
+    run(page, scenario())
+    assert streamed(conn, menu) == [(["old"], True), (["new"], True)]
@@ -0,0 +1,56 @@
+import json
+
+import flet as ft
+import pytest
+from flet.core.control_event import ControlEvent
+
+from flet_popover import FletPopover, PopoverMetricsCollector
+from flet_popover.popover_metrics import PopoverMetricsEvent, _percentile
+
+
+@pytest.mark.parametrize(
+    "q, expected",
+    [(0, 1), (10, 1), (11, 2), (50, 5), (90, 9), (99, 10), (100, 10)],
+)
+def test_percentiles_use_the_nearest_rank(q, expected):
+    assert _percentile(list(range(1, 11)), q) == expected
+
+
+def test_percentile_of_nothing_is_none():
+    assert _percentile([], 50) is None
+
+
+def test_percentile_of_one_value():
+    assert _percentile([7.5], 1) == 7.5
+    assert _percentile([7.5], 99) == 7.5
+
+
+def metrics_event(page, popover, samples):
+    return PopoverMetricsEvent(
+        ControlEvent(popover.uid, "on_metrics", json.dumps(samples), popover, page)
+    )
+
+
+def test_collector_keeps_a_window_per_popover(page):
+    collector = PopoverMetricsCollector(window=3)
+    a = collector.track(FletPopover(body=ft.Text("a")))
+    b = collector.track(FletPopover(body=ft.Text("b")))
+    page.add(a, b)
+    assert a.on_metrics == collector.record
+
+    collector.record(
+        metrics_event(
+            page,
+            a,
+            [{"source": "trigger", "shown_ms": ms} for ms in (10, 20, 30, 40)],
+        )
+    )
+    collector.record(
+        metrics_event(page, b, [{"source": "method", "shown_ms": 500, "frames": 9}])
+    )
+    assert [s.shown_ms for s in collector.samples(a)] == [20, 30, 40]
+    assert collector.samples(b)[0].frames == 9
+    assert collector.percentiles(a) == {50: 30, 90: 40, 99: 40}
+    assert collector.percentiles(a, "body_ms") == {50: None, 90: None, 99: None}
+    assert collector.slowest(n=1) == [(b, 500)]
+    assert collector.slowest() == [(b, 500), (a, 40)]
@@ -0,0 +1,154 @@
+"""
+Generates the Dart attribute table from the Python attribute spec.
+
+`FletPopover`, `PopoverStyle`, `PopoverMenu` and `PopoverField` declare their wire attributes with
+`PopoverAttr`. This script writes their wire names and client defaults, one table of
+each per control, to `src/flutter/flet_popover/lib/src/popover_attrs.g.dart`, which
+the Dart parser reads, so the two sides can't drift. The parsing itself is written by
+hand.
+
+Usage:
+
+    python tools/gen_dart_attrs.py          # rewrite the Dart file
+    python tools/gen_dart_attrs.py --check  # exit with status 1 if it is stale
+"""
+
+import argparse
+import os
+import sys
+from typing import List
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from flet_popover import FletPopover, PopoverField, PopoverMenu, PopoverStyle
+from flet_popover.popover_attrs import PopoverAttr, iter_attrs
+
+OUTPUT = os.path.join(
+    ROOT, "src", "flutter", "flet_popover", "lib", "src", "popover_attrs.g.dart"
+)
+
+HEADER = """\
+// GENERATED by tools/gen_dart_attrs.py from the Python attribute spec.
+// Do not edit by hand.
+"""
+
+
+def dart_name(name: str) -> str:
+    head, *rest = name.split("_")
+    return head + "".join(part.capitalize() for part in rest)
+
+
+def dart_literal(attr: PopoverAttr) -> str:
+    value = attr.kind.to_wire(attr.default)
+    if attr.kind.dart_type == "String":
+        return f'"{value}"'
+    if attr.kind.dart_type == "bool":
+        return "true" if value else "false"
+    if attr.kind.dart_type == "double":
+        return repr(float(value))
+    return str(value)
+
+
+def table(name: str, doc: str, attrs: List[PopoverAttr]) -> List[str]:
+    lines = [f"/// {doc}", f"class {name} {{"]
+    for attr in attrs:
+        lines.append(
+            f'  static const String {dart_name(attr.name)} = "{attr.wire_name}";'
+        )
+    lines.append("}")
+    return lines
+
+
+def defaults_table(name: str, control: str, attrs: List[PopoverAttr]) -> List[str]:
+    lines = [
+        f"/// Values the client uses for `{control}` attributes that aren't set. Python",
+        "/// leaves unstyled attributes equal to these out of the wire.",
+        f"class {name} {{",
+    ]
+    for attr in attrs:
+        if attr.default is None or attr.kind.dart_type is None:
+            continue
+        lines.append(
+            f"  static const {attr.kind.dart_type} {dart_name(attr.name)} = "
+            f"{dart_literal(attr)};"
+        )
+    lines.append("}")
+    return lines
+
+
+def generate() -> str:
+    popover_attrs = list(iter_attrs(FletPopover))
+    style_attrs = [a for a in iter_attrs(PopoverStyle) if not a.styled]
+    menu_attrs = list(iter_attrs(PopoverMenu))
+    field_attrs = list(iter_attrs(PopoverField))
+
+    lines = HEADER.splitlines() + [""]
+    lines += table(
+        "PopoverAttrs", "Wire names of `FletPopover` attributes.", popover_attrs
+    )
+    lines.append("")
+    lines += table(
+        "PopoverStyleAttrs",
+        "Wire names of `PopoverStyle` attributes besides the styled ones.",
+        style_attrs,
+    )
+    lines.append("")
+    lines += table(
+        "PopoverMenuAttrs", "Wire names of `PopoverMenu` attributes.", menu_attrs
+    )
+    lines.append("")
+    lines += table(
+        "PopoverFieldAttrs", "Wire names of `PopoverField` attributes.", field_attrs
+    )
+    lines.append("")
+
+    for name, control, attrs in [
+        ("PopoverAttrDefaults", "FletPopover", popover_attrs),
+        ("PopoverStyleAttrDefaults", "PopoverStyle", style_attrs),
+        ("PopoverMenuAttrDefaults", "PopoverMenu", menu_attrs),
+        ("PopoverFieldAttrDefaults", "PopoverField", field_attrs),
+    ]:
+        if any(a.default is not None and a.kind.dart_type for a in attrs):
+            lines += defaults_table(name, control, attrs) + [""]
+
+    lines += [
+        "/// Attributes a popover can take from a `PopoverStyle`.",
+        "const Set<String> popoverStyledAttrs = {",
+    ]
+    for attr in popover_attrs:
+        if attr.styled:
+            lines.append(f"  PopoverAttrs.{dart_name(attr.name)},")
+    lines.append("};")
+    return "\n".join(lines) + "\n"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="only check that the Dart file is up to date",
+    )
+    args = parser.parse_args()
+
+    source = generate()
+    current = None
+    if os.path.exists(OUTPUT):
+        with open(OUTPUT) as f:
+            current = f.read()
+
+    if args.check:
+        if current != source:
+            print(f"{os.path.relpath(OUTPUT, ROOT)} is out of date, run {__file__}")
+            return 1
+        return 0
+
+    if current != source:
+        with open(OUTPUT, "w") as f:
+            f.write(source)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())